@@ -0,0 +1,113 @@
+"""
+ביטבורדים: קבוצת משבצות כמספר שלם, ביט i = משבצת r * cols + c.
+מספרים שלמים של פייתון לא מוגבלים ל-64 ביט, כך שאותו קוד עובד לכל גודל לוח.
+"""
+import math
+from typing import Dict, Iterator, List, Tuple
+
+Cell = Tuple[int, int]
+
+
+def square_bit(r: int, c: int, cols: int) -> int:
+    return 1 << (r * cols + c)
+
+
+def iter_cells(mask: int, cols: int) -> Iterator[Cell]:
+    """המשבצות שבמסכה, מהאינדקס הנמוך לגבוה."""
+    while mask:
+        low = mask & -mask
+        i = low.bit_length() - 1
+        yield divmod(i, cols)
+        mask ^= low
+
+
+class BitboardMoves:
+    """
+    מחולל יעדים על ביטבורדים לקבוצת תנועות יחסיות.
+
+    התנועות מחולקות לפי כיוון: אם בכיוון (dr, dc) קיימים הצעדים 1..m ברצף
+    (למשל 1,0 2,0 ... 7,0 של צריח, או 1,0 2,0 של רגלי בצעד ראשון), זו קרן
+    שנחסמת בכלי הראשון שעליו היא עוברת. כל תנועה אחרת (פרש, מלך, צעד שלא
+    מתחיל מ-1) היא קפיצה שלא נחסמת.
+
+    לכל משבצת מחושבים מראש מסכת הקפיצות ומסכה לכל קרן. לאורך קרן האינדקס
+    r * cols + c עולה (או יורד) באופן מונוטוני, ולכן החוסם הקרוב הוא הביט
+    הנמוך (או הגבוה) של ray & occupied, והיעדים החוקיים הם כל הביטים עד אליו -
+    כמה פעולות ביטים לקרן במקום מעבר על רשימה.
+    """
+
+    def __init__(self, deltas: Tuple[Cell, ...], dims: Tuple[int, int]):
+        rows, cols = dims
+        self.dims = dims
+        rays, leaps = self._classify(deltas)
+        self._leaps: List[int] = []
+        # לכל משבצת: [(מסכת הקרן, האם האינדקס עולה לאורכה)]
+        self._rays: List[List[Tuple[int, bool]]] = []
+        for r in range(rows):
+            for c in range(cols):
+                leap = 0
+                for dr, dc in leaps:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        leap |= square_bit(nr, nc, cols)
+                square_rays = []
+                for (dr, dc), steps in rays:
+                    mask = 0
+                    for k in range(1, steps + 1):
+                        nr, nc = r + dr * k, c + dc * k
+                        if not (0 <= nr < rows and 0 <= nc < cols):
+                            break
+                        mask |= square_bit(nr, nc, cols)
+                    if mask:
+                        square_rays.append((mask, dr * cols + dc > 0))
+                self._leaps.append(leap)
+                self._rays.append(square_rays)
+
+    @staticmethod
+    def _classify(deltas: Tuple[Cell, ...]) -> Tuple[List[Tuple[Cell, int]], List[Cell]]:
+        by_direction: Dict[Cell, set] = {}
+        for dr, dc in deltas:
+            if dr == 0 and dc == 0:
+                continue
+            g = math.gcd(dr, dc)
+            by_direction.setdefault((dr // g, dc // g), set()).add(g)
+        rays, leaps = [], []
+        for (ur, uc), steps in by_direction.items():
+            m = 0
+            while m + 1 in steps:
+                m += 1
+            if m > 1:
+                rays.append(((ur, uc), m))
+            else:
+                m = 0
+            leaps.extend((ur * k, uc * k) for k in sorted(steps) if k > m)
+        return rays, leaps
+
+    def attacks(self, r: int, c: int, occupied: int = 0) -> int:
+        """כל היעדים מ-(r, c) בהינתן התפוסה - כולל משבצת החוסם עצמה."""
+        i = r * self.dims[1] + c
+        result = self._leaps[i]
+        for ray, ascending in self._rays[i]:
+            blockers = ray & occupied
+            if blockers:
+                if ascending:
+                    nearest = blockers & -blockers
+                    ray &= (nearest << 1) - 1
+                else:
+                    nearest = 1 << (blockers.bit_length() - 1)
+                    ray &= ~(nearest - 1)
+            result |= ray
+        return result
+
+    def legal_mask(self, r: int, c: int, occupied: int = 0, own: int = 0) -> int:
+        """יעדים חוקיים: לא חסומים ולא על כלי של אותו שחקן."""
+        rows, cols = self.dims
+        if not (0 <= r < rows and 0 <= c < cols):
+            return 0
+        return self.attacks(r, c, occupied) & ~own
+
+    def is_legal(self, src: Cell, dst: Cell, occupied: int = 0, own: int = 0) -> bool:
+        rows, cols = self.dims
+        if not (0 <= dst[0] < rows and 0 <= dst[1] < cols):
+            return False
+        return bool(self.legal_mask(src[0], src[1], occupied, own) >> (dst[0] * cols + dst[1]) & 1)
@@ -25,6 +25,9 @@ class Board:
             H_cells=self.H_cells,
             img=img_copy
         )
+    def get_image(self) -> Img:
+        return self.img
+
     def get_pixel_position(self, cell: tuple[int, int]) -> tuple[int, int]:
         row, col = cell
         x = col * self.cell_W_pix
@@ -0,0 +1,63 @@
+"""
+השעון של המשחק: מקור יחיד לזמן במילישניות לכל החלקים (לולאת המשחק,
+חותמות הזמן של אירועי הקלט והפקודות).
+
+- MonotonicClock: זמן אמיתי מ-time.monotonic (לא מושפע משינויי שעון המערכת).
+- ManualClock: זמן וירטואלי שמתקדם רק כשמקדמים אותו. sleep_until קופץ
+  מיד לדדליין, כך שמשחק שלם רץ מהר ככל שהמעבד מאפשר - לבדיקות, לבוטים
+  ולסימולציה בשרת.
+"""
+import time
+
+SPIN_S = 0.001  # את המילישנייה האחרונה לפני דדליין מחכים בוויתורים קצרים על המעבד
+
+
+class Clock:
+    def now_ms(self) -> int:
+        raise NotImplementedError
+
+    def sleep_until(self, deadline_ms: float):
+        """מחכה עד שהשעון מגיע לדדליין."""
+        raise NotImplementedError
+
+
+class MonotonicClock(Clock):
+    def now_ms(self) -> int:
+        return int(time.monotonic() * 1000)
+
+    def sleep_until(self, deadline_ms: float):
+        """
+        את רוב הזמן ישנים ב-sleep רגיל, ואת הקטע האחרון - שבו sleep לא
+        מדויק - בוויתורים קצרים.
+        """
+        deadline = deadline_ms / 1000.0
+        remaining = deadline - time.monotonic()
+        if remaining > SPIN_S:
+            time.sleep(remaining - SPIN_S)
+        while time.monotonic() < deadline:
+            time.sleep(0)
+
+
+class ManualClock(Clock):
+    def __init__(self, start_ms: int = 0):
+        self._now_ms = start_ms
+
+    def now_ms(self) -> int:
+        return self._now_ms
+
+    def set(self, now_ms: int):
+        if now_ms < self._now_ms:
+            raise ValueError(f"Clock cannot go back from {self._now_ms} to {now_ms}")
+        self._now_ms = now_ms
+
+    def rewind(self, now_ms: int):
+        """מחזיר את השעון אחורה - רק לשחזור תמונת מצב (rollback)."""
+        self._now_ms = now_ms
+
+    def advance(self, ms: int) -> int:
+        self.set(self._now_ms + ms)
+        return self._now_ms
+
+    def sleep_until(self, deadline_ms: float):
+        if deadline_ms > self._now_ms:
+            self._now_ms = int(deadline_ms)
@@ -0,0 +1,217 @@
+"""
+זיהוי התנגשויות ואכילות לכלים בתנועה, בחלון זמן [t_start, t_end].
+
+כל כלי מיוצג כקטעים ליניאריים בזמן: לפני תחילת התנועה (עומד בתא המקור),
+בזמן התנועה (מ-Physics.start_time_ms במהירות speed_m_s לכיוון היעד) ואחרי
+ההגעה (עומד ביעד). כלי בקפיצה (Jump) באוויר ולא משתתף עד שהוא נוחת.
+
+שני כלים של שחקנים שונים מתנגשים כשהמרחק בין המרכזים קטן מ-COLLISION_RADIUS
+(בתאים). הזוגות המועמדים נמצאים ב-sweep and prune: הקטעים ממוינים לפי
+השורה המינימלית שהם מכסים בחלון, ורשימה פעילה אחת, ממוינת לפי השורה
+המקסימלית, מחזיקה את הקטעים שעוד חופפים - O(n log n + k) במקום כל הזוגות.
+לכל זוג מחושב זמן המגע הראשון במדויק.
+
+בפיזיקה של fixed point (FixedTrajectory) לקטעים יש גם תיאור שלם במילימטרים
+(Segment.fx), וזמן המגע בין שני קטעים כאלה מחושב בחשבון שלמים בלבד: המילישנייה
+השלמה הראשונה שבה המרחק לכל היותר הרדיוס - זהה בכל מכונה.
+
+מי אוכל: כלי בתנועה אוכל כלי שעומד; כששניהם בתנועה - מי שהתחיל לזוז אחרון
+(כמו "מי שהגיע אחרון לתא" ב-Piece.can_capture), ובשוויון - ה-uid הקטן.
+האירועים ממוינים לפי (זמן, uid של האוכל, uid של הנאכל), כך שהתוצאה דטרמיניסטית.
+"""
+import bisect
+import itertools
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+from It1_interfaces.Physics import Physics
+from It1_interfaces.Trajectory import SCALE, FixedTrajectory, FixedVec
+
+COLLISION_RADIUS = 0.5
+
+Vec = Tuple[float, float]
+# תנועה שלמה: המיקום בזמן t הוא origin + delta * (t - origin_ms) / den
+FixedMotion = Tuple[FixedVec, int, FixedVec, int]
+
+
+def _still(pos_fx: FixedVec) -> FixedMotion:
+    return tuple(pos_fx), 0, (0, 0), 1
+
+
+class CaptureEvent(NamedTuple):
+    time_ms: float
+    capturer: object
+    captured: object
+    pos: Vec        # מיקום הנאכל (שורה, עמודה) ברגע המגע
+
+
+class Segment(NamedTuple):
+    piece: object
+    t0: float
+    t1: float
+    p0: Vec          # מיקום ב-t0
+    v: Vec           # מהירות בתאים למילישנייה (0 לכלי שעומד)
+    started_ms: float  # תחילת התנועה (לכלי בתנועה), -inf לכלי שעומד
+    fx: Optional[FixedMotion] = None  # רק לפיזיקה של fixed point
+
+    @property
+    def moving(self) -> bool:
+        return self.v != (0.0, 0.0)
+
+    def at(self, t: float) -> Vec:
+        dt = t - self.t0
+        return self.p0[0] + self.v[0] * dt, self.p0[1] + self.v[1] * dt
+
+    def bounds(self, axis: int, radius: float = COLLISION_RADIUS) -> Tuple[float, float]:
+        """התחום שהקטע מכסה בציר, מורחב ברדיוס ההתנגשות."""
+        a, b = self.p0[axis], self.at(self.t1)[axis]
+        return min(a, b) - radius, max(a, b) + radius
+
+
+def _physics_of(piece) -> Optional[Physics]:
+    try:
+        physics = piece.state_machine.current._physics
+    except AttributeError:
+        return None
+    return physics if isinstance(physics, Physics) else None
+
+
+def segments_of(piece, t_start: float, t_end: float) -> List[Segment]:
+    """הקטעים של כלי בחלון, לפי מצב הפיזיקה שלו לפני העדכון של הצעד."""
+    physics = _physics_of(piece)
+    if physics is None:
+        return []
+    cmd = physics.current_command
+    trajectory = physics.trajectory
+    if trajectory is None and physics.is_moving and cmd is not None:
+        # התנועה עוד לא התחילה: start_time_ms ייקבע בעדכון הבא, כלומר בסוף החלון
+        trajectory = physics.plan(physics.start_time_ms or t_end)
+    if not physics.is_moving or cmd is None or trajectory is None:
+        here = tuple(map(float, physics.current_pos_meters))
+        fx = _still(physics.current_pos_fx) if physics.fixed_point else None
+        return [Segment(piece, t_start, t_end, here, (0.0, 0.0), -math.inf, fx)]
+
+    fixed = isinstance(trajectory, FixedTrajectory)
+    here, target = trajectory.start, trajectory.end
+    start, arrive = trajectory.t0_ms, trajectory.end_ms
+    segments = []
+    if start > t_start:
+        segments.append(Segment(piece, t_start, min(start, t_end), here, (0.0, 0.0), -math.inf,
+                                _still(trajectory.start_fx) if fixed else None))
+    lo, hi = max(start, t_start), min(arrive, t_end)
+    if lo < hi and cmd.type != "Jump":
+        v = trajectory.velocity
+        p = (here[0] + v[0] * (lo - start), here[1] + v[1] * (lo - start))
+        fx = None
+        if fixed:
+            delta = (trajectory.end_fx[0] - trajectory.start_fx[0], trajectory.end_fx[1] - trajectory.start_fx[1])
+            fx = (trajectory.start_fx, start, delta, trajectory.duration_ms)
+        segments.append(Segment(piece, lo, hi, p, v, start, fx))
+    if arrive <= t_end:
+        # אחרי הנחיתה הכלי עומד ביעד; נחשב "בתנועה" לעניין מי אוכל ברגע הנחיתה
+        segments.append(Segment(piece, max(arrive, t_start), t_end, target, (0.0, 0.0), start,
+                                _still(trajectory.end_fx) if fixed else None))
+    return segments
+
+
+def first_contact(a: Segment, b: Segment, radius: float = COLLISION_RADIUS) -> Optional[float]:
+    """הזמן הראשון בחפיפת הקטעים שבו המרחק קטן מ-radius, או None."""
+    lo, hi = max(a.t0, b.t0), min(a.t1, b.t1)
+    if lo > hi:
+        return None
+    if a.fx is not None and b.fx is not None:
+        return first_contact_fixed(a.fx, b.fx, math.ceil(lo), math.floor(hi), round(radius * SCALE))
+    pa, pb = a.at(lo), b.at(lo)
+    d = (pa[0] - pb[0], pa[1] - pb[1])
+    c = d[0] * d[0] + d[1] * d[1] - radius * radius
+    if c < 0:
+        return lo
+    w = (a.v[0] - b.v[0], a.v[1] - b.v[1])
+    qa = w[0] * w[0] + w[1] * w[1]
+    if qa == 0:
+        return None
+    qb = 2 * (d[0] * w[0] + d[1] * w[1])
+    disc = qb * qb - 4 * qa * c
+    if disc < 0:
+        return None
+    s = (-qb - math.sqrt(disc)) / (2 * qa)
+    if s < 0 or lo + s > hi:
+        return None
+    return lo + s
+
+
+def first_contact_fixed(a: FixedMotion, b: FixedMotion, lo: int, hi: int, radius_fx: int) -> Optional[int]:
+    """
+    המילישנייה השלמה הראשונה ב-[lo, hi] שבה המרחק בין שתי תנועות שלמות
+    לכל היותר radius_fx, או None. חשבון שלמים בלבד: מכפילים במכנים, כך
+    שהמרחק (כפול den_a * den_b) הוא A + W * t, ומחפשים את השורש הראשון של
+    |A + W t|^2 - (radius * den)^2.
+    """
+    if lo > hi:
+        return None
+    (oa, ta, da, na), (ob, tb, db, nb) = a, b
+    den = na * nb
+    A = [(oa[i] - ob[i]) * den - da[i] * ta * nb + db[i] * tb * na for i in (0, 1)]
+    W = [da[i] * nb - db[i] * na for i in (0, 1)]
+    r2 = (radius_fx * den) ** 2
+
+    def gap(t: int) -> int:
+        x, y = A[0] + W[0] * t, A[1] + W[1] * t
+        return x * x + y * y - r2
+
+    if gap(lo) <= 0:
+        return lo
+    qa = W[0] * W[0] + W[1] * W[1]
+    aw = A[0] * W[0] + A[1] * W[1]
+    if qa == 0 or lo * qa >= -aw:
+        return None  # לא מתקרבים (או כבר עברו את נקודת המרחק המינימלי)
+    disc = aw * aw - qa * (A[0] * A[0] + A[1] * A[1] - r2)
+    if disc < 0:
+        return None
+    # floor של השורש הקטן, בטעות של פחות מ-1: המילישנייה הראשונה היא est או est + 1
+    est = (-aw - math.isqrt(disc)) // qa
+    for t in (est, est + 1):
+        if lo <= t <= hi and gap(t) <= 0:
+            return t
+    return None
+
+
+def _attacker(a: Segment, b: Segment) -> Tuple[Segment, Segment]:
+    if a.started_ms != b.started_ms:
+        return (a, b) if a.started_ms > b.started_ms else (b, a)
+    return (a, b) if a.piece.uid < b.piece.uid else (b, a)
+
+
+class CollisionEngine:
+    def __init__(self, radius: float = COLLISION_RADIUS):
+        self.radius = radius
+
+    def detect(self, pieces, t_start: float, t_end: float) -> List[CaptureEvent]:
+        """אירועי האכילה בחלון, ממוינים לפי זמן."""
+        radius = self.radius
+        segments = [(s.bounds(0, radius), s.bounds(1, radius), s)
+                    for p in pieces for s in segments_of(p, t_start, t_end)]
+        segments.sort(key=lambda item: item[0][0])
+        events = {}
+        # (סוף התחום בשורות, מספר סידורי, תחום העמודות, קטע), ממוין לפי סוף התחום:
+        # הקטעים שכבר לא חופפים הם תמיד בתחילת הרשימה
+        active: List[Tuple[float, int, Tuple[float, float], Segment]] = []
+        seq = itertools.count()
+        for (row_lo, row_hi), (col_lo, col_hi), seg in segments:
+            del active[:bisect.bisect_left(active, (row_lo,))]
+            for _, _, (o_lo, o_hi), other in active:
+                if not (seg.moving or other.moving or seg.started_ms != other.started_ms):
+                    continue  # שני כלים שעומדים מההתחלה לא מתנגשים מחדש
+                if other.piece is seg.piece or getattr(other.piece, "owner", None) == getattr(seg.piece, "owner", None):
+                    continue
+                if o_hi < col_lo or o_lo > col_hi:
+                    continue
+                t = first_contact(seg, other, radius)
+                if t is None:
+                    continue
+                capturer, captured = _attacker(seg, other)
+                key = (capturer.piece.uid, captured.piece.uid)
+                if key not in events or t < events[key].time_ms:
+                    events[key] = CaptureEvent(t, capturer.piece, captured.piece, captured.at(t))
+            bisect.insort(active, (row_hi, next(seq), (col_lo, col_hi), seg))
+        return sorted(events.values(), key=lambda e: (e.time_ms, e.capturer.uid, e.captured.uid))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 @dataclass
 class Command:
@@ -35,6 +35,7 @@ class Command:
     type: str
     params: List
     target_cell: tuple = None  # הוסף שדה זה
+    piece_uid: Optional[int] = None  # Piece.uid של הכלי, לניתוב ב-CommandBus
 
 
     # def __init__(self, cmd_type, player, direction=None):
@@ -44,5 +45,5 @@ class Command:
 
     def __post_init__(self):
         # אם params מכיל יעד, שמור אותו
-        if len(self.params) > 1 and isinstance(self.params[1], tuple):
+        if self.target_cell is None and len(self.params) > 1 and isinstance(self.params[1], tuple):
             self.target_cell = self.params[1]
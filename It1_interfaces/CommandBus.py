@@ -0,0 +1,128 @@
+import heapq
+import itertools
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from It1_interfaces.Command import Command
+from It1_interfaces.CommandCodec import PackedCommand
+
+QueuedCommand = Union[Command, PackedCommand]
+
+
+def expand(cmd: QueuedCommand) -> Command:
+    """Command מלא לכלי (PackedCommand נפרס רק כאן)."""
+    return cmd.to_command() if isinstance(cmd, PackedCommand) else cmd
+
+
+class CommandBus:
+    """
+    תור הפקודות המרכזי של המשחק.
+
+    פקודות נכנסות (push) לערימה לפי (timestamp, מספר סידורי), כך שפקודות עם
+    אותו זמן יוצאות בסדר שבו נשלחו. פעם אחת בכל צעד dispatch מוציא את כל
+    הפקודות שהגיע זמנן ומעביר כל אחת לכלי שלה.
+
+    התור מקבל גם PackedCommand (מה שהמשחק שולח): הוא נשמר דחוס לאורך כל
+    הדרך - ערימה, מפתח לאיחוד, תמונות מצב - ונפרס ל-Command רק במסירה לכלי.
+
+    - ניתוב: לפי הכלי שצורף ב-push, אחרת לפי piece_uid דרך מילון uid -> כלי,
+      ורק אם אין uid - דרך resolve (למשל חיפוש לפי תא המקור).
+    - איחוד: פקודה חדשה לאותו כלי מחליפה פקודה שעוד ממתינה לו (הפקודה
+      המאוחרת לפי (timestamp, מספר סידורי) נשארת). הפקודה הישנה לא מוצאת
+      מהערימה אלא מדולגת כשהיא יוצאת.
+    """
+
+    def __init__(self, resolve: Optional[Callable[[Command], object]] = None):
+        self._heap: List[Tuple[int, int, QueuedCommand, object]] = []
+        self._seq = itertools.count()
+        self._latest: Dict[Hashable, Tuple[int, int]] = {}   # מפתח כלי -> (זמן, סידורי) של הפקודה התקפה
+        self._pieces: Dict[int, object] = {}
+        self._resolve = resolve
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def register(self, piece):
+        self._pieces[piece.uid] = piece
+
+    def unregister(self, piece):
+        self._pieces.pop(piece.uid, None)
+
+    @staticmethod
+    def _key(cmd: QueuedCommand, piece) -> Hashable:
+        if piece is not None:
+            return piece.uid
+        if isinstance(cmd, PackedCommand):
+            return cmd.uid or (cmd.piece, cmd.src)
+        if cmd.piece_uid is not None:
+            return cmd.piece_uid
+        return cmd.piece_id, tuple(cmd.params[0]) if cmd.params else None
+
+    def push(self, cmd: QueuedCommand, piece=None) -> bool:
+        """
+        מוסיף פקודה. piece (אופציונלי) הוא הכלי שהפקודה מיועדת לו, אם השולח
+        כבר מכיר אותו. מחזיר False אם כבר ממתינה לכלי פקודה מאוחרת יותר.
+        """
+        key = self._key(cmd, piece)
+        order = (cmd.timestamp, next(self._seq))
+        latest = self._latest.get(key)
+        if latest is not None:
+            self.coalesced += 1
+            if latest > order:
+                return False
+        self._latest[key] = order
+        heapq.heappush(self._heap, (order[0], order[1], cmd, piece))
+        return True
+
+    append = push  # תואם לתור שמקבל Player.try_select_or_command
+
+    def next_due(self) -> Optional[int]:
+        """ה-timestamp של הפקודה התקפה הבאה, או None כשהתור ריק."""
+        heap = self._heap
+        while heap:
+            ts, seq, cmd, piece = heap[0]
+            if self._latest.get(self._key(cmd, piece)) == (ts, seq):
+                return ts
+            heapq.heappop(heap)
+        return None
+
+    def pending(self) -> List[Tuple[QueuedCommand, object]]:
+        """כל הפקודות התקפות שממתינות, לפי הסדר שבו יצאו (בלי להוציא אותן)."""
+        return [(cmd, piece) for ts, seq, cmd, piece in sorted(self._heap)
+                if self._latest.get(self._key(cmd, piece)) == (ts, seq)]
+
+    def clear(self):
+        self._heap.clear()
+        self._latest.clear()
+
+    def due(self, now_ms: int) -> List[Tuple[QueuedCommand, object]]:
+        """מוציא את כל הפקודות התקפות עם timestamp <= now_ms, לפי הסדר."""
+        batch = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ms:
+            ts, seq, cmd, piece = heapq.heappop(heap)
+            key = self._key(cmd, piece)
+            if self._latest.get(key) != (ts, seq):
+                continue  # הוחלפה בפקודה מאוחרת יותר
+            del self._latest[key]
+            batch.append((cmd, piece))
+        return batch
+
+    def route(self, cmd: QueuedCommand, piece=None):
+        """הכלי שהפקודה מיועדת לו, או None."""
+        if piece is not None:
+            return piece
+        uid = cmd.uid or None if isinstance(cmd, PackedCommand) else cmd.piece_uid
+        if uid is not None:
+            return self._pieces.get(uid)
+        return self._resolve(expand(cmd)) if self._resolve is not None else None
+
+    def dispatch(self, now_ms: int) -> int:
+        """מעביר לכלים את כל הפקודות שהגיע זמנן. מחזיר כמה פקודות נמסרו."""
+        delivered = 0
+        for cmd, piece in self.due(now_ms):
+            piece = self.route(cmd, piece)
+            if piece is not None:
+                piece.on_command(expand(cmd))
+                delivered += 1
+        return delivered
@@ -0,0 +1,158 @@
+"""
+ייצוג דחוס לפקודות וממירים לכתיב ולפורמט בינארי.
+
+PackedCommand הוא NamedTuple (tuple אחד, בלי __dict__) של מספרים שלמים בלבד:
+זמן, קוד כלי, קוד סוג פקודה, תא מקור ותא יעד (כל תא בבית אחד: שורה בארבעת
+הביטים העליונים ועמודה בתחתונים) ו-uid. הוא hashable, משתווה ומתמיין לפי
+הזמן, ולכן מתאים לתורים, לשידור ולחיפוש בכמויות גדולות בלי הקצאות מיותרות.
+
+כתיב: PieceId + M/J + מקור + יעד, למשל "QBMe5e8" (עמודה כאות, שורה + 1) -
+אותו פורמט שמופיע ב-params[2] של פקודות התנועה במשחק.
+בינארי: 16 בתים קבועים לפקודה ("<qBBBBI").
+"""
+import re
+import struct
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from It1_interfaces.Command import Command
+
+Cell = Tuple[int, int]
+NO_CELL = 0xFF
+MAX_CELLS = 15  # שורות/עמודות בתא דחוס (0xFF שמור ל-NO_CELL)
+
+# קודים קבועים לכלים ולסוגי פקודות; piece_code/kind_code מוסיפים קודים חדשים בסוף
+PIECE_IDS: List[str] = ["PW", "NW", "BW", "RW", "QW", "KW", "PB", "NB", "BB", "RB", "QB", "KB"]
+KINDS: List[str] = ["Move", "Jump", "Idle", "LongRest", "ShortRest"]
+_piece_codes: Dict[str, int] = {p: i for i, p in enumerate(PIECE_IDS)}
+_kind_codes: Dict[str, int] = {k: i for i, k in enumerate(KINDS)}
+NOTATION_KINDS = {"M": _kind_codes["Move"], "J": _kind_codes["Jump"]}
+_notation_letters = {code: letter for letter, code in NOTATION_KINDS.items()}
+
+RECORD = struct.Struct("<qBBBBI")  # timestamp, piece, kind, src, dst, uid
+_NOTATION = re.compile(r"^(.+?)([MJ])([a-o])(\d{1,2})([a-o])(\d{1,2})$")
+
+
+def _register(name: str, names: List[str], codes: Dict[str, int]) -> int:
+    code = codes.get(name)
+    if code is None:
+        if len(names) > 0xFF:
+            raise ValueError(f"Too many codes, cannot register {name!r}")
+        code = codes[name] = len(names)
+        names.append(name)
+    return code
+
+
+def piece_code(piece_id: str) -> int:
+    """הקוד של מזהה כלי (מזהה חדש מקבל קוד בפעם הראשונה)."""
+    code = _piece_codes.get(piece_id)
+    return code if code is not None else _register(piece_id, PIECE_IDS, _piece_codes)
+
+
+def kind_code(kind: str) -> int:
+    code = _kind_codes.get(kind)
+    return code if code is not None else _register(kind, KINDS, _kind_codes)
+
+
+def pack_cell(cell: Optional[Cell]) -> int:
+    if cell is None:
+        return NO_CELL
+    r, c = cell
+    if not (0 <= r < MAX_CELLS and 0 <= c < MAX_CELLS):
+        raise ValueError(f"Cell {cell!r} does not fit in a packed cell (max {MAX_CELLS}x{MAX_CELLS})")
+    return r << 4 | c
+
+
+def unpack_cell(code: int) -> Optional[Cell]:
+    return None if code == NO_CELL else (code >> 4, code & 0xF)
+
+
+def cell_notation(code: int) -> str:
+    """תא דחוס -> עמודה כאות ושורה + 1 ("e5")."""
+    return f"{chr(ord('a') + (code & 0xF))}{(code >> 4) + 1}"
+
+
+class PackedCommand(NamedTuple):
+    timestamp: int
+    piece: int      # קוד ב-PIECE_IDS
+    kind: int       # קוד ב-KINDS
+    src: int        # תא דחוס או NO_CELL
+    dst: int
+    uid: int = 0    # Piece.uid, 0 = לא ידוע
+
+    @property
+    def piece_id(self) -> str:
+        return PIECE_IDS[self.piece]
+
+    @property
+    def type(self) -> str:
+        return KINDS[self.kind]
+
+    @classmethod
+    def of(cls, timestamp: int, piece_id: str, kind: str, src: Optional[Cell] = None,
+           dst: Optional[Cell] = None, uid: int = 0) -> "PackedCommand":
+        return cls(timestamp, piece_code(piece_id), kind_code(kind), pack_cell(src), pack_cell(dst), uid)
+
+    @classmethod
+    def from_command(cls, cmd: Command) -> "PackedCommand":
+        params = cmd.params
+        src = tuple(params[0]) if params and isinstance(params[0], (tuple, list)) else None
+        dst = cmd.target_cell
+        if dst is None and len(params) > 1 and isinstance(params[1], (tuple, list)):
+            dst = tuple(params[1])
+        return cls.of(cmd.timestamp, cmd.piece_id, cmd.type, src, dst, cmd.piece_uid or 0)
+
+    def to_command(self) -> Command:
+        """Command מלא, עם params=[src, dst, כתיב] כמו פקודות התנועה של המשחק."""
+        src, dst = unpack_cell(self.src), unpack_cell(self.dst)
+        if src is None or dst is None:
+            params = []
+        elif self.kind in _notation_letters:
+            params = [src, dst, to_notation(self)]
+        else:
+            params = [src, dst]
+        return Command(timestamp=self.timestamp, piece_id=self.piece_id, type=self.type,
+                       params=params, target_cell=dst, piece_uid=self.uid or None)
+
+
+def to_notation(cmd: PackedCommand) -> str:
+    """PackedCommand של Move/Jump -> "QBMe5e8"."""
+    letter = _notation_letters.get(cmd.kind)
+    if letter is None or cmd.src == NO_CELL or cmd.dst == NO_CELL:
+        raise ValueError(f"Only Move/Jump commands with cells have a notation: {cmd!r}")
+    return f"{PIECE_IDS[cmd.piece]}{letter}{cell_notation(cmd.src)}{cell_notation(cmd.dst)}"
+
+
+def from_notation(text: str, timestamp: int = 0, uid: int = 0) -> PackedCommand:
+    """"QBMe5e8" -> PackedCommand. זורק ValueError על כתיב לא תקין."""
+    m = _NOTATION.match(text)
+    if m is None:
+        raise ValueError(f"Invalid command notation {text!r}")
+    piece_id, letter, src_col, src_row, dst_col, dst_row = m.groups()
+    src = (int(src_row) - 1, ord(src_col) - ord('a'))
+    dst = (int(dst_row) - 1, ord(dst_col) - ord('a'))
+    return PackedCommand(timestamp, piece_code(piece_id), NOTATION_KINDS[letter],
+                         pack_cell(src), pack_cell(dst), uid)
+
+
+def encode(cmd: PackedCommand) -> bytes:
+    return RECORD.pack(*cmd)
+
+
+def decode(data, offset: int = 0) -> PackedCommand:
+    return PackedCommand._make(RECORD.unpack_from(data, offset))
+
+
+def encode_many(cmds: Iterable[PackedCommand]) -> bytes:
+    """כל הפקודות ברצף לבאפר אחד (RECORD.size בתים לכל פקודה)."""
+    cmds = list(cmds)
+    buf = bytearray(RECORD.size * len(cmds))
+    pack_into = RECORD.pack_into
+    for i, cmd in enumerate(cmds):
+        pack_into(buf, i * RECORD.size, *cmd)
+    return bytes(buf)
+
+
+def decode_many(data) -> Iterator[PackedCommand]:
+    make = PackedCommand._make
+    for fields in RECORD.iter_unpack(data):
+        yield make(fields)
@@ -0,0 +1,127 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import cv2
+
+from It1_interfaces.img import Img
+
+Rect = Tuple[int, int, int, int]  # (x0, y0, x1, y1), x1/y1 לא כלולים
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class Compositor:
+    """
+    מרכיב את תמונת הלוח רק באזורים שהשתנו (dirty rectangles).
+
+    במקום להעתיק את כל הרקע ולצייר מחדש את כל הכלים בכל פריים,
+    המרכיב שומר canvas קבוע. בכל פריים מדווחים לו מה צריך להופיע
+    (ספרייטים ומסגרות/טקסט של השחקנים); הוא משווה לפריים הקודם,
+    ורק באזורים שנפגעו - המיקום הישן והחדש של כלי שזז, פריים אנימציה
+    שהתחלף, סמן שזז, כלי שנאכל - משחזר את הרקע ומצייר מחדש את
+    הפריטים שחותכים אותם. לוח שלא השתנה לא עולה כמעט כלום.
+
+    שימוש בכל פריים:
+        compositor.begin_frame()
+        compositor.put_sprite(key, img, x, y)
+        compositor.put_rect(key, x, y, w, h, color, thickness)
+        damaged = compositor.render()
+    פריט שלא דווח בפריים הנוכחי נמחק מהתמונה.
+    """
+
+    def __init__(self, background: Img):
+        self.background = background
+        self.canvas = background.copy()
+        H, W = background.img.shape[:2]
+        self.bounds: Rect = (0, 0, W, H)
+        # key -> (z, seq, spec, rect) ; spec מתאר מה לצייר ומשמש להשוואה
+        self._items: Dict[Hashable, tuple] = {}
+        self._seen: set = set()
+        self._damage: List[Rect] = [self.bounds]
+        self._seq = 0
+
+    def begin_frame(self):
+        self._seen = set()
+
+    def invalidate(self, rect: Optional[Rect] = None):
+        """מסמן אזור (ברירת מחדל: כל הלוח) לציור מחדש."""
+        self._damage.append(self._clip(rect) if rect is not None else self.bounds)
+
+    def put_sprite(self, key: Hashable, img: Img, x: int, y: int, z: int = 0):
+        """ספרייט שצריך להופיע בפריים הנוכחי בפיקסל (x, y)."""
+        h, w = img.img.shape[:2]
+        self._put(key, z, ("sprite", img, x, y), (x, y, x + w, y + h))
+
+    def put_rect(self, key: Hashable, x: int, y: int, w: int, h: int, color, thickness: int = 2, z: int = 1):
+        """מסגרת (למשל סמן של שחקן) שצריכה להופיע בפריים הנוכחי."""
+        pad = thickness // 2 + 1
+        self._put(key, z, ("rect", x, y, w, h, tuple(color), thickness),
+                  (x - pad, y - pad, x + w + pad + 1, y + h + pad + 1))
+
+    def put_text(self, key: Hashable, txt: str, x: int, y: int, font_size: float,
+                 color=(255, 255, 255, 255), thickness: int = 1, z: int = 2):
+        """טקסט שצריך להופיע בפריים הנוכחי; (x, y) היא נקודת הבסיס שמאל-למטה."""
+        (tw, th), base = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, font_size, thickness)
+        pad = thickness + 1
+        self._put(key, z, ("text", txt, x, y, font_size, tuple(color), thickness),
+                  (x - pad, y - th - pad, x + tw + pad, y + base + pad))
+
+    def render(self) -> List[Rect]:
+        """
+        מעדכן את ה-canvas ומחזיר את רשימת המלבנים שצוירו מחדש.
+        """
+        for key in [k for k in self._items if k not in self._seen]:
+            self._damage.append(self._items.pop(key)[3])
+
+        damage, self._damage = self._damage, []
+        damage = [r for r in (self._clip(r) for r in damage) if r[0] < r[2] and r[1] < r[3]]
+        if not damage:
+            return []
+
+        items = sorted(self._items.values(), key=lambda it: (it[0], it[1]))
+        bg = self.background.img
+        dst = self.canvas.img
+        for rect in damage:
+            x0, y0, x1, y1 = rect
+            dst[y0:y1, x0:x1] = bg[y0:y1, x0:x1]
+            for _z, _seq, spec, item_rect in items:
+                if _intersects(rect, item_rect):
+                    self._draw(spec, rect)
+        return damage
+
+    def _put(self, key, z, spec, rect):
+        self._seen.add(key)
+        old = self._items.get(key)
+        if old is not None:
+            if old[2] == spec and old[0] == z:
+                return
+            self._damage.append(old[3])
+            seq = old[1]
+        else:
+            self._seq += 1
+            seq = self._seq
+        self._items[key] = (z, seq, spec, rect)
+        self._damage.append(rect)
+
+    def _clip(self, rect: Rect) -> Rect:
+        bx0, by0, bx1, by1 = self.bounds
+        return (max(rect[0], bx0), max(rect[1], by0), min(rect[2], bx1), min(rect[3], by1))
+
+    def _draw(self, spec: tuple, clip: Rect):
+        kind = spec[0]
+        if kind == "sprite":
+            _, img, x, y = spec
+            img.draw_on(self.canvas, x, y, clip=clip)
+            return
+
+        # מסגרות וטקסט מצוירים על view של אזור החיתוך, כך ש-OpenCV חותך בעצמו
+        x0, y0, x1, y1 = clip
+        view = self.canvas.img[y0:y1, x0:x1]
+        if kind == "rect":
+            _, x, y, w, h, color, thickness = spec
+            cv2.rectangle(view, (x - x0, y - y0), (x + w - x0, y + h - y0), color[:3], thickness)
+        elif kind == "text":
+            _, txt, x, y, font_size, color, thickness = spec
+            cv2.putText(view, txt, (x - x0, y - y0), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_size, color, thickness, cv2.LINE_AA)
@@ -0,0 +1,154 @@
+import pathlib
+from typing import Dict, Optional, Type
+
+import cv2
+import numpy as np
+
+from It1_interfaces.img import Img
+
+ESC_KEY = 27
+
+
+def _pixels(frame):
+    """מקבל Img או מערך פיקסלים ישירות."""
+    return frame.img if isinstance(frame, Img) else frame
+
+
+class Display:
+    """
+    יעד להצגת פריימים (backend). לולאת המשחק בוחרת מימוש אחד בהתחלה
+    וקוראת רק ל-show / poll_key / close, כך שאפשר להריץ בלי חלון.
+    """
+
+    def show(self, frame: Img):
+        """מציג (או שומר) את הפריים. לא חוסם."""
+        raise NotImplementedError
+
+    def poll_key(self) -> int:
+        """קוד המקש שנלחץ מאז הקריאה הקודמת, או -1 אם אין."""
+        return -1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Cv2Display(Display):
+    """חלון OpenCV. show לא חוסם; poll_key מריץ את לולאת האירועים של החלון."""
+
+    def __init__(self, window: str = "Image", wait_ms: int = 1):
+        self.window = window
+        self.wait_ms = wait_ms
+        self._opened = False
+
+    def show(self, frame: Img):
+        # imshow יוצר את החלון (AUTOSIZE) בקריאה הראשונה
+        cv2.imshow(self.window, _pixels(frame))
+        self._opened = True
+
+    def poll_key(self) -> int:
+        key = cv2.waitKey(self.wait_ms)
+        return key & 0xFF if key != -1 else -1
+
+    def close(self):
+        if self._opened:
+            cv2.destroyWindow(self.window)
+            self._opened = False
+
+
+class NullDisplay(Display):
+    """זורק את הפריימים - למדידת סימולציה והרכבה בלבד."""
+
+    def __init__(self):
+        self.frames_shown = 0
+
+    def show(self, frame: Img):
+        self.frames_shown += 1
+
+
+class RingBufferDisplay(Display):
+    """
+    שומר בזיכרון את capacity הפריימים האחרונים (לבדיקות ולהקלטה).
+    הבאפרים מוקצים פעם אחת ומועתקים לתוכם, בלי הקצאה לכל פריים.
+    """
+
+    def __init__(self, capacity: int = 60):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._buffers: list = []
+        self._next = 0
+        self.frames_shown = 0
+
+    def show(self, frame: Img):
+        pixels = _pixels(frame)
+        if len(self._buffers) < self.capacity:
+            self._buffers.append(pixels.copy())
+        else:
+            buf = self._buffers[self._next]
+            if buf.shape != pixels.shape or buf.dtype != pixels.dtype:
+                self._buffers[self._next] = pixels.copy()
+            else:
+                np.copyto(buf, pixels)
+        self._next = (self._next + 1) % self.capacity
+        self.frames_shown += 1
+
+    def frames(self) -> list:
+        """הפריימים השמורים, מהישן לחדש."""
+        if len(self._buffers) < self.capacity:
+            return list(self._buffers)
+        return self._buffers[self._next:] + self._buffers[:self._next]
+
+    def last(self) -> Optional[np.ndarray]:
+        if not self._buffers:
+            return None
+        return self._buffers[(self._next - 1) % len(self._buffers)]
+
+
+class RawFileDisplay(Display):
+    """
+    כותב כל פריים כבתים גולמיים (H x W x C, uint8, ברצף) לקובץ.
+    את הקובץ אפשר לקרוא עם np.fromfile(path, np.uint8).reshape(-1, *frame_shape),
+    או להעביר ל-ffmpeg כ-rawvideo.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self._file = open(self.path, "wb")
+        self.frame_shape: Optional[tuple] = None
+        self.frames_shown = 0
+
+    def show(self, frame: Img):
+        pixels = _pixels(frame)
+        if self.frame_shape is None:
+            self.frame_shape = pixels.shape
+        elif pixels.shape != self.frame_shape:
+            raise ValueError(f"Frame shape changed from {self.frame_shape} to {pixels.shape}")
+        self._file.write(np.ascontiguousarray(pixels).data)
+        self.frames_shown += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+DISPLAYS: Dict[str, Type[Display]] = {
+    "cv2": Cv2Display,
+    "null": NullDisplay,
+    "ring": RingBufferDisplay,
+    "raw": RawFileDisplay,
+}
+
+
+def create_display(name: str, **kwargs) -> Display:
+    """יוצר backend לפי שם: cv2 / null / ring / raw."""
+    try:
+        cls = DISPLAYS[name]
+    except KeyError:
+        raise ValueError(f"Unknown display backend: {name!r} (expected one of {sorted(DISPLAYS)})")
+    return cls(**kwargs)
@@ -1,147 +1,478 @@
-# import pathlib
-# import time
-# import keyboard
-# import cv2
-# from typing import List, Dict, Tuple
-# from It1_interfaces.img import Img
-# from It1_interfaces.Board import Board
-# from It1_interfaces.PieceFactory import PieceFactory
-# from It1_interfaces.Player import Player
-# from It1_interfaces.Command import Command
-
-# class Game:
-#     def __init__(self, board: Board, pieces_root: pathlib.Path, positions_file: pathlib.Path, players: List[Player]):
-#         self.board = board
-#         self.pieces_root = pieces_root
-#         self.positions_file = positions_file
-#         self.players = players
-#         self.pieces: List = []
-#         self.key_states = {}
-#         self._init_pieces()
-#         self._init_key_states()
-
-#     def _init_pieces(self):
-#         piece_factory = PieceFactory(self.board, self.pieces_root)
-#         pieces_positions = []
-#         with open(self.positions_file, "r", encoding="utf-8") as f:
-#             for line in f:
-#                 line = line.strip()
-#                 if not line or line.startswith("#"):
-#                     continue
-#                 parts = line.split()
-#                 if len(parts) == 3:
-#                     piece_id, row_str, col_str = parts
-#                     row, col = int(row_str), int(col_str)
-#                     pieces_positions.append((piece_id, row, col))
-#         for piece_id, row, col in pieces_positions:
-#             piece = piece_factory.create_piece(piece_id, (row, col))
-#             self.pieces.append(piece)
-
-#     def _init_key_states(self):
-#         for player in self.players:
-#             for action in ["select_piece", "move_piece"]:
-#                 key = player.controls[action]
-#                 self.key_states[key] = False
-
-#     def run(self):
-#         board_img = self.board.img.copy()
-#         print("התחל לשחק! לחצו ESC כדי לצאת.")
-#         cv2.namedWindow("Image", cv2.WINDOW_AUTOSIZE)
-
-#         while True:
-#             # רענון הלוח מהבסיס
-#             self.board.img = board_img.copy()
-
-#             # ציור הכלים
-#             for piece in self.pieces:
-#                 img_piece = piece._state._graphics.get_img()
-#                 row, col = piece._state._physics.current_cell
-#                 x, y = self.board.get_pixel_position((row, col))
-#                 img_piece.draw_on(self.board.img, x, y)
-
-#             # ציור מסגרות של שחקנים
-#             for player in self.players:
-#                 row, col = player.pos
-#                 x, y = self.board.get_pixel_position((row, col))
-#                 self.board.img.draw_rect(x, y, self.board.cell_W_pix, self.board.cell_H_pix, player.color, thickness=5)
-#                 if player.selected_piece is not None:
-#                     self.board.img.put_text("✓", x + 10, y + 30, font_size=1.5, color=(0,0,255,255), thickness=2)
-
-#             self.board.img.show(wait_ms=1)
-
-#             # קלט והפעלת פקודות
-#             for player in self.players:
-#                 row, col = player.pos
-#                 controls = player.controls
-
-#                 # תזוזה של הסמן
-#                 if keyboard.is_pressed(controls["up"]) and row > 0:
-#                     player.pos[0] -= 1
-#                     time.sleep(0.1)
-#                 if keyboard.is_pressed(controls["down"]) and row < self.board.H_cells - 1:
-#                     player.pos[0] += 1
-#                     time.sleep(0.1)
-#                 if keyboard.is_pressed(controls["left"]) and col > 0:
-#                     player.pos[1] -= 1
-#                     time.sleep(0.1)
-#                 if keyboard.is_pressed(controls["right"]) and col < self.board.W_cells - 1:
-#                     player.pos[1] += 1
-#                     time.sleep(0.1)
-
-#                 # בחירת כלי (בלחיצה טרייה)
-#                 select_key = controls["select_piece"]
-#                 if keyboard.is_pressed(select_key) and not self.key_states[select_key] and player.selected_piece is None:
-#                     for piece in self.pieces:
-#                         if hasattr(piece, "owner") and piece.owner == player.id and piece._state._physics.current_cell == tuple(player.pos):
-#                             player.selected_piece = piece
-#                             player.select_source = tuple(player.pos)
-#                             print(f"נבחר כלי: {piece.piece_id}")
-#                             break
-#                     self.key_states[select_key] = True
-#                 elif not keyboard.is_pressed(select_key):
-#                     self.key_states[select_key] = False
-
-#                 # בחירת יעד/הזזה (בלחיצה טרייה)
-#                 move_key = controls["move_piece"]
-#                 if keyboard.is_pressed(move_key) and not self.key_states[move_key] and player.selected_piece is not None:
-#                     src = player.select_source
-#                     dst = tuple(player.pos)
-#                     piece = player.selected_piece
-#                     legal_moves = piece._state._moves.get_moves(*src)
-#                     if dst not in legal_moves:
-#                         print("תנועה לא חוקית!")
-#                     else:
-#                         move_type = "J" if abs(src[0] - dst[0]) > 1 or abs(src[1] - dst[1]) > 1 else "M"
-#                         piece_id = piece.piece_id
-#                         src_str = f"{chr(ord('a')+src[1])}{src[0]+1}"
-#                         dst_str = f"{chr(ord('a')+dst[1])}{dst[0]+1}"
-#                         cmd_str = f"{piece_id}{move_type}{src_str}{dst_str}"
-#                         cmd = Command(
-#                             timestamp=int(time.time()*1000),
-#                             piece_id=piece_id,
-#                             type="Move" if move_type == "M" else "Jump",
-#                             params=[src, dst, cmd_str]
-#                         )
-#                         # בדוק אם יש כלי ביעד – אכול אותו
-#                         target_piece = None
-#                         for other in self.pieces:
-#                             if other._state._physics.current_cell == dst and other != piece:
-#                                 target_piece = other
-#                                 break
-#                         if target_piece and getattr(target_piece, "owner", None) != player.id:
-#                             self.pieces.remove(target_piece)
-#                         now_ms = int(time.time() * 1000)
-#                         piece.on_command(cmd, now_ms)
-#                         player.selected_piece = None
-#                         player.select_source = None
-#                         print(f"Command: {cmd_str}")
-#                     self.key_states[move_key] = True
-#                 elif not keyboard.is_pressed(move_key):
-#                     self.key_states[move_key] = False
-
-#             if keyboard.is_pressed("esc"):
-#                 break
-
-#             cv2.waitKey(1)
-
-#         cv2.destroyAllWindows()
\ No newline at end of file
+import heapq
+import itertools
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from It1_interfaces.Board import Board
+from It1_interfaces.Clock import Clock, ManualClock, MonotonicClock
+from It1_interfaces.Collisions import CaptureEvent, CollisionEngine
+from It1_interfaces.Command import Command
+from It1_interfaces.CommandBus import CommandBus, QueuedCommand, expand
+from It1_interfaces.CommandCodec import PackedCommand
+from It1_interfaces.Display import Cv2Display, Display, ESC_KEY, NullDisplay
+from It1_interfaces.InputListener import InputListener
+from It1_interfaces.Occupancy import OccupancyIndex
+from It1_interfaces import Snapshot, Trace
+from It1_interfaces.Trace import INFO
+from It1_interfaces.Trajectory import positions_at as trajectory_positions
+
+CURSOR_ACTIONS = ("up", "down", "left", "right")
+PIECE_ACTIONS = ("select_piece", "move_piece")
+
+_trace = Trace.get("Game")
+
+
+class Game:
+    """
+    מנוע המשחק: לולאה עם צעד סימולציה קבוע וקצב ציור נפרד.
+
+    - הסימולציה מתקדמת בצעדים של tick_ms בדיוק, כך שזמן המשחק לא תלוי בקצב
+      הציור. אם הלולאה מפגרת מריצים כמה צעדים ברצף, עד max_catch_up_ticks,
+      ואת השאר מוותרים כדי לא להיכנס לספירלה.
+    - הציור מתבצע לכל היותר render_fps פעמים בשנייה. render_fps=None מבטל את
+      ההגבלה (פריים בכל סיבוב, בלי שינה) - למדידות תפוקה.
+    - בין דדליינים הלולאה ישנה עד הדדליין הקרוב (צעד או פריים) במקום לסובב את המעבד.
+      כשאין קלט, פקודות או טיימרים של כלים היא לא מתעוררת לכל צעד, אלא רק לפריים הבא.
+    - אירועי המקלדת נאספים ב-thread נפרד (InputListener) ומנוקזים פעם אחת
+      בכל צעד, כך שלחיצה לא עוצרת את המשחק ולכל פקודה יש את זמן הלחיצה המדויק.
+    - כל הזמנים (צעדים, פריימים, קלט ופקודות) באים מ-clock אחד. עם ManualClock
+      המשחק רץ בלי מסך ובלי המתנה (ראו headless ו-advance).
+    """
+
+    def __init__(self, pieces: Iterable, board: Board, players: Iterable = (),
+                 display: Optional[Display] = None, renderer=None,
+                 tick_ms: int = 10, render_fps: Optional[float] = 60.0,
+                 max_catch_up_ticks: int = 5, clock: Optional[Clock] = None):
+        if tick_ms <= 0:
+            raise ValueError("tick_ms must be positive")
+        if render_fps is not None and render_fps <= 0:
+            raise ValueError("render_fps must be positive or None")
+        self.pieces = list(pieces)
+        self.board = board
+        self.players = list(players)
+        self.display = display if display is not None else Cv2Display(window="Game")
+        self.renderer = renderer
+        self.tick_ms = tick_ms
+        self.render_fps = render_fps
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.occupancy = OccupancyIndex(board.H_cells, board.W_cells)
+        self.collisions = CollisionEngine()
+        self.commands = CommandBus(resolve=self._find_piece)
+        # כלים עם תנועה או מנוחה שרצה: (דדליין, מספר סידורי, כלי) בערימה + uid -> הדדליין התקף
+        self._timers: List[Tuple[int, int, object]] = []
+        self._timer_seq = itertools.count()
+        self._deadlines: Dict[int, int] = {}
+        # uid -> כלי עם מסלול (תנועה) שרץ - רק הם ומה שבדרכם נכנסים לזיהוי ההתנגשויות
+        self._movers: Dict[int, object] = {}
+        # כלים בלי מכונת מצבים לא מדווחים דדליין - מעדכנים אותם בכל צעד
+        self._polled = [p for p in self.pieces if not hasattr(p, "state_machine")]
+        for piece in self.pieces:
+            if piece not in self._polled:
+                piece.on_schedule = self._schedule
+        for piece in self.pieces:
+            # כלים שאינם על הלוח לא מקבלים פקודות
+            if self.occupancy.track(piece) and not piece.is_captured():
+                self.commands.register(piece)
+        self.input = InputListener(self.clock)
+        self._keymap = self._build_keymap()
+        self.running = True
+        self.sim_ms = self.clock.now_ms()
+        self.ticks = 0
+        self.frames = 0
+        self._input_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def headless(cls, pieces: Iterable, board: Board, players: Iterable = (),
+                 clock: Optional[Clock] = None, tick_ms: int = 10) -> "Game":
+        """משחק בלי מסך ובלי ציור, על שעון וירטואלי (ManualClock) כברירת מחדל."""
+        return cls(pieces, board, players, display=NullDisplay(), tick_ms=tick_ms,
+                   render_fps=None, clock=clock if clock is not None else ManualClock())
+
+    # ─── זמן ──────────────────────────────────────────────────────────────
+    def game_time_ms(self) -> int:
+        """הזמן של השעון של המשחק במילישניות (מונוטוני כברירת מחדל)."""
+        return self.clock.now_ms()
+
+    def _sleep_until(self, deadline_ms: float):
+        """שינה עד הדדליין בשעון של המשחק (עם ManualClock - קפיצה מיידית)."""
+        self.clock.sleep_until(deadline_ms)
+
+    def clone_board(self) -> Board:
+        return self.board.clone()
+
+    # ─── קלט ──────────────────────────────────────────────────────────────
+    def start_user_input_thread(self):
+        """מפעיל את ה-thread שאוסף אירועי מקלדת."""
+        self._input_thread = self.input.start()
+
+    def _build_keymap(self) -> Dict[str, List[Tuple[object, str]]]:
+        """מקש -> [(שחקן, פעולה)] לפי ה-controls של השחקנים."""
+        keymap: Dict[str, List[Tuple[object, str]]] = {}
+        for player in self.players:
+            for action in CURSOR_ACTIONS + PIECE_ACTIONS:
+                key = player.controls.get(action)
+                if key is not None:
+                    keymap.setdefault(key.lower(), []).append((player, action))
+        return keymap
+
+    def _drain_input(self):
+        """מעבד את כל אירועי המקלדת שהצטברו מאז הצעד הקודם."""
+        for event in self.input.drain():
+            if not event.pressed:
+                continue
+            if event.key == "esc":
+                self.running = False
+                continue
+            for player, action in self._keymap.get(event.key, ()):
+                # החזקת מקש חוזרת על תזוזת הסמן; בחירה/הזזה רק בלחיצה טרייה
+                if event.repeat and action in PIECE_ACTIONS:
+                    continue
+                self._apply_action(player, action, event.timestamp_ms)
+
+    def _apply_action(self, player, action: str, ts: int):
+        if action in CURSOR_ACTIONS:
+            player.move_cursor(action, (self.board.H_cells, self.board.W_cells))
+        elif action == "select_piece":
+            if player.selected_piece is None:
+                self._select_piece(player)
+        elif action == "move_piece":
+            if player.selected_piece is not None:
+                self._move_selected(player, ts)
+
+    def _select_piece(self, player):
+        cell = tuple(player.pos)
+        piece = self.occupancy.at(cell)
+        if piece is not None and getattr(piece, "owner", None) == player.id:
+            player.selected_piece = piece
+            player.select_source = cell
+
+    def _move_selected(self, player, ts: int):
+        piece = player.selected_piece
+        src = player.select_source
+        dst = tuple(player.pos)
+        player.selected_piece = None
+        player.select_source = None
+        if piece.is_captured():
+            return
+        moves = piece.state_machine.current._moves
+        if not moves.is_legal(src, dst, self.occupancy.occupied, self.occupancy.owner_bits(player.id),
+                              first_move=not piece.has_moved):
+            if _trace.info:
+                _trace.log(INFO, "תנועה לא חוקית: %s %s -> %s", piece.piece_id, src, dst)
+            return
+        self.commands.push(self._make_move_command(piece.piece_id, src, dst, ts, piece.uid), piece)
+
+    @staticmethod
+    def _make_move_command(piece_id: str, src, dst, ts: int, uid: int = 0) -> PackedCommand:
+        """פקודת תנועה דחוסה - נשארת PackedCommand בתור ונפרסת רק במסירה לכלי."""
+        kind = "Jump" if abs(src[0] - dst[0]) > 1 or abs(src[1] - dst[1]) > 1 else "Move"
+        return PackedCommand.of(ts, piece_id, kind, src, dst, uid)
+
+    def _process_input(self, cmd: Command):
+        """מעביר פקודה לכלי שאליו היא מיועדת, מיד (בלי לעבור בתור)."""
+        piece = self.commands.route(cmd)
+        if piece is not None:
+            piece.on_command(cmd)
+
+    def _find_piece(self, cmd: Command):
+        if cmd.params:
+            piece = self.occupancy.at(tuple(cmd.params[0]))
+            if piece is not None and piece.piece_id == cmd.piece_id:
+                return piece
+        candidates = [p for p in self._live_pieces() if p.piece_id == cmd.piece_id]
+        # כמה כלים עם אותו מזהה (למשל רגלים) - מזהים לפי תא המקור
+        if len(candidates) > 1 and cmd.params:
+            src = tuple(cmd.params[0])
+            for piece in candidates:
+                if piece.cell == src:
+                    return piece
+        return candidates[0] if candidates else None
+
+    # ─── לולאה ────────────────────────────────────────────────────────────
+    def run(self, max_frames: Optional[int] = None):
+        """
+        מריץ את המשחק עד ESC, ניצחון, או max_frames פריימים (למדידות).
+        """
+        frame_ms = 1000.0 / self.render_fps if self.render_fps else 0.0
+        start = self.clock.now_ms()
+        self.sim_ms = start
+        next_tick = next_frame = start
+
+        while self.running:
+            if self._is_win():
+                self._announce_win()
+                break
+
+            now = self.clock.now_ms()
+            idle = self._idle_ticks(now)
+            if idle:
+                # צעדים בלי קלט, פקודות או דדליינים - מדלגים עליהם בקפיצה אחת
+                self.sim_ms += idle * self.tick_ms
+                next_tick += idle * self.tick_ms
+            steps = 0
+            while now >= next_tick and steps < self.max_catch_up_ticks:
+                self._tick()
+                next_tick += self.tick_ms
+                steps += 1
+            if now >= next_tick:
+                # מפגרים מדי - מוותרים על הצעדים שנשארו, אבל זמן הסימולציה מתקדם
+                # איתם כדי שיישאר צמוד לשעון (פקודות וקלט מגיעים בזמן השעון)
+                dropped = (now - next_tick) // self.tick_ms + 1
+                next_tick += dropped * self.tick_ms
+                self.sim_ms += dropped * self.tick_ms
+
+            if now >= next_frame:
+                self._draw()
+                if not self._show():
+                    break
+                self.frames += 1
+                if max_frames is not None and self.frames >= max_frames:
+                    break
+                next_frame = max(next_frame + frame_ms, now) if frame_ms else now
+
+            if frame_ms:
+                # ישנים עד הצעד שיש בו מה לעשות (דדליין, פקודה או קלט) או עד הפריים הבא
+                wake = next_tick + self._idle_ticks(int(next_frame)) * self.tick_ms
+                self._sleep_until(min(wake, next_frame))
+
+        self.running = False
+        self.input.stop()
+        self.display.close()
+
+    def _tick(self):
+        """צעד סימולציה אחד באורך tick_ms."""
+        start_ms = self.sim_ms
+        self.sim_ms += self.tick_ms
+        self.ticks += 1
+        self._drain_input()
+        self._dispatch_commands()
+        events = ()
+        if self._movers:
+            # הקטעים נלקחים לפני העדכון: מי שנוחת בצעד הזה עוד מתואר כבתנועה
+            events = self.collisions.detect(self._collision_candidates(), start_ms, self.sim_ms)
+        for piece in self._due_pieces():
+            piece.update(self.sim_ms)
+            self._schedule(piece)
+        for piece in self._polled:
+            if not piece.is_captured():
+                piece.update(self.sim_ms)
+        self._resolve_collisions(events)
+
+    def advance(self, ms: int) -> int:
+        """
+        מקדם את הסימולציה ב-ms מילישניות (בצעדים שלמים של tick_ms) בלי לצייר.
+        רצפים של צעדים בלי קלט, פקודות או דדליינים מדולגים בקפיצה אחת, כך
+        שעם ManualClock דקות של משחק רצות במספר צעדים כמספר האירועים.
+        נעצר בניצחון. מחזיר כמה צעדים רצו בפועל.
+        """
+        end = self.sim_ms + ms
+        ran = 0
+        while self.running and self.sim_ms + self.tick_ms <= end:
+            idle = self._idle_ticks(end)
+            if idle:
+                self.sim_ms += idle * self.tick_ms
+                self._sleep_until(self.sim_ms)
+                continue
+            self._sleep_until(self.sim_ms + self.tick_ms)
+            self._tick()
+            ran += 1
+            if self._is_win():
+                break
+        return ran
+
+    def simulate(self, commands: Iterable[QueuedCommand] = (), until_ms: Optional[int] = None) -> int:
+        """
+        מריץ זרם פקודות (לפי ה-timestamp שלהן) עד שלא נשאר מה לעשות - אין
+        פקודות ממתינות ואין כלים בתנועה או במנוחה - עד ניצחון או עד until_ms.
+        מחזיר את זמן הסימולציה בסוף.
+        """
+        for cmd in commands:
+            self.commands.push(cmd)
+        while self.running and not self._is_win():
+            upcoming = [t for t in (self.next_deadline(), self.commands.next_due()) if t is not None]
+            if not upcoming:
+                break
+            target = max(min(upcoming), self.sim_ms + self.tick_ms)
+            if until_ms is not None:
+                if self.sim_ms + self.tick_ms > until_ms:
+                    break
+                target = min(target, until_ms)
+            self.advance(-(-(target - self.sim_ms) // self.tick_ms) * self.tick_ms)
+        return self.sim_ms
+
+    def _idle_ticks(self, end_ms: int) -> int:
+        """כמה צעדים מכאן אפשר לדלג עליהם כי לא יקרה בהם כלום (לא יותר מעד end_ms)."""
+        if self._polled or self.input.pending():
+            return 0
+        upcoming = [t for t in (self.next_deadline(), self.commands.next_due()) if t is not None]
+        if upcoming and min(upcoming) <= end_ms:
+            # הצעד שמגיע לאירוע עצמו חייב לרוץ
+            return max(0, (min(upcoming) - self.sim_ms - 1) // self.tick_ms)
+        return max(0, (end_ms - self.sim_ms) // self.tick_ms)
+
+    # ─── תמונות מצב ───────────────────────────────────────────────────────
+    def snapshot(self) -> Snapshot.GameSnapshot:
+        """תמונת מצב לוגית (בלי פיקסלים) - ראו Snapshot."""
+        return Snapshot.capture(self)
+
+    def restore(self, snapshot: Snapshot.GameSnapshot):
+        Snapshot.restore(self, snapshot)
+
+    # ─── תזמון ────────────────────────────────────────────────────────────
+    def _dispatch_commands(self):
+        """
+        מעביר לכלים את הפקודות שהגיע זמנן (בשעון של אירועי הקלט, InputListener.now_ms).
+        הכלי מקבל את זמן הסימולציה של הצעד, כדי שהתנועה תתחיל בשעון שבו הוא מתעדכן.
+        """
+        for cmd, piece in self.commands.due(self.game_time_ms()):
+            piece = self.commands.route(cmd, piece)
+            if piece is not None:
+                piece.on_command(expand(cmd), self.sim_ms)
+
+    def _collision_candidates(self) -> List:
+        """
+        הכלים שבתנועה, ואיתם הכלים שעומדים בתחום המסלול שלהם (לפי אינדקס
+        התפוסה) - כלים במנוחה רחוק מכל תנועה לא יכולים להתנגש.
+        """
+        radius = self.collisions.radius
+        candidates = dict(self._movers)
+        for piece in self._movers.values():
+            trajectory = piece.state_machine.current._physics.trajectory
+            if trajectory is None:
+                continue
+            (r0, c0), (r1, c1) = trajectory.start, trajectory.end
+            near = self.occupancy.pieces_in(math.floor(min(r0, r1) - radius), math.ceil(max(r0, r1) + radius),
+                                            math.floor(min(c0, c1) - radius), math.ceil(max(c0, c1) + radius))
+            for other in near:
+                candidates.setdefault(other.uid, other)
+        return [p for p in candidates.values() if not p.is_captured()]
+
+    def _schedule(self, piece):
+        """רושם את הדדליין הבא של הכלי (סוף תנועה/מנוחה), אם יש לו כזה."""
+        if piece in self._polled:
+            return
+        deadline = piece.next_deadline()
+        if not isinstance(deadline, (int, float)):
+            self._deadlines.pop(piece.uid, None)
+            self._movers.pop(piece.uid, None)
+            return
+        if piece.state_machine.current._physics.trajectory is not None:
+            self._movers[piece.uid] = piece
+        else:
+            self._movers.pop(piece.uid, None)
+        if self._deadlines.get(piece.uid) == deadline:
+            return
+        self._deadlines[piece.uid] = deadline
+        heapq.heappush(self._timers, (deadline, next(self._timer_seq), piece))
+
+    def _due_pieces(self) -> List:
+        """מוציא מהערימה את הכלים שהדדליין שלהם הגיע (רשומות ישנות מדולגות)."""
+        due = []
+        timers = self._timers
+        while timers and timers[0][0] <= self.sim_ms:
+            deadline, _, piece = heapq.heappop(timers)
+            if self._deadlines.get(piece.uid) != deadline:
+                continue
+            del self._deadlines[piece.uid]
+            if not piece.is_captured():
+                due.append(piece)
+        return due
+
+    def reschedule(self):
+        """בונה מחדש את ערימת הטיימרים מהדדליינים של הכלים החיים."""
+        self._timers.clear()
+        self._deadlines.clear()
+        self._movers.clear()
+        for piece in self._live_pieces():
+            self._schedule(piece)
+
+    def next_deadline(self) -> Optional[int]:
+        """זמן הסימולציה של הטיימר הקרוב, או None כשאף כלי לא בתנועה או במנוחה."""
+        while self._timers and self._deadlines.get(self._timers[0][2].uid) != self._timers[0][0]:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    def positions_at(self, now_ms: int) -> Tuple[List, np.ndarray]:
+        """
+        הכלים החיים והמיקומים שלהם בזמן נתון (מערך (n, 2) של שורה, עמודה).
+        הכלים שבתנועה מחושבים יחד מהמסלולים שלהם ב-NumPy; השאר עומדים במקום.
+        """
+        pieces = self._live_pieces()
+        positions = np.empty((len(pieces), 2))
+        moving, trajectories = [], []
+        for i, piece in enumerate(pieces):
+            physics = piece.state_machine.current._physics
+            if physics.trajectory is not None:
+                moving.append(i)
+                trajectories.append(physics.trajectory)
+            else:
+                positions[i] = physics.current_pos_meters
+        if trajectories:
+            positions[moving] = trajectory_positions(trajectories, now_ms)
+        return pieces, positions
+
+    def _live_pieces(self) -> List:
+        return [p for p in self.pieces if not p.is_captured()]
+
+    def _draw(self):
+        """
+        מרכיב את הפריים ומציג אותו. עם renderer מצוירים רק האזורים שהשתנו;
+        בלעדיו - העתק של הלוח וכל הכלים מחדש.
+        """
+        if self.renderer is not None:
+            self.renderer.render(self._live_pieces(), self.players)
+            frame = self.board.get_image()
+        else:
+            board = self.clone_board()
+            frame = board.get_image()
+            for piece in self._live_pieces():
+                piece.draw(frame)
+        self.display.show(frame)
+
+    def _show(self) -> bool:
+        """מטפל באירועי החלון; ESC עוצר את המשחק."""
+        if self.display.poll_key() == ESC_KEY:
+            self.running = False
+            return False
+        return True
+
+    # ─── חוקים ────────────────────────────────────────────────────────────
+    def _resolve_collisions(self, events: Iterable[CaptureEvent] = ()):
+        """
+        מפעיל את אירועי האכילה של הצעד לפי סדר הזמן (כלי שכבר נאכל לא אוכל
+        ולא נאכל שוב). אחר כך - כלים שסיימו תנועה לתא תפוס אוכלים את הכלי
+        שנדחק ממנו, למקרה שהכלי לא מתואר ע"י CollisionEngine.
+        """
+        for event in events:
+            if not (event.capturer.is_captured() or event.captured.is_captured()):
+                self._capture(event.captured)
+        for piece, displaced in self.occupancy.drain_arrivals():
+            if (displaced is not None and not piece.is_captured()
+                    and displaced.can_be_captured() and piece.can_capture(displaced)):
+                self._capture(displaced)
+
+    def _capture(self, piece):
+        piece.capture()
+        self.occupancy.remove(piece)
+        self.commands.unregister(piece)
+        self._movers.pop(piece.uid, None)
+
+    def _is_win(self) -> bool:
+        live = self._live_pieces()
+        if len(live) <= 1:
+            return True
+        return any(p.piece_id.startswith("K") and p.is_captured() for p in self.pieces)
+
+    def _announce_win(self):
+        """ההודעה היחידה של המשחק למשתמש (print) - כל השאר עובר דרך Trace."""
+        live = self._live_pieces()
+        if not live:
+            print("No winner")
+            return
+        kings = [p for p in live if p.piece_id.startswith("K")]
+        winner = (kings or live)[0]
+        print(f"The winner is: {getattr(winner, 'owner', None) or winner.piece_id}")
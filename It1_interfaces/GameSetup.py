@@ -0,0 +1,140 @@
+"""
+בניית המשחק בפתיחה: לוח, תמונת הלוח וכלים.
+
+השלבים:
+  discover - קריאת board.txt ואיתור כל תיקיות ה-sprites של סוגי הכלים שבו
+  decode   - תמונת הלוח וכל תיקיות ה-sprites מפוענחות במקביל על מאגר
+             תהליכונים בגודל מספר הליבות (cv2 משחרר את ה-GIL בזמן הפענוח)
+  template - תבנית אחת לכל סוג כלי (moves, config, גרפיקה מהמטמון החם)
+  assemble - שכפול הכלים מהתבניות
+
+headless=True בונה את אותו משחק בלי פיקסלים: התמונות הן MockImg ואין פענוח
+(לבדיקות, בוטים וסימולציה בשרת - ראו Game.headless).
+
+כך הזמן עד הפריים הראשון נקבע בעיקר ע"י הפענוח האיטי ביותר ולא ע"י סכום כולם.
+"""
+import os
+import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from It1_interfaces.Board import Board
+from It1_interfaces.img import Img
+from It1_interfaces.mock_img import MockImg
+from It1_interfaces.Piece import Piece
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.SpriteBundle import SpriteBundle
+
+Position = Tuple[str, int, int, Optional[str]]  # (piece_id, row, col, owner)
+
+
+class GameSetup(NamedTuple):
+    board: Board
+    board_img: Img
+    pieces: List[Piece]
+    factory: PieceFactory
+    timings: Dict[str, float]  # שלב -> שניות, לפי סדר הביצוע
+
+
+def owner_for(piece_id: str, row: int) -> Optional[str]:
+    """הבעלים לפי צבע הכלי, או לפי השורה אם אין צבע."""
+    if piece_id.endswith("W") or row >= 6:
+        return "P1"
+    if piece_id.endswith("B") or row <= 1:
+        return "P2"
+    return None
+
+
+def read_positions(path: pathlib.Path) -> List[Position]:
+    """קורא את board.txt: שורות 'PW 6 0', הערות שמתחילות ב-#."""
+    positions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            if len(parts) == 3:
+                piece_id, row_str, col_str = parts
+                row, col = int(row_str), int(col_str)
+                positions.append((piece_id, row, col, owner_for(piece_id, row)))
+    return positions
+
+
+def sprite_folders(factory: PieceFactory, piece_ids) -> List[pathlib.Path]:
+    """כל תיקיות ה-sprites של המצבים של סוגי הכלים."""
+    cache = factory.graphics_factory.sprite_cache
+    folders = []
+    for piece_id in sorted(set(piece_ids)):
+        piece_dir = factory.pieces_root / piece_id
+        folders.extend(piece_dir / "states" / state / "sprites" for state in cache.state_names(piece_dir))
+    return folders
+
+
+def format_timings(timings: Dict[str, float]) -> str:
+    total = sum(timings.values())
+    phases = ", ".join(f"{name} {secs * 1000:.1f}ms" for name, secs in timings.items())
+    return f"{phases} (סה\"כ {total * 1000:.1f}ms)"
+
+
+def load_game(base_dir: pathlib.Path,
+              board: Board,
+              workers: Optional[int] = None,
+              positions_file: str = "board.txt",
+              board_image: str = "board.png",
+              fixed_point: bool = False,
+              headless: bool = False) -> GameSetup:
+    """
+    בונה את תמונת הלוח והכלים. board נבנה ע"י הקורא (מימדים) ותמונתו
+    מוצבת כאן אחרי הפענוח. workers=None -> מספר הליבות.
+    fixed_point -> פיזיקה בנקודה קבועה לכל הכלים (ראו FixedTrajectory).
+    headless -> תמונות MockImg בלי פענוח.
+    """
+    timings: Dict[str, float] = {}
+    t = time.perf_counter()
+
+    pieces_root = base_dir / "pieces"
+    # אם קומפלה חבילת ספרייטים (python -m It1_interfaces.SpriteBundle pieces pieces.kfsb)
+    # טוענים ממנה את כל הפריימים והקונפיגים בפתיחת קובץ אחת
+    bundle_path = base_dir / "pieces.kfsb"
+    bundle = SpriteBundle(bundle_path) if bundle_path.exists() else None
+    img_cls = MockImg if headless else Img
+    factory = PieceFactory(board=board, pieces_root=pieces_root, bundle=bundle, fixed_point=fixed_point,
+                           img_cls=img_cls)
+    positions = read_positions(base_dir / positions_file)
+    piece_ids = sorted({piece_id for piece_id, _, _, _ in positions})
+    folders = sprite_folders(factory, piece_ids)
+    t = _lap(timings, "discover", t)
+
+    cache = factory.graphics_factory.sprite_cache
+    cell_size = (board.cell_W_pix, board.cell_H_pix)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                            thread_name_prefix="game-setup") as pool:
+        board_future = pool.submit(lambda: img_cls().read(str(base_dir / board_image)))
+        frames = [pool.submit(cache.load_folder, folder, cell_size, img_cls=img_cls) for folder in folders]
+        for future in frames:
+            future.result()
+        board_img = board_future.result()
+        t = _lap(timings, "decode", t)
+
+        # כל הפריימים כבר במטמון, כאן נשארים קבצי config/moves קטנים
+        for future in [pool.submit(factory.template, piece_id) for piece_id in piece_ids]:
+            future.result()
+    board.img = board_img.copy()
+    t = _lap(timings, "template", t)
+
+    pieces = []
+    for piece_id, row, col, owner in positions:
+        piece = factory.create_piece(piece_id, (row, col))
+        piece.owner = owner
+        pieces.append(piece)
+    _lap(timings, "assemble", t)
+
+    return GameSetup(board, board_img, pieces, factory, timings)
+
+
+def _lap(timings: Dict[str, float], phase: str, start: float) -> float:
+    now = time.perf_counter()
+    timings[phase] = now - start
+    return now
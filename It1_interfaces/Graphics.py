@@ -2,11 +2,18 @@ import cmd
 import pathlib
 import copy
 import os
+import re
+from concurrent.futures import Future, wait
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from It1_interfaces.img import Img
 from It1_interfaces.Command import Command
 from It1_interfaces.Board import Board
+from It1_interfaces.SpriteCache import SpriteCache, get_sprite_cache
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG, WARNING
+
+_trace = Trace.get("Graphics")
 
 
 class Graphics:
@@ -14,11 +21,14 @@ class Graphics:
                  sprites_folder: pathlib.Path,
                  board: Board,
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 sprite_cache: Optional[SpriteCache] = None,
+                 img_cls: type = Img):
         self.sprites_folder = sprites_folder
         self.board = board
         self.loop = loop
         self.fps = fps
+        self.sprite_cache = sprite_cache if sprite_cache is not None else get_sprite_cache()
 
         self.frames: List[Img] = []
         self.frame_paths: List[pathlib.Path] = []
@@ -26,70 +36,130 @@ class Graphics:
         self.last_update_ms: int = 0
         self.img: Optional[Img] = None
         self.current_cmd: Optional[Command] = None
-        self.Img = Img  # ניתן להחלפה מבחוץ
+        self.Img = img_cls  # ניתן להחלפה מבחוץ (MockImg במשחק בלי מסך)
+        self._pending: Dict[str, Future] = {}  # מצב -> טעינה ברקע
+        self._wanted_state: Optional[str] = None  # מצב שממתין לפריימים
+        # שם תיקיית מצב -> (frames_per_sec, is_loop) מה-config שלו
+        self.state_params: Dict[str, Tuple[float, bool]] = {}
 
         self._load_idle(sprites_folder)
 
     def _load_idle(self, subdir: str):
-
-        path = self.sprites_folder / "states" / "idle" / "sprites"
-        if not path.exists():
-            print(f"⚠️ תיקיית idle לא קיימת: {path}")
+        if not self._load_state("idle"):
+            if _trace.warning:
+                _trace.log(WARNING, "לא נטענו פריימים ב־idle (%s)", self.sprites_folder)
+
+    @staticmethod
+    def state_dir_name(cmd_type: str) -> str:
+        """ממיר סוג פקודה לשם תיקיית המצב: "LongRest" -> "long_rest"."""
+        return re.sub(r'(?<!^)(?=[A-Z])', '_', cmd_type).lower()
+
+    def _state_sprites(self, state_name: str) -> pathlib.Path:
+        return self.sprites_folder / "states" / state_name / "sprites"
+
+    def _cell_size(self):
+        return (self.board.cell_W_pix, self.board.cell_H_pix)
+
+    def prefetch(self, states: Optional[Iterable[str]] = None) -> Dict[str, Future]:
+        """
+        מתזמן טעינה ברקע של מצבים (ברירת מחדל: כל המצבים חוץ מ-idle).
+        מחזיר את ה-Futures לפי שם מצב.
+        """
+        if states is None:
+            states = [s for s in self.sprite_cache.state_names(self.sprites_folder) if s != "idle"]
+        for state_name in states:
+            if state_name not in self._pending:
+                self._pending[state_name] = self.sprite_cache.prefetch_folder(
+                    self._state_sprites(state_name), size=self._cell_size(), img_cls=self.Img)
+        return {s: self._pending[s] for s in states}
+
+    def is_ready(self, state_name: str) -> bool:
+        """האם הפריימים של המצב כבר מפוענחים וזמינים בלי חסימה."""
+        return self.sprite_cache.is_cached(self._state_sprites(state_name),
+                                           size=self._cell_size(), img_cls=self.Img)
+
+    def wait_ready(self, states: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> bool:
+        """
+        ממתין עד שהמצבים (ברירת מחדל: כל מה שתוזמן) נטענו.
+        מחזיר True אם הכל מוכן לפני שעבר ה-timeout.
+        """
+        futures = list(self.prefetch(states).values()) if states is not None else list(self._pending.values())
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def _poll_pending(self):
+        """מחליף לפריימים של המצב המבוקש ברגע שהטעינה ברקע הסתיימה."""
+        fut = self._pending.get(self._wanted_state)
+        if fut is None or not fut.done():
             return
+        state_name, self._wanted_state = self._wanted_state, None
+        path = self._state_sprites(state_name)
+        try:
+            frames = fut.result()
+        except Exception as exc:
+            # טעינה ברקע שנכשלה לא מפילה את הציור: מנסים פעם אחת טעינה רגילה,
+            # ואם גם היא נכשלת נשארים עם הפריימים הנוכחיים
+            del self._pending[state_name]
+            if _trace.warning:
+                _trace.log(WARNING, "טעינה ברקע נכשלה עבור %s: %r", path, exc)
+            try:
+                self._load_state(state_name)
+            except Exception as retry_exc:
+                if _trace.warning:
+                    _trace.log(WARNING, "גם הטעינה הרגילה נכשלה עבור %s: %r", path, retry_exc)
+            return
+        if frames is None:
+            if _trace.warning:
+                _trace.log(WARNING, "לא נמצאה תיקייה עבור: %s", path)
+        self.frames = list(frames or [])
+        self.frame_paths = list(self.sprite_cache.frame_paths(path) or [])
+        self.cur_frame_idx = 0
+        self.img = self.frames[0] if self.frames else None
 
-        pngs = sorted(
-            [p for p in path.iterdir()
-             if p.suffix.lower() == ".png" and p.stem.isdigit() and int(p.stem) >= 1],
-                key=lambda p: int(p.stem)
-        )
-        self.frame_paths = pngs
+    def _load_state(self, state_name: str) -> bool:
+        """
+        טוען את הפריימים של מצב מתוך המטמון המשותף.
+        רק בפעם הראשונה לכל תיקייה יש גישה לדיסק.
+        """
+        path = self.sprites_folder / "states" / state_name / "sprites"
+        pngs = self.sprite_cache.frame_paths(path)
+        if pngs is None:
+            if _trace.warning:
+                _trace.log(WARNING, "לא נמצאה תיקייה עבור: %s", path)
+            return False
 
-        for png_path in pngs:
-            frame = self.Img()
-            frame.read(str(png_path), size=(self.board.cell_W_pix, self.board.cell_H_pix))  # קריאה של התמונה לתוך אובייקט Img
-            self.frames.append(frame)
+        self.frames = list(self.sprite_cache.load_folder(path, size=self._cell_size(), img_cls=self.Img) or [])
+        self.frame_paths = list(pngs)
 
         if self.frames:
             self.cur_frame_idx = 0
             self.img = self.frames[0]
-        else:
-            print("⚠️ לא נטענו פריימים ב־idle.")
+        return bool(self.frames)
 
     def reset(self, cmd: Command):
         self.current_cmd = cmd
-        self.frames = []
-        self.frame_paths = []
         self.cur_frame_idx = 0
         self.last_update_ms = 0
-        self.img = None
 
-        # subdir = f"{cmd.piece_id}/states/{cmd.type.lower()}"
-        # path = self.sprites_folder / subdir
-        state_name = cmd.type.lower()
-        path = self.sprites_folder / "states" / state_name / "sprites"
-        if not path.exists():
-            print(f"⚠️ לא נמצאה תיקייה עבור: {path}")
-            return
-
-        pngs = sorted(
-            [p for p in path.iterdir()
-            if p.suffix.lower() == ".png" and p.stem.isdigit() and int(p.stem) >= 1],
-            key=lambda p: int(p.stem)
-        )
-        self.frame_paths = pngs
-
-        for png_path in pngs:
-            frame = self.Img()
-            frame.read(str(png_path), size=(self.board.cell_W_pix, self.board.cell_H_pix))
-            self.frames.append(frame)
-
-        if self.frames:
-            self.cur_frame_idx = 0
-            self.img = self.frames[0]
-            # x, y = self.board.get_pixel_position(cmd.target_cell)
-            # self.img.reset((x, y))
+        state_name = self.state_dir_name(cmd.type)
+        params = self.state_params.get(state_name)
+        if params is not None:
+            self.fps, self.loop = params
+        if self.is_ready(state_name):
+            self._wanted_state = None
+            self.frames = []
+            self.frame_paths = []
+            self.img = None
+            self._load_state(state_name)
+        else:
+            # לא חוסמים על פענוח: ממשיכים להציג את הפריימים הנוכחיים
+            # ומחליפים ב-update/get_img כשהטעינה ברקע מסתיימת
+            self._wanted_state = state_name
+            self.prefetch([state_name])
 
     def update(self, now_ms: int):
+        if self._wanted_state is not None:
+            self._poll_pending()
         if not self.frames:
             return
         elapsed = now_ms - self.last_update_ms
@@ -105,16 +175,18 @@ class Graphics:
         self.last_update_ms = now_ms
 
     def get_img(self) -> Optional[Img]:
-        print("get_img called, returning:", self.img)
+        if self._wanted_state is not None:
+            self._poll_pending()
+        if _trace.debug:
+            _trace.log(DEBUG, "get_img called, returning: %r", self.img)
 
         return self.img
 
     def copy(self):
-        g = Graphics(self.sprites_folder, self.board, self.loop, self.fps)
-        g.frames = self.frames
-        g.frame_paths = self.frame_paths
-        g.cur_frame_idx = self.cur_frame_idx
-        g.last_update_ms = self.last_update_ms
-        g.current_cmd = self.current_cmd
-        g.img = copy.copy(self.img) if self.img is not None else None
+        """
+        עותק לכלי נוסף מאותו סוג: הפריימים (Img) ורשימות הפריימים משותפים,
+        מצב האנימציה (פריים נוכחי, זמנים, פקודה) נפרד לכל עותק.
+        """
+        g = copy.copy(self)
+        g._pending = dict(self._pending)
         return g
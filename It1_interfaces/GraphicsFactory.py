@@ -1,26 +1,37 @@
 from pathlib import Path
+from typing import Optional
 from It1_interfaces.Graphics import Graphics
 from It1_interfaces.Board import Board
 from It1_interfaces.Command import Command
+from It1_interfaces.img import Img
+from It1_interfaces.SpriteCache import SpriteCache, get_sprite_cache
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+
+_trace = Trace.get("GraphicsFactory")
 
 class GraphicsFactory:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, sprite_cache: Optional[SpriteCache] = None, img_cls: type = Img):
         self.board = board
+        self.sprite_cache = sprite_cache if sprite_cache is not None else get_sprite_cache()
+        self.img_cls = img_cls
 
     def load(self,
          sprites_dir: Path,
          cfg: dict,
          cell_size: tuple[int, int]) -> Graphics:
-        print(f"[DEBUG] Loading sprites from: {sprites_dir}")
+        if _trace.debug:
+            _trace.log(DEBUG, "Loading sprites from: %s", sprites_dir)
         fps = cfg.get("frames_per_sec", 6.0)
         loop = cfg.get("is_loop", True)
 
         gfx = Graphics(sprites_folder=sprites_dir,
                    board=self.board,
                    loop=loop,
-                   fps=fps)
-
-        if "ImgClass" in cfg:
-            gfx.Img = cfg["ImgClass"]
+                   fps=fps,
+                   sprite_cache=self.sprite_cache,
+                   img_cls=cfg.get("ImgClass", self.img_cls))
 
+        # רק idle נטען מראש; שאר המצבים מפוענחים ברקע
+        gfx.prefetch()
         return gfx
@@ -0,0 +1,81 @@
+import collections
+import threading
+from typing import Deque, List, NamedTuple, Optional
+
+from It1_interfaces.Clock import Clock, MonotonicClock
+
+
+class KeyEvent(NamedTuple):
+    timestamp_ms: int   # זמן האירוע בשעון של המשחק (Game.clock)
+    key: str            # שם המקש כפי ש-keyboard מדווח, באותיות קטנות ("w", "space", "enter")
+    pressed: bool       # True בלחיצה, False בשחרור
+    repeat: bool        # לחיצה חוזרת של מערכת ההפעלה כשמחזיקים את המקש
+
+
+class InputListener:
+    """
+    אוסף אירועי מקלדת ב-thread ייעודי במקום לדגום keyboard.is_pressed בכל פריים.
+
+    ה-hook של keyboard קורא ל-on_key בכל לחיצה/שחרור; כל אירוע מקבל חותמת
+    זמן מהשעון (מונוטוני כברירת מחדל) ונכנס ל-deque (append/popleft בטוחים בין threads בלי נעילה).
+    לולאת המשחק קוראת ל-drain פעם אחת בכל צעד ומקבלת את כל האירועים לפי הסדר.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self._events: Deque[KeyEvent] = collections.deque()
+        self._held: set = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def now_ms(self) -> int:
+        return self.clock.now_ms()
+
+    def on_key(self, key: str, pressed: bool, timestamp_ms: Optional[int] = None):
+        """רושם אירוע מקש. נקרא מה-hook, או ישירות (בדיקות, מקורות קלט אחרים)."""
+        if timestamp_ms is None:
+            timestamp_ms = self.now_ms()
+        key = key.lower()
+        if pressed:
+            repeat = key in self._held
+            self._held.add(key)
+        else:
+            repeat = False
+            self._held.discard(key)
+        self._events.append(KeyEvent(timestamp_ms, key, pressed, repeat))
+
+    def pending(self) -> bool:
+        return bool(self._events)
+
+    def drain(self) -> List[KeyEvent]:
+        """מוציא את כל האירועים שהצטברו מאז הקריאה הקודמת."""
+        events = []
+        pop = self._events.popleft
+        while self._events:
+            events.append(pop())
+        return events
+
+    def _on_keyboard_event(self, event):
+        if event.name is None:
+            return
+        import keyboard
+        self.on_key(event.name, event.event_type == keyboard.KEY_DOWN)
+
+    def run(self):
+        """גוף ה-thread: מתקין hook ומחכה עד stop."""
+        import keyboard  # pip install keyboard ; נטען רק כשיש קלט אמיתי
+
+        hook = keyboard.hook(self._on_keyboard_event)
+        try:
+            self._stop.wait()
+        finally:
+            keyboard.unhook(hook)
+
+    def start(self) -> threading.Thread:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="user-input", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
@@ -1,5 +1,201 @@
 import pathlib
-from typing import List, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from It1_interfaces import Trace
+from It1_interfaces.Bitboard import BitboardMoves, iter_cells
+from It1_interfaces.Trace import WARNING
+
+Cell = Tuple[int, int]
+ALL_SQUARES = -1  # כל הביטים דולקים
+
+_trace = Trace.get("Moves")
+
+
+class MoveTable:
+    """
+    טבלת יעדים מחושבת מראש: לכל משבצת מוצא - היעדים שבתוך הלוח.
+
+    נבנית פעם אחת לכל (קבוצת תנועות, מימדי לוח) ומשותפת לכל הכלים מאותו סוג.
+    היעדים שמורים בצורה דחוסה (CSR): targets הוא מערך int16 בגודל N x 2 של
+    כל היעדים ברצף, ו-offsets[i]:offsets[i+1] הם היעדים של משבצת i = r * cols + c.
+    לכל משבצת שמור גם tuple של היעדים, שמוחזר כמו שהוא מ-get_moves.
+    """
+
+    def __init__(self, deltas: Tuple[Cell, ...], dims: Tuple[int, int]):
+        rows, cols = dims
+        self.deltas = deltas
+        self.dims = dims
+        squares = []
+        flat = []
+        offsets = [0]
+        for r in range(rows):
+            for c in range(cols):
+                dests = tuple((r + dr, c + dc) for dr, dc in deltas
+                              if 0 <= r + dr < rows and 0 <= c + dc < cols)
+                squares.append(dests)
+                flat.extend(dests)
+                offsets.append(len(flat))
+        self._squares: Tuple[Tuple[Cell, ...], ...] = tuple(squares)
+        self.targets = np.array(flat, dtype=np.int16).reshape(-1, 2)
+        self.offsets = np.array(offsets, dtype=np.int32)
+        self.targets.flags.writeable = False
+        self.offsets.flags.writeable = False
+        self._bitboard: Optional[BitboardMoves] = None
+
+    @property
+    def bitboard(self) -> BitboardMoves:
+        """מחולל הביטבורדים של אותן תנועות (נבנה בשימוש הראשון)."""
+        if self._bitboard is None:
+            self._bitboard = BitboardMoves(self.deltas, self.dims)
+        return self._bitboard
+
+    def get(self, r: int, c: int) -> Tuple[Cell, ...]:
+        rows, cols = self.dims
+        if not (0 <= r < rows and 0 <= c < cols):
+            return ()
+        return self._squares[r * cols + c]
+
+    def destinations(self, r: int, c: int) -> np.ndarray:
+        """היעדים של (r, c) כ-view לקריאה בלבד לתוך targets."""
+        i = r * self.dims[1] + c
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+
+_tables: Dict[Tuple[Tuple[Cell, ...], Tuple[int, int]], MoveTable] = {}
+
+
+def move_table(deltas: Tuple[Cell, ...], dims: Tuple[int, int]) -> MoveTable:
+    """הטבלה המשותפת לקבוצת התנועות ולמימדי הלוח (נבנית בפעם הראשונה)."""
+    key = (deltas, tuple(dims))
+    table = _tables.get(key)
+    if table is None:
+        table = _tables.setdefault(key, MoveTable(deltas, tuple(dims)))
+    return table
+
+
+class MoveContext(NamedTuple):
+    """מצב הלוח שמולו בודקים את ה-modifiers של התנועות."""
+    occupied: int       # ביטבורד כל המשבצות התפוסות
+    own: int            # ביטבורד הכלים של השחקן שזז
+    first_move: bool    # האם הכלי עוד לא זז מאז תחילת המשחק
+
+    @property
+    def enemy(self) -> int:
+        return self.occupied & ~self.own
+
+
+# modifier -> פונקציה שמחזירה את המשבצות שבהן יעד עם ה-modifier הזה אסור
+Restriction = Callable[[MoveContext], int]
+MODIFIERS: Dict[str, Restriction] = {}
+_aliases: Dict[str, str] = {}
+
+
+def register_modifier(name: str, restriction: Restriction, aliases: Iterable[str] = ()):
+    """
+    מוסיף modifier שאפשר לכתוב ב-moves.txt אחרי נקודתיים (למשל 1,1:capture).
+    restriction מקבל MoveContext ומחזיר ביטבורד של משבצות שאסור להגיע אליהן
+    בתנועה שמסומנת ב-modifier הזה.
+    """
+    MODIFIERS[name] = restriction
+    _aliases[name] = name
+    for alias in aliases:
+        _aliases[alias] = name
+
+
+def parse_modifiers(tag: Optional[str]) -> FrozenSet[str]:
+    """'capture:1st' -> {'capture', '1st'} בשמות הקנוניים. modifier לא מוכר מתעלם (עם אזהרה)."""
+    if not tag:
+        return frozenset()
+    names = set()
+    for part in tag.split(':'):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name = _aliases.get(part)
+        if name is None:
+            if _trace.warning:
+                _trace.log(WARNING, "unknown move modifier %r ignored", part)
+            continue
+        names.add(name)
+    return frozenset(names)
+
+
+register_modifier("capture", lambda ctx: ~ctx.enemy)                          # רק אכילה
+register_modifier("non_capture", lambda ctx: ctx.occupied, aliases=("quiet",))  # רק למשבצת ריקה
+register_modifier("1st", lambda ctx: 0 if ctx.first_move else ALL_SQUARES, aliases=("first",))
+
+
+RuleEntry = Tuple[int, int, FrozenSet[str]]
+
+
+class MoveRules:
+    """
+    חוקי התנועה של סוג כלי, מקומפלים: טבלת היעדים (MoveTable) ולכל modifier
+    שבשימוש - מסכה לכל משבצת של היעדים שמסומנים בו.
+
+    יעד שמופיע בכמה שורות מקבל רק את ה-modifiers המשותפים לכולן (שורה בלי
+    modifier מבטלת את ההגבלה). בזמן שאילתה כל modifier הוא כמה פעולות ביטים:
+    mask &= ~(tagged & restriction(ctx)) - בלי מחרוזות ובלי מעבר על רשימות.
+    """
+
+    def __init__(self, entries: Tuple[RuleEntry, ...], dims: Tuple[int, int]):
+        rows, cols = dims
+        self.dims = dims
+        tags: Dict[Cell, FrozenSet[str]] = {}
+        for dr, dc, names in entries:
+            delta = (dr, dc)
+            tags[delta] = tags[delta] & names if delta in tags else names
+        self.deltas: Tuple[Cell, ...] = tuple(tags)
+        self.table = move_table(self.deltas, dims)
+        self.modifiers: Dict[str, List[int]] = {}
+        for name in sorted(set().union(*tags.values())):
+            tagged = [d for d, names in tags.items() if name in names]
+            masks = []
+            for r in range(rows):
+                for c in range(cols):
+                    mask = 0
+                    for dr, dc in tagged:
+                        nr, nc = r + dr, c + dc
+                        if 0 <= nr < rows and 0 <= nc < cols:
+                            mask |= 1 << (nr * cols + nc)
+                    masks.append(mask)
+            self.modifiers[name] = masks
+        self._checks: Tuple[Tuple[Restriction, List[int]], ...] = tuple(
+            (MODIFIERS[name], masks) for name, masks in self.modifiers.items())
+
+    def legal_mask(self, r: int, c: int, occupied: int = 0, own: int = 0,
+                   first_move: bool = True) -> int:
+        mask = self.table.bitboard.legal_mask(r, c, occupied, own)
+        if mask and self._checks:
+            ctx = MoveContext(occupied, own, first_move)
+            i = r * self.dims[1] + c
+            for restriction, masks in self._checks:
+                tagged = masks[i] & mask
+                if tagged:
+                    mask &= ~(tagged & restriction(ctx))
+        return mask
+
+    def is_legal(self, src: Cell, dst: Cell, occupied: int = 0, own: int = 0,
+                 first_move: bool = True) -> bool:
+        rows, cols = self.dims
+        if not (0 <= dst[0] < rows and 0 <= dst[1] < cols):
+            return False
+        return bool(self.legal_mask(src[0], src[1], occupied, own, first_move) >> (dst[0] * cols + dst[1]) & 1)
+
+
+_rules: Dict[Tuple[Tuple[RuleEntry, ...], Tuple[int, int]], MoveRules] = {}
+
+
+def move_rules(entries: Tuple[RuleEntry, ...], dims: Tuple[int, int]) -> MoveRules:
+    """החוקים המקומפלים המשותפים לרשומות ולמימדי הלוח (נבנים בפעם הראשונה)."""
+    key = (entries, tuple(dims))
+    rules = _rules.get(key)
+    if rules is None:
+        rules = _rules.setdefault(key, MoveRules(entries, tuple(dims)))
+    return rules
+
 
 class Moves:
     """
@@ -24,33 +220,64 @@ class Moves:
         dims : Tuple[int, int]
             מימדי הלוח (שורות, עמודות).
         """
-        self.dims = dims
-        self.moves: List[Tuple[int, int]] = []
+        self._load(self.read_entries(txt_path), dims)
+
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[int, int, Optional[str]]],
+                     dims: Tuple[int, int]) -> "Moves":
+        """
+        בונה Moves מרשומות שכבר פוענחו (למשל מתוך SpriteBundle),
+        בלי לקרוא את moves.txt מהדיסק.
+        """
+        moves = cls.__new__(cls)
+        moves._load([tuple(e) for e in entries], dims)
+        return moves
 
+    @classmethod
+    def read_entries(cls, txt_path: pathlib.Path) -> List[Tuple[int, int, Optional[str]]]:
+        """קורא את moves.txt ומחזיר את רשימת הרשומות (dr, dc, modifier)."""
         with open(txt_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                # הסרת הערות בתוך שורה
-                if '#' in line:
-                    line = line[:line.index('#')].strip()
-                parts = line.split(',')
-                if len(parts) < 2:
-                    continue
-                try:
-                    dr = int(parts[0].strip())
-                    # תמיכה בשורות כמו 1,0:non_capture
-                    dc_part = parts[1].strip()
-                    if ':' in dc_part:
-                        dc_part = dc_part.split(':')[0]
-                    dc = int(dc_part)
-                except ValueError:
-                    continue
-                # מסננים תנועות שמוציאות את הכלי מחוץ ללוח
-                if not self._is_in_bounds(dr, dc):
-                    continue
-                self.moves.append((dr, dc))
+            return [e for e in map(cls.parse_line, file) if e is not None]
+
+    @staticmethod
+    def parse_line(line: str) -> Optional[Tuple[int, int, Optional[str]]]:
+        """
+        מפענח שורה אחת מ-moves.txt לרשומה (dr, dc, modifier).
+        מחזיר None עבור שורה ריקה, הערה או שורה לא תקינה.
+        """
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
+        # הסרת הערות בתוך שורה
+        if '#' in line:
+            line = line[:line.index('#')].strip()
+        parts = line.split(',')
+        if len(parts) < 2:
+            return None
+        try:
+            dr = int(parts[0].strip())
+            # תמיכה בשורות כמו 1,0:non_capture
+            dc_part = parts[1].strip()
+            tag = None
+            if ':' in dc_part:
+                dc_part, tag = dc_part.split(':', 1)
+                tag = tag.strip() or None
+            dc = int(dc_part)
+        except ValueError:
+            return None
+        return dr, dc, tag
+
+    def _load(self, entries: List[Tuple[int, int, Optional[str]]], dims: Tuple[int, int]):
+        self.dims = dims
+        rule_entries = []
+        for dr, dc, tag in entries:
+            # מסננים תנועות שמוציאות את הכלי מחוץ ללוח
+            if not self._is_in_bounds(dr, dc):
+                continue
+            rule_entries.append((dr, dc, parse_modifiers(tag)))
+        self.rules = move_rules(tuple(rule_entries), dims)
+        self.moves: Tuple[Cell, ...] = self.rules.deltas
+        self.table = self.rules.table
 
     def _is_in_bounds(self, dr: int, dc: int) -> bool:
         """
@@ -68,19 +295,26 @@ class Moves:
         # ניתן להתאים את זה לפי הצורך המדויק במשחק שלך
         return -rows < dr < rows and -cols < dc < cols
 
-    def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
+    def get_moves(self, r: int, c: int) -> Tuple[Cell, ...]:
         """
-        מחזיר את רשימת התנועות האפשריות מנקודה (r, c) על הלוח.
+        מחזיר את היעדים האפשריים מנקודה (r, c) על הלוח.
 
-        כאן התנועות הן הזזות יחסיות, לכן מחזירים רק את תנועות ה- delta
-        שנשמרו בקונסטרקטור, המסוננות לפי גבולות הלוח.
+        זו שליפה מהטבלה המשותפת: tuple (לא ניתן לשינוי) שמשותף לכל הקוראים,
+        ו-() עבור משבצת מחוץ ללוח.
+        """
+        return self.table.get(r, c)
 
-        ניתן להרחיב לפונקציה שמחזירה מיקומים מוחלטים אם תרצה.
+    def legal_moves(self, r: int, c: int, occupied: int = 0, own: int = 0,
+                    first_move: bool = True) -> Tuple[Cell, ...]:
         """
-        valid_moves = []
-        rows, cols = self.dims
-        for dr, dc in self.moves:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols:
-                valid_moves.append((nr, nc))
-        return valid_moves
+        היעדים מ-(r, c) בהינתן תפוסה: קרניים נעצרות בכלי הראשון בדרך,
+        ולא נכנסים למשבצת של כלי עצמי. occupied ו-own הם ביטבורדים
+        (ראו OccupancyIndex.occupied / owner_bits).
+        ה-modifiers מ-moves.txt נאכפים: capture רק על כלי יריב, non_capture
+        רק למשבצת ריקה, ו-1st רק כש-first_move.
+        """
+        return tuple(iter_cells(self.rules.legal_mask(r, c, occupied, own, first_move), self.dims[1]))
+
+    def is_legal(self, src: Cell, dst: Cell, occupied: int = 0, own: int = 0,
+                 first_move: bool = True) -> bool:
+        return self.rules.is_legal(src, dst, occupied, own, first_move)
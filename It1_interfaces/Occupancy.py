@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]
+EMPTY = 0
+
+
+class OccupancyIndex:
+    """
+    אינדקס תפוסה של הלוח: מערך H x W של מזהי כלים (piece.uid, 0 = ריק)
+    ומפה הפוכה uid -> (כלי, תא). "מי נמצא ב-(r, c)" ו-"האם התא פנוי" הן O(1).
+
+    במקביל נשמרים ביטבורדים (ביט r * cols + c): occupied לכל הלוח ו-owner_bits
+    לכל שחקן, לשאילתות חוקיות של Moves.legal_moves / is_legal.
+
+    האינדקס מתעדכן כשכלי מסיים תנועה (Piece.update קורא ל-on_arrive) וכשכלי
+    נאכל (remove). כלי שמגיע לתא תפוס דוחק את הכלי שהיה שם; הכלי הנדחק נשמר
+    בצד עד שהמשחק מכריע (אכילה, או שהוא עוזב) ומדווח ב-drain_arrivals.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.grid = np.zeros((rows, cols), dtype=np.int32)
+        self._pieces: Dict[int, object] = {}
+        self._cells: Dict[int, Cell] = {}
+        self._under: Dict[Cell, int] = {}   # תא -> uid של כלי שנדחק ממנו
+        self._arrivals: List[Tuple[object, Optional[object]]] = []
+        self.occupied = 0
+        self._owner_bits: Dict[object, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._pieces)
+
+    def clear(self):
+        """מרוקן את האינדקס (לפני בנייה מחדש, למשל בשחזור תמונת מצב)."""
+        self.grid[:] = EMPTY
+        self._pieces.clear()
+        self._cells.clear()
+        self._under.clear()
+        self._arrivals.clear()
+        self.occupied = 0
+        self._owner_bits.clear()
+
+    def track(self, piece) -> bool:
+        """
+        מוסיף כלי לאינדקס ומחבר את ה-callback של סיום תנועה.
+        כלי בלי תא על הלוח לא נכנס לאינדקס.
+        """
+        cell = getattr(piece, "cell", None)
+        if cell is None:
+            return False
+        uid = piece.uid
+        self._pieces[uid] = piece
+        self._enter(uid, tuple(cell))
+        piece.on_arrive = self.moved
+        return True
+
+    def at(self, cell: Cell):
+        """הכלי שנמצא בתא, או None."""
+        uid = int(self.grid[cell[0], cell[1]])
+        return self._pieces.get(uid) if uid != EMPTY else None
+
+    def pieces_in(self, r0: int, r1: int, c0: int, c1: int) -> List:
+        """הכלים בתאים [r0, r1] x [c0, c1] (כולל), גם כלים שנדחקו. הטווח נחתך לגבולות הלוח."""
+        rows, cols = self.grid.shape
+        r0, r1, c0, c1 = max(r0, 0), min(r1, rows - 1), max(c0, 0), min(c1, cols - 1)
+        if r0 > r1 or c0 > c1:
+            return []
+        box = self.grid[r0:r1 + 1, c0:c1 + 1]
+        uids = [int(u) for u in box[box != EMPTY]]
+        uids += [u for (r, c), u in self._under.items() if r0 <= r <= r1 and c0 <= c <= c1]
+        return [self._pieces[u] for u in uids if u in self._pieces]
+
+    def is_free(self, cell: Cell) -> bool:
+        return self.grid[cell[0], cell[1]] == EMPTY
+
+    def owner_bits(self, owner) -> int:
+        """ביטבורד המשבצות שבהן עומד כלי של owner."""
+        return self._owner_bits.get(owner, 0)
+
+    def cell_of(self, piece) -> Optional[Cell]:
+        return self._cells.get(piece.uid)
+
+    def moved(self, piece):
+        """כלי סיים תנועה לתא חדש."""
+        uid = piece.uid
+        old = self._cells.get(uid)
+        if old is not None:
+            self._leave(uid, old)
+        displaced = self._enter(uid, tuple(piece.cell))
+        self._arrivals.append((piece, self._pieces.get(displaced) if displaced else None))
+
+    def remove(self, piece):
+        """מוציא כלי (למשל שנאכל) מהאינדקס."""
+        uid = piece.uid
+        cell = self._cells.pop(uid, None)
+        if cell is not None:
+            self._leave(uid, cell)
+        self._pieces.pop(uid, None)
+
+    def drain_arrivals(self) -> List[Tuple[object, Optional[object]]]:
+        """(כלי שהגיע, הכלי שנדחק מהתא או None) מאז הקריאה הקודמת."""
+        arrivals, self._arrivals = self._arrivals, []
+        return arrivals
+
+    def _enter(self, uid: int, cell: Cell) -> int:
+        r, c = cell
+        displaced = int(self.grid[r, c])
+        if displaced != EMPTY:
+            self._under[cell] = displaced
+        self._set(cell, displaced, uid)
+        self._cells[uid] = cell
+        return displaced
+
+    def _leave(self, uid: int, cell: Cell):
+        r, c = cell
+        if self.grid[r, c] == uid:
+            self._set(cell, uid, self._under.pop(cell, EMPTY))
+        elif self._under.get(cell) == uid:
+            del self._under[cell]
+
+    def _set(self, cell: Cell, old: int, new: int):
+        r, c = cell
+        self.grid[r, c] = new
+        bit = 1 << (r * self.grid.shape[1] + c)
+        if old != EMPTY:
+            owner = getattr(self._pieces.get(old), "owner", None)
+            self._owner_bits[owner] = self._owner_bits.get(owner, 0) & ~bit
+        if new != EMPTY:
+            owner = getattr(self._pieces.get(new), "owner", None)
+            self._owner_bits[owner] = self._owner_bits.get(owner, 0) | bit
+            self.occupied |= bit
+        else:
+            self.occupied &= ~bit
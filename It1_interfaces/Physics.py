@@ -1,21 +1,62 @@
 from typing import Tuple, Optional
 from It1_interfaces.Command import Command
 from It1_interfaces.Board import Board
-import math
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+from It1_interfaces.Trajectory import FixedTrajectory, Trajectory, fixed_speed, from_fixed, to_fixed
+
+_trace = Trace.get("Physics")
 
 
 class Physics:
-    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0):
-        """Initialize physics with starting cell, board, and speed."""
+    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0,
+                 fixed_point: bool = False):
+        """
+        Initialize physics with starting cell, board, and speed.
+        With fixed_point, moves run on integer positions and arrival times
+        (see FixedTrajectory) so lockstep simulations stay bit-for-bit equal:
+        current_pos_fx/target_pos_fx are the state, and the *_meters
+        properties are float views of them for rendering.
+        """
         self.board = board
         self.speed_m_s = speed_m_s
+        self.fixed_point = fixed_point
         self.current_cell = start_cell
+        self.current_pos_fx = self.target_pos_fx = (0, 0)
         self.current_pos_meters = self._cell_to_meters(start_cell)
         self.target_pos_meters = self.current_pos_meters
         self.is_moving = False
         self.start_time_ms = 0
+        self.finish_ms: Optional[int] = None  # when the running move/rest completes (known once it starts)
+        self.trajectory: Optional[Trajectory] = None  # the running move, set when it starts
         self.current_command = None
         
+    @property
+    def current_pos_meters(self) -> Tuple[float, float]:
+        if self.fixed_point:
+            return from_fixed(self.current_pos_fx)
+        return self._current_pos_meters
+
+    @current_pos_meters.setter
+    def current_pos_meters(self, pos: Tuple[float, float]):
+        if self.fixed_point:
+            self.current_pos_fx = to_fixed(pos)
+        else:
+            self._current_pos_meters = pos
+
+    @property
+    def target_pos_meters(self) -> Tuple[float, float]:
+        if self.fixed_point:
+            return from_fixed(self.target_pos_fx)
+        return self._target_pos_meters
+
+    @target_pos_meters.setter
+    def target_pos_meters(self, pos: Tuple[float, float]):
+        if self.fixed_point:
+            self.target_pos_fx = to_fixed(pos)
+        else:
+            self._target_pos_meters = pos
+
     def _cell_to_meters(self, cell: Tuple[int, int]) -> Tuple[float, float]:
         """Convert cell coordinates to meter coordinates."""
         # Assuming each cell is 1 meter x 1 meter
@@ -48,16 +89,24 @@ class Physics:
     #             self.is_moving = False
     #     else:
     #         self.is_moving = False
-    def reset(self, cmd: Command):
-        """Reset physics state with a new command."""
-        print("Physics.reset: got cmd", cmd)
+    def reset(self, cmd: Command, now_ms: Optional[int] = None):
+        """
+        Reset physics state with a new command. With `now_ms` the move starts
+        right away (trajectory and finish_ms are known on return); without it
+        it starts on the first update.
+        """
+        if _trace.debug:
+            _trace.log(DEBUG, "Physics.reset: got cmd %r", cmd)
         self.current_command = cmd
+        self.finish_ms = None
+        self.trajectory = None
     # נסה להוציא יעד מהפקודה
         target_cell = getattr(cmd, 'target_cell', None)
         if target_cell is None and hasattr(cmd, 'params') and len(cmd.params) > 1:
         # params=[src, dst, ...]
             target_cell = cmd.params[1]
-        print(f"[DEBUG] Physics.reset: target_cell={target_cell}")
+        if _trace.debug:
+            _trace.log(DEBUG, "Physics.reset: target_cell=%s", target_cell)
 
         if target_cell is not None:
             try:
@@ -66,8 +115,11 @@ class Physics:
                     int(target_cell[1])
                     self.target_pos_meters = self._cell_to_meters(target_cell)
                     self.is_moving = True
-                    print("Physics.reset: is_moving set to True, target_cell:", target_cell)
-                    self.start_time_ms = 0  # Will be set in first update call
+                    if _trace.debug:
+                        _trace.log(DEBUG, "Physics.reset: is_moving set to True, target_cell: %s", target_cell)
+                    self.start_time_ms = 0
+                    if now_ms is not None:
+                        self._start(now_ms)
                 else:
                     self.is_moving = False
             except (TypeError, ValueError, IndexError):
@@ -75,53 +127,79 @@ class Physics:
         else:
             self.is_moving = False
 
+    def plan(self, start_ms: int):
+        """
+        The trajectory of the pending move if it starts at `start_ms`, without
+        starting it (None when there is nothing to move or the speed is zero).
+        """
+        if self.fixed_point:
+            if self.target_pos_fx == self.current_pos_fx or self.speed_m_s <= 0:
+                return None
+            return FixedTrajectory.between(self.current_pos_fx, self.target_pos_fx,
+                                           start_ms, fixed_speed(self.speed_m_s))
+        if self.target_pos_meters == self.current_pos_meters or self.speed_m_s <= 0:
+            return None
+        return Trajectory.between(self.current_pos_meters, self.target_pos_meters, start_ms, self.speed_m_s)
+
+    def _start(self, now_ms: int):
+        """Start the move at `now_ms`: the whole move is known up front, so build its trajectory once."""
+        self.start_time_ms = now_ms
+        self.trajectory = self.plan(now_ms)
+        if self.trajectory is not None:
+            self.finish_ms = self.trajectory.end_ms
+        elif self.target_pos_meters == self.current_pos_meters:
+            self.is_moving = False
+
     def update(self, now_ms: int) -> Optional[Command]:
         """Update physics state based on current time."""
-        print("Physics.update: is_moving", self.is_moving, "current_cell", self.current_cell, "target", self.target_pos_meters)
+        if _trace.debug:
+            _trace.log(DEBUG, "Physics.update: is_moving %s current_cell %s target %s",
+                       self.is_moving, self.current_cell, self.target_pos_meters)
 
         if not self.is_moving:
             return None
-            
-        if self.start_time_ms == 0:
-            self.start_time_ms = now_ms
-            
-        elapsed_ms = now_ms - self.start_time_ms
-        elapsed_s = elapsed_ms / 1000.0
-        
-        # Calculate distance to travel
-        dx = self.target_pos_meters[0] - self.current_pos_meters[0]
-        dy = self.target_pos_meters[1] - self.current_pos_meters[1]
-        total_distance = math.sqrt(dx**2 + dy**2)
-        
-        if total_distance == 0:
-            self.is_moving = False
+
+        if self.trajectory is None:
+            # reset without a start time: the move starts now
+            self._start(self.start_time_ms or now_ms)
+            if self.trajectory is None:
+                return None
+
+        if now_ms < self.finish_ms:
+            if self.fixed_point:
+                self.current_pos_fx = self.trajectory.at_fixed(now_ms)
+            else:
+                self.current_pos_meters = self.trajectory.at(now_ms)
             return None
-            
-        # Calculate how far we should have traveled by now
-        distance_traveled = self.speed_m_s * elapsed_s
-        if distance_traveled >= total_distance:
-    # Movement completed
-            self.current_pos_meters = self.target_pos_meters
+
+        # Movement completed
+        if self.fixed_point:
+            self.current_cell = self.trajectory.end_cell
+            self.current_pos_fx = self.trajectory.end_fx
+        else:
             self.current_cell = (int(self.target_pos_meters[0]), int(self.target_pos_meters[1]))
-            self.is_moving = False
-            completed_command = self.current_command
-            self.current_command = None
-            # החזר פקודת מעבר מתאימה
-            if completed_command and completed_command.type == "Move":
-                return Command(
-                    timestamp=now_ms,
-                    piece_id=completed_command.piece_id,
-                    type="LongRest",
-                    params=[]
-                )
-            elif completed_command and completed_command.type == "Jump":
-                return Command(
-                    timestamp=now_ms,
-                    piece_id=completed_command.piece_id,
-                    type="ShortRest",
-                    params=[]
-                )
-            return None
+            self.current_pos_meters = self.target_pos_meters
+        self.finish_ms = None
+        self.trajectory = None
+        self.is_moving = False
+        completed_command = self.current_command
+        self.current_command = None
+        # החזר פקודת מעבר מתאימה
+        if completed_command and completed_command.type == "Move":
+            return Command(
+                timestamp=now_ms,
+                piece_id=completed_command.piece_id,
+                type="LongRest",
+                params=[]
+            )
+        elif completed_command and completed_command.type == "Jump":
+            return Command(
+                timestamp=now_ms,
+                piece_id=completed_command.piece_id,
+                type="ShortRest",
+                params=[]
+            )
+        return None
 
     def can_be_captured(self) -> bool:
         """Check if this piece can be captured."""
@@ -133,12 +211,25 @@ class Physics:
         # Default implementation - can capture when not moving
         return not self.is_moving
 
+    def position_at(self, now_ms: int) -> Tuple[float, float]:
+        """Position in meters at any time, without advancing the simulation."""
+        if self.trajectory is not None:
+            return self.trajectory.at(now_ms)
+        return self.current_pos_meters
+
     def get_pos(self) -> Tuple[int, int]:
         """
         Current pixel-space upper-left corner of the sprite in world coordinates (in pixels).
         """
         return self._meters_to_pixels(self.current_pos_meters)
 
+    def place(self, cell: Tuple[int, int]):
+        """Put the piece at rest on a cell (used when another state hands the piece over)."""
+        self.current_cell = tuple(cell)
+        self.current_pos_meters = self._cell_to_meters(cell)
+        self.target_pos_meters = self.current_pos_meters
+        self.trajectory = None
+
 
 class IdlePhysics(Physics):
     """Physics for pieces that don't move - always idle."""
@@ -147,7 +238,7 @@ class IdlePhysics(Physics):
         super().__init__(start_cell, board, speed_m_s)
         self.is_moving = False  # Never moves
     
-    def reset(self, cmd: Command):
+    def reset(self, cmd: Command, now_ms: Optional[int] = None):
         """Idle physics ignores movement commands."""
         # Don't change state for idle physics
         pass
@@ -168,24 +259,29 @@ class IdlePhysics(Physics):
 class MovePhysics(Physics):
     """Physics for pieces that can move with enhanced movement capabilities."""
     
-    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 2.0):
-        super().__init__(start_cell, board, speed_m_s)
+    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 2.0,
+                 fixed_point: bool = False):
+        super().__init__(start_cell, board, speed_m_s, fixed_point)
         self.can_move_while_capturing = True
         self.capture_immunity_duration_ms = 500  # Half second immunity after capturing
         self.last_capture_time_ms = 0
     
-    def reset(self, cmd: Command):
+    def reset(self, cmd: Command, now_ms: Optional[int] = None):
         """Enhanced reset with capture detection."""
         
-        super().reset(cmd)
+        super().reset(cmd, now_ms)
         if hasattr(cmd, 'is_capture') and cmd.is_capture:
             self.last_capture_time_ms = 0  # Will be set on next update
-        print(f"[DEBUG] MovePhysics.reset: current_cell={self.current_cell}, target={getattr(cmd, 'target_cell', None)}, is_moving={self.is_moving}")
+        if _trace.debug:
+            _trace.log(DEBUG, "MovePhysics.reset: current_cell=%s, target=%s, is_moving=%s",
+                       self.current_cell, getattr(cmd, 'target_cell', None), self.is_moving)
 
     
     def update(self, now_ms: int) -> Optional[Command]:
         """Enhanced update with capture timing."""
-        print(f"[DEBUG] MovePhysics.update: current_cell={self.current_cell}, target={self.target_pos_meters}, is_moving={self.is_moving}")
+        if _trace.debug:
+            _trace.log(DEBUG, "MovePhysics.update: current_cell=%s, target=%s, is_moving=%s",
+                       self.current_cell, self.target_pos_meters, self.is_moving)
 
         if self.last_capture_time_ms == 0 and hasattr(self.current_command, 'is_capture'):
             if getattr(self.current_command, 'is_capture', False):
@@ -210,3 +306,40 @@ class MovePhysics(Physics):
     def set_capture_ability(self, can_capture_while_moving: bool):
         """Configure whether this piece can capture while moving."""
         self.can_move_while_capturing = can_capture_while_moving
+
+
+class RestPhysics(IdlePhysics):
+    """Physics for cooldown states: stays in place and finishes after a fixed duration."""
+
+    def __init__(self, start_cell: Tuple[int, int], board: Board, duration_ms: int = 1000,
+                 next_state: str = "Idle"):
+        super().__init__(start_cell, board)
+        self.duration_ms = duration_ms
+        self.next_state = next_state
+
+    def reset(self, cmd: Command, now_ms: Optional[int] = None):
+        """Start the rest period at `now_ms`, or on the first update without it."""
+        self.current_command = cmd
+        self.start_time_ms = 0
+        self.finish_ms = None
+        if cmd is not None and now_ms is not None:
+            self.start_time_ms = now_ms
+            self.finish_ms = now_ms + self.duration_ms
+
+    def update(self, now_ms: int) -> Optional[Command]:
+        if self.current_command is None:
+            return None
+        if self.finish_ms is None:
+            self.start_time_ms = now_ms
+            self.finish_ms = now_ms + self.duration_ms
+        if now_ms < self.finish_ms:
+            return None
+        finished = self.current_command
+        self.current_command = None
+        self.finish_ms = None
+        return Command(
+            timestamp=now_ms,
+            piece_id=finished.piece_id,
+            type=self.next_state,
+            params=[]
+        )
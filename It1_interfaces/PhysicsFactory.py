@@ -1,24 +1,38 @@
+from typing import Tuple
+
 from It1_interfaces. Board import Board
-from It1_interfaces. Physics import Physics, IdlePhysics, MovePhysics
+from It1_interfaces. Physics import Physics, IdlePhysics, MovePhysics, RestPhysics
 
 
 class PhysicsFactory:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, fixed_point: bool = False):
         
         self.board = board
+        # פיזיקה בנקודה קבועה (מיקומים וזמני הגעה שלמים) לסימולציה דטרמיניסטית
+        self.fixed_point = fixed_point
+
+    def spec(self, cfg) -> Tuple[type, dict]:
+        """
+        מחלקת הפיזיקה והפרמטרים שלה לפי קטע ה-physics של config.json.
+        בלי "type": מהירות חיובית -> move, duration_ms -> rest, אחרת idle.
+        """
+        physics_type = cfg.get("type")
+        speed = cfg.get("speed_m_per_sec", cfg.get("speed_m_s"))
+        if physics_type is None and speed is not None:
+            physics_type = "move" if speed > 0 else ("rest" if cfg.get("duration_ms") else "idle")
+        physics_type = (physics_type or "base").lower()
 
-    def create(self, start_cell, cfg) -> Physics:
-       
-        physics_type = cfg.get("type", "base").lower()
-        
         if physics_type == "move":
-            speed = cfg.get("speed_m_s", 1.0)
-            return MovePhysics(start_cell, self.board, speed_m_s=speed)
-        
-        elif physics_type == "idle":
-            return IdlePhysics(start_cell, self.board)
-        
-        else:
-            # ברירת מחדל: מחלקת Physics בסיסית
-            speed = cfg.get("speed_m_s", 1.0)
-            return Physics(start_cell, self.board, speed_m_s=speed)
+            return MovePhysics, {"speed_m_s": speed if speed is not None else 1.0,
+                                 "fixed_point": self.fixed_point}
+        if physics_type == "rest":
+            return RestPhysics, {"duration_ms": cfg.get("duration_ms", 1000),
+                                 "next_state": cfg.get("next_state", "Idle")}
+        if physics_type == "idle":
+            return IdlePhysics, {}
+        # ברירת מחדל: מחלקת Physics בסיסית
+        return Physics, {"speed_m_s": speed if speed is not None else 1.0, "fixed_point": self.fixed_point}
+
+    def create(self, start_cell, cfg) -> Physics:
+        cls, kwargs = self.spec(cfg)
+        return cls(start_cell, self.board, **kwargs)
@@ -80,7 +80,13 @@
 from It1_interfaces.Board import Board
 from It1_interfaces.Command import Command
 from It1_interfaces.State import State
-from typing import Optional
+from typing import Callable, Optional, Tuple
+import itertools
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+
+_trace = Trace.get("Piece")
+_uids = itertools.count(1)  # מזהה מספרי ייחודי לכל כלי (0 שמור ל"אין כלי")
 
 class Piece:
     def __init__(self, piece_id: str, state_machine):
@@ -92,6 +98,17 @@ class Piece:
         """
         self.piece_id = piece_id
         self.state_machine = state_machine
+        self.uid = next(_uids)
+        self.captured = False
+        self.arrived_ms = 0  # הזמן שבו הכלי הגיע לתא הנוכחי
+        self.has_moved = False  # לתנועות 1st ב-moves.txt
+        self.on_arrive: Optional[Callable[["Piece"], None]] = None  # נקרא כשהכלי מסיים תנועה לתא חדש
+        self.on_schedule: Optional[Callable[["Piece"], None]] = None  # נקרא אחרי פקודה (דדליין חדש)
+
+    @property
+    def cell(self) -> Tuple[int, int]:
+        """התא הנוכחי של הכלי (לפי הפיזיקה של המצב הנוכחי)."""
+        return self.state_machine.current._physics.current_cell
 
     def is_command_possible(self, cmd: Command) -> bool:
         """
@@ -100,13 +117,19 @@ class Piece:
         """
         return cmd.piece_id == self.piece_id
 
-    def on_command(self, cmd: Command, now_ms: int):
+    def on_command(self, cmd: Command, now_ms: Optional[int] = None):
         """
         טיפול בפקודה שהגיעה לכלי.
+        ברירת המחדל לזמן היא זמן הפקודה עצמה.
         """
-        print("Piece.on_command called for", self.piece_id, "with cmd", cmd)
+        if _trace.debug:
+            _trace.log(DEBUG, "Piece.on_command called for %s with cmd %r", self.piece_id, cmd)
+        if now_ms is None:
+            now_ms = cmd.timestamp
         if self.is_command_possible(cmd):
             self.state_machine.process_command(cmd, now_ms)
+            if self.on_schedule is not None:
+                self.on_schedule(self)
 
     def reset(self, start_ms: int):
         """
@@ -119,8 +142,53 @@ class Piece:
         """
         עדכון מצב הכלי בזמן נתון.
         """
-        print("Piece.update called for", self.piece_id)
+        if _trace.debug:
+            _trace.log(DEBUG, "Piece.update called for %s", self.piece_id)
+        before = self.cell
         self.state_machine.update(now_ms)
+        if self.cell != before:
+            self.arrived_ms = now_ms
+            self.has_moved = True
+            if self.on_arrive is not None:
+                self.on_arrive(self)
+
+    def position_at(self, now_ms: int) -> Tuple[float, float]:
+        """המיקום (שורה, עמודה) בזמן נתון, גם באמצע תנועה, בלי לקדם את הסימולציה."""
+        return self.state_machine.current._physics.position_at(now_ms)
+
+    def next_deadline(self) -> Optional[int]:
+        """מתי הכלי צריך עדכון (סוף התנועה או המנוחה), או None כשהוא עומד בלי טיימר."""
+        return self.state_machine.current._physics.finish_ms
+
+    def can_be_captured(self) -> bool:
+        """כלי שבאמצע תנועה כבר עזב את התא שלו ולכן לא נאכל בו."""
+        return not self.captured and self.state_machine.current._physics.can_be_captured()
+
+    def can_capture(self, other: "Piece") -> bool:
+        """
+        הכלי שהגיע אחרון לתא אוכל כלי של היריב שנמצא באותו תא.
+        """
+        return (not self.captured
+                and other is not self
+                and getattr(other, "owner", None) != getattr(self, "owner", None)
+                and other.cell == self.cell
+                and self.arrived_ms > other.arrived_ms)
+
+    def capture(self):
+        self.captured = True
+
+    def is_captured(self) -> bool:
+        return self.captured
+
+    def draw(self, board_img):
+        """ציור הכלי במיקום התא שלו על תמונת הלוח."""
+        state = self.state_machine.current
+        img = state._graphics.get_img()
+        if img is None:
+            return
+        board = state._physics.board
+        x, y = board.get_pixel_position(self.cell)
+        img.draw_on(board_img, x, y)
 
     def draw_on_board(self, board: Board, now_ms: int):
         """
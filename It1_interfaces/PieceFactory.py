@@ -54,48 +54,110 @@ from It1_interfaces.Piece import Piece
 from It1_interfaces.State import State  
 from It1_interfaces.Moves import Moves
 from It1_interfaces.StateMachine import StateMachine
-from It1_interfaces.Physics import IdlePhysics, MovePhysics
+from It1_interfaces.StateTable import DEFAULT_REST_MS, StateTable, folder_name
+from It1_interfaces.SpriteBundle import SpriteBundle
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+from typing import Dict, List, Optional, Tuple
 
 
-class PieceFactory:
-    def __init__(self, board: Board, pieces_root: pathlib.Path):
-        self.board = board
-        self.pieces_root = pieces_root
-        self.physics_factory = PhysicsFactory(board)
-        self.graphics_factory = GraphicsFactory(board)
+_trace = Trace.get("PieceFactory")
 
-# ...existing code...
+# משך מצבי המנוחה אחרי תנועה/קפיצה כשב-config אין duration_ms
+LONG_REST_MS = DEFAULT_REST_MS["LongRest"]
+SHORT_REST_MS = DEFAULT_REST_MS["ShortRest"]
 
-    def create_piece(self, piece_id: str, cell: tuple[int, int]) -> Piece:
-        idle_dir = self.pieces_root / piece_id / "states" / "idle"
-        config_path = idle_dir / "config.json"
-        sprites_dir = self.pieces_root / piece_id  # במקום idle_dir / "sprites"
 
+class PieceTemplate:
+    """
+    תבנית לסוג כלי (PW, KB, ...): כל מה שלא משתנה בין כלים מאותו סוג -
+    Moves, קונפיגורציות המצבים, טבלת המצבים המקומפלת וגרפיקה עם הפריימים
+    שכבר פוענחו. נבנית פעם אחת לכל סוג, ו-clone מייצר ממנה כלי חדש שחולק את
+    כל הנתונים האלה ומקבל רק את מה שמשתנה בזמן המשחק (פיזיקה, מצב אנימציה,
+    מכונת מצבים).
+    """
+
+    def __init__(self, piece_id: str, board: Board, moves: Moves, configs: Dict[str, dict], graphics,
+                 physics_factory: Optional[PhysicsFactory] = None):
+        self.piece_id = piece_id
+        self.board = board
+        self.moves = moves
+        self.configs = configs
+        self.graphics = graphics
+        self.table = StateTable.compile(configs)
+        graphics.state_params = {folder_name(name): (p.fps, p.is_loop)
+                                 for name, p in zip(self.table.names, self.table.params)}
+        # לכל מצב: מחלקת הפיזיקה והפרמטרים שלה
+        physics_factory = physics_factory or PhysicsFactory(board)
+        self.physics_specs: List[Tuple[type, dict]] = []
+        for p in self.table.params:
+            cfg = {"speed_m_per_sec": p.speed_m_s}
+            if p.rest_ms is not None:
+                cfg.update(type="rest", duration_ms=p.rest_ms, next_state=self.table.names[p.next_state])
+            self.physics_specs.append(physics_factory.spec(cfg))
+
+    def clone(self, cell: Tuple[int, int]) -> Piece:
+        moves = self.moves
+        graphics = self.graphics.copy()
+        states = {name: State(moves, graphics, cls(cell, self.board, **kwargs))
+                  for name, (cls, kwargs) in zip(self.table.names, self.physics_specs)}
+        state_machine = StateMachine(states, initial=self.table.names[self.table.initial], table=self.table)
+
+        piece = Piece(piece_id=self.piece_id, state_machine=state_machine)
+        if _trace.debug:
+            _trace.log(DEBUG, "States for %s: %s", self.piece_id,
+                       {name: type(state._physics).__name__ for name, state in states.items()})
+        return piece
+
+
+class PieceFactory:
+    def __init__(self, board: Board, pieces_root: pathlib.Path, bundle: Optional[SpriteBundle] = None,
+                 fixed_point: bool = False, img_cls: type = Img):
+        self.board = board
+        self.pieces_root = pieces_root
+        self.physics_factory = PhysicsFactory(board, fixed_point=fixed_point)
+        self.graphics_factory = GraphicsFactory(board, img_cls=img_cls)
+        # חבילה מקומפלת (אופציונלי): configs, moves ופריימים בלי לקרוא קבצים
+        self.bundle = bundle
+        self.templates: Dict[str, PieceTemplate] = {}
+        if bundle is not None:
+            self.graphics_factory.sprite_cache.attach_bundle(bundle, pieces_root)
+
+    def _read_config(self, piece_id: str, state: str) -> dict:
+        if self.bundle is not None and self.bundle.has_piece(piece_id):
+            return self.bundle.config(piece_id, state)
+        config_path = self.pieces_root / piece_id / "states" / state / "config.json"
         with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+            return json.load(f)
+
+    def _load_moves(self, piece_id: str) -> Moves:
+        dims = (self.board.H_cells, self.board.W_cells)
+        if self.bundle is not None and self.bundle.has_piece(piece_id):
+            return Moves.from_entries(self.bundle.moves(piece_id), dims)
+        return Moves(self.pieces_root / piece_id / "moves.txt", dims)
+
+    def template(self, piece_id: str) -> PieceTemplate:
+        """התבנית של סוג הכלי - נבנית בפעם הראשונה שהסוג מופיע."""
+        template = self.templates.get(piece_id)
+        if template is None:
+            template = self.templates[piece_id] = self._build_template(piece_id)
+        return template
+
+    def _read_configs(self, piece_id: str) -> Dict[str, dict]:
+        """config.json של כל תיקיות המצבים של סוג הכלי."""
+        piece_dir = self.pieces_root / piece_id
+        states = self.graphics_factory.sprite_cache.state_names(piece_dir)
+        return {state: self._read_config(piece_id, state) for state in states}
+
+    def _build_template(self, piece_id: str) -> PieceTemplate:
+        sprites_dir = self.pieces_root / piece_id  # במקום idle_dir / "sprites"
+        configs = self._read_configs(piece_id)
 
-        graphics_cfg = config.get("graphics", {})
+        graphics_cfg = configs.get("idle", {}).get("graphics", {})
         cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
         graphics = self.graphics_factory.load(sprites_dir, graphics_cfg, cell_size)
-        moves_txt_path = self.pieces_root / piece_id / "moves.txt"
-        moves = Moves(moves_txt_path, (self.board.H_cells, self.board.W_cells))
-
-        # צור את כל המצבים
-        idle_state = State(moves, graphics, IdlePhysics(cell, self.board))
-        move_state = State(moves, graphics, MovePhysics(cell, self.board))
-        longrest_state = State(moves, graphics, IdlePhysics(cell, self.board))
-        jump_state = State(moves, graphics, MovePhysics(cell, self.board))
-        shortrest_state = State(moves, graphics, IdlePhysics(cell, self.board))
-
-        states = {
-            "Idle": idle_state,
-            "Move": move_state,
-            "LongRest": longrest_state,
-            "Jump": jump_state,
-            "ShortRest": shortrest_state,
-        }
-        state_machine = StateMachine(states, initial="Idle")
-
-        piece = Piece(piece_id=piece_id, state_machine=state_machine)
-        print(f"🔍 Physics class for {piece_id} is {type(move_state._physics).__name__}")
-        return piece
+        return PieceTemplate(piece_id, self.board, self._load_moves(piece_id), configs, graphics,
+                             self.physics_factory)
+
+    def create_piece(self, piece_id: str, cell: tuple[int, int]) -> Piece:
+        return self.template(piece_id).clone(cell)
@@ -33,7 +33,9 @@
 #             self.position = (row, col - 1)
 #         elif direction == "right" and col < board_size[1] - 1:
 #             self.position = (row, col + 1)
-import time
+from It1_interfaces.Clock import Clock
+from It1_interfaces.CommandCodec import PackedCommand
+
 
 class Player:
     def __init__(self, id, controls, pos, color, selected_piece=None, select_source=None):
@@ -45,43 +47,39 @@ class Player:
         self.select_source = select_source  # מיקום המקור שנבחר
 
     def move_cursor(self, direction, board_size):
-        row, col = self.position
+        row, col = self.pos
         if direction == "up" and row > 0:
-            self.position = (row - 1, col)
+            self.pos[0] -= 1
         elif direction == "down" and row < board_size[0] - 1:
-            self.position = (row + 1, col)
+            self.pos[0] += 1
         elif direction == "left" and col > 0:
-            self.position = (row, col - 1)
+            self.pos[1] -= 1
         elif direction == "right" and col < board_size[1] - 1:
-            self.position = (row, col + 1)
+            self.pos[1] += 1
 
-    def try_select_or_command(self, pieces, commands_queue):
-        row, col = self.position
+    def try_select_or_command(self, pieces, commands_queue, clock: Clock):
+        """
+        לחיצה על "בחירה" במיקום הסמן: בפעם הראשונה בוחרת כלי של השחקן בתא,
+        בפעם השנייה שולחת לתור פקודת תנועה מהתא שנבחר אל הסמן.
+        commands_queue הוא CommandBus (או כל תור עם append); הפקודה היא
+        PackedCommand עם ה-uid של הכלי, כך שה-CommandBus מנתב אותה ישירות.
+        clock הוא השעון של המשחק (game.clock), כדי שזמן הפקודה יהיה בזמן של
+        הסימולציה גם כשהיא רצה על ManualClock.
+        """
+        cell = tuple(self.pos)
         if self.selected_piece is None:
-            # בחירה ראשונה: בחר כלי שלך
+            # בחירה ראשונה: כלי של השחקן שעומד בתא
             for piece in pieces:
-                if hasattr(piece, "owner") and piece.owner == self.player_id and piece._state._physics.current_cell == (row, col):
+                if getattr(piece, "owner", None) == self.id and piece.cell == cell and not piece.is_captured():
                     self.selected_piece = piece
-                    self.select_source = (row, col)
+                    self.select_source = cell
                     break
-        else:
-            # בחירה שנייה: יעד – צור Command ושלח
-            src = self.select_source
-            dst = (row, col)
-            move_type = "J" if abs(src[0] - dst[0]) > 1 or abs(src[1] - dst[1]) > 1 else "M"
-            # פורמט: QBMe5e8 (דוגמה)
-            piece_id = self.selected_piece.piece_id
-            src_str = f"{chr(ord('a')+src[1])}{src[0]+1}"
-            dst_str = f"{chr(ord('a')+dst[1])}{dst[0]+1}"
-            cmd_str = f"{piece_id}{move_type}{src_str}{dst_str}"
-            # צור Command אמיתי
-            from It1_interfaces.Command import Command
-            cmd = Command(
-                timestamp=int(time.time()*1000),
-                piece_id=piece_id,
-                type="Move" if move_type == "M" else "Jump",
-                params=[src, dst, cmd_str]
-            )
-            commands_queue.append(cmd)
-            self.selected_piece = None
-            self.select_source = None
\ No newline at end of file
+            return
+        # בחירה שנייה: יעד - פקודת תנועה לתור
+        piece, src = self.selected_piece, self.select_source
+        self.selected_piece = None
+        self.select_source = None
+        if piece.is_captured() or src == cell:
+            return
+        kind = "Jump" if abs(src[0] - cell[0]) > 1 or abs(src[1] - cell[1]) > 1 else "Move"
+        commands_queue.append(PackedCommand.of(clock.now_ms(), piece.piece_id, kind, src, cell, piece.uid))
@@ -0,0 +1,68 @@
+from typing import Iterable, List, Optional, Tuple
+
+from It1_interfaces.Board import Board
+from It1_interfaces.Compositor import Compositor, Rect
+from It1_interfaces.img import Img
+
+
+class LayeredRenderer:
+    """
+    מצייר את הלוח בשתי שכבות:
+
+    - שכבה סטטית: הרקע + כל הכלים שנמצאים במצב Idle. היא נבנית פעם אחת
+      ומתעדכנת מקומית רק כשכלי נכנס ל-Idle, יוצא ממנו או נאכל.
+    - שכבה דינמית: מעל השכבה הסטטית, רק הכלים שזזים/מונפשים וה-HUD
+      של השחקנים (סמנים וסימון בחירה).
+
+    שתי השכבות הן Compositor, כך שגם בכל אחת מהן מצוירים מחדש רק
+    המלבנים שנפגעו. board.img מצביע על התמונה המורכבת הסופית.
+    """
+
+    def __init__(self, board: Board, background: Img):
+        self.board = board
+        self.static = Compositor(background)
+        self.frame = Compositor(self.static.canvas)
+        board.img = self.frame.canvas
+
+    @staticmethod
+    def is_resting(piece) -> bool:
+        """כלי במצב Idle שייך לשכבה הסטטית."""
+        sm = piece.state_machine
+        return sm.current is sm.states.get("Idle")
+
+    def _piece_sprite(self, piece) -> Tuple[Optional[Img], int, int]:
+        state = piece.state_machine.current
+        img = state._graphics.get_img()
+        x, y = self.board.get_pixel_position(state._physics.current_cell)
+        return img, x, y
+
+    def render(self, pieces: Iterable, players: Iterable = ()) -> List[Rect]:
+        """
+        מרכיב פריים ומחזיר את המלבנים של התמונה הסופית שהשתנו.
+        """
+        self.static.begin_frame()
+        self.frame.begin_frame()
+
+        for piece in pieces:
+            img, x, y = self._piece_sprite(piece)
+            if img is None:
+                continue
+            layer = self.static if self.is_resting(piece) else self.frame
+            layer.put_sprite(piece, img, x, y)
+
+        self.draw_hud(players)
+
+        # כל שינוי בשכבה הסטטית פוגע באותו מלבן בתמונה הסופית
+        for rect in self.static.render():
+            self.frame.invalidate(rect)
+        return self.frame.render()
+
+    def draw_hud(self, players: Iterable):
+        """סמני השחקנים וסימון הכלי הנבחר, בשכבה הדינמית."""
+        w, h = self.board.cell_W_pix, self.board.cell_H_pix
+        for player in players:
+            x, y = self.board.get_pixel_position(tuple(player.pos))
+            self.frame.put_rect(("cursor", player.id), x, y, w, h, player.color, thickness=5)
+            if player.selected_piece is not None:
+                self.frame.put_text(("selected", player.id), "✓", x + 10, y + 30,
+                                    font_size=1.5, color=(0, 0, 255, 255), thickness=2)
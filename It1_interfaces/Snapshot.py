@@ -0,0 +1,172 @@
+"""
+תמונת מצב לוגית של המשחק, בלי פיקסלים, לשמירה ושחזור זולים (rollback,
+חיפוש של AI, סנכרון מחדש).
+
+לכל כלי שורה אחת במערך NumPy מובנה (PIECE_DTYPE): תא, מספר המצב ב-StateTable,
+דגלים, הפקודה הנוכחית (סוג ויעד), המסלול של תנועה שבאוויר והטיימרים של
+הפיזיקה של המצב הנוכחי. הפיזיקה של שאר המצבים לא נשמרת - כל מעבר מצב מציב
+מחדש את הפיזיקה של המצב הבא (StateMachine.process_command). בנוסף נשמרים
+זמן הסימולציה, רשת התפוסה (מי עומד למעלה כשיש כלי נדחק) והפקודות שממתינות
+בתור, ברשומות הבינאריות של CommandCodec.
+
+capture ו-restore הם O(כלים). השחזור הוא לאותם אובייקטי כלים (לפי uid) ולא
+מייצר כלים חדשים; הגרפיקה מתאפסת רק לכלים שהמצב שלהם השתנה.
+רק כלים עם מכונת מצבים נתמכים: למשחק עם כלי בלי state_machine (שמתעדכן
+בכל צעד ואין לו מצב שאפשר לשמור) capture זורק ValueError.
+"""
+import math
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from It1_interfaces.Clock import ManualClock
+from It1_interfaces.Command import Command
+from It1_interfaces.CommandCodec import KINDS, PackedCommand, decode_many, encode_many, kind_code
+from It1_interfaces.Trajectory import FixedTrajectory, Trajectory, to_fixed
+
+NONE = -1
+
+PIECE_DTYPE = np.dtype([
+    ("uid", np.int64),
+    ("cell", np.int16, 2),
+    ("state", np.int16),          # מספר המצב ב-StateTable של הכלי
+    ("captured", np.bool_),
+    ("has_moved", np.bool_),
+    ("arrived_ms", np.int64),
+    ("moving", np.bool_),
+    ("kind", np.int16),           # קוד ב-KINDS של הפקודה הנוכחית, NONE = אין
+    ("cmd_ms", np.int64),
+    ("target", np.int16, 2),      # תא היעד של הפקודה, NONE = אין
+    ("start_ms", np.int64),       # Physics.start_time_ms
+    ("finish_ms", np.int64),      # NONE = אין טיימר
+    ("pos", np.float64, 2),       # current_pos_meters
+    ("traj", np.float64, 4),      # התחלה (שורה, עמודה) וסוף; NaN = אין תנועה באוויר
+    ("traj_ms", np.int64, 2),     # t0, משך
+    ("last_capture_ms", np.int64),  # MovePhysics.last_capture_time_ms (0 לפיזיקה אחרת)
+])
+
+_NO_TRAJ = (math.nan,) * 4
+
+
+class GameSnapshot(NamedTuple):
+    sim_ms: int
+    pieces: np.ndarray     # PIECE_DTYPE, שורה לכל כלי לפי הסדר ב-Game.pieces
+    grid: np.ndarray       # עותק של OccupancyIndex.grid
+    commands: bytes        # הפקודות בתור (CommandCodec.encode_many)
+
+    @property
+    def nbytes(self) -> int:
+        return self.pieces.nbytes + self.grid.nbytes + len(self.commands)
+
+
+def _piece_record(piece) -> tuple:
+    sm = piece.state_machine
+    physics = sm.current._physics
+    cmd = physics.current_command
+    if cmd is None:
+        kind, cmd_ms, target = NONE, 0, (NONE, NONE)
+    else:
+        kind, cmd_ms = kind_code(cmd.type), cmd.timestamp
+        target = tuple(cmd.target_cell) if getattr(cmd, "target_cell", None) is not None else (NONE, NONE)
+    traj = physics.trajectory
+    finish = physics.finish_ms
+    return (piece.uid, physics.current_cell, sm.current_id, piece.captured, piece.has_moved,
+            piece.arrived_ms, physics.is_moving, kind, cmd_ms, target, physics.start_time_ms,
+            NONE if finish is None else finish, physics.current_pos_meters,
+            _NO_TRAJ if traj is None else (*traj.start, *traj.end),
+            (0, 0) if traj is None else (traj.t0_ms, traj.duration_ms),
+            getattr(physics, "last_capture_time_ms", 0))
+
+
+def capture(game) -> GameSnapshot:
+    """תמונת המצב הלוגית של המשחק כרגע."""
+    stateless = [p.piece_id for p in game.pieces if not hasattr(p, "state_machine")]
+    if stateless:
+        raise ValueError(f"Cannot snapshot pieces without a state machine: {stateless}")
+    pieces = np.array([_piece_record(p) for p in game.pieces], dtype=PIECE_DTYPE)
+    pending = []
+    for cmd, piece in game.commands.pending():
+        packed = cmd if isinstance(cmd, PackedCommand) else PackedCommand.from_command(cmd)
+        if not packed.uid and piece is not None:
+            packed = packed._replace(uid=piece.uid)
+        pending.append(packed)
+    return GameSnapshot(game.sim_ms, pieces, game.occupancy.grid.copy(), encode_many(pending))
+
+
+def _restore_piece(piece, row):
+    sm = piece.state_machine
+    kind = int(row["kind"])
+    target: Optional[Tuple[int, int]] = None
+    cmd = None
+    if kind != NONE:
+        if row["target"][0] != NONE:
+            target = (int(row["target"][0]), int(row["target"][1]))
+        cmd = Command(timestamp=int(row["cmd_ms"]), piece_id=piece.piece_id, type=KINDS[kind],
+                      params=[], target_cell=target, piece_uid=piece.uid)
+
+    state_id = int(row["state"])
+    if state_id != sm.current_id:
+        sm.current_id = state_id
+        sm.current = sm._by_id[state_id]
+        sm.current._graphics.reset(cmd or Command(int(row["cmd_ms"]), piece.piece_id, sm.current_name, []))
+    state = sm.current
+    physics = state._physics
+
+    physics.place((int(row["cell"][0]), int(row["cell"][1])))
+    physics.current_pos_meters = (float(row["pos"][0]), float(row["pos"][1]))
+    if target is not None:
+        physics.target_pos_meters = physics._cell_to_meters(target)
+    physics.is_moving = bool(row["moving"])
+    physics.current_command = cmd
+    state._current_command = cmd
+    physics.start_time_ms = int(row["start_ms"])
+    finish = int(row["finish_ms"])
+    physics.finish_ms = None if finish == NONE else finish
+    traj = row["traj"]
+    if not math.isnan(traj[0]):
+        start, end = (float(traj[0]), float(traj[1])), (float(traj[2]), float(traj[3]))
+        t0, duration = int(row["traj_ms"][0]), int(row["traj_ms"][1])
+        if getattr(physics, "fixed_point", False):
+            physics.trajectory = FixedTrajectory(to_fixed(start), to_fixed(end), t0, duration)
+        else:
+            physics.trajectory = Trajectory(start, end, t0, duration)
+    if hasattr(physics, "last_capture_time_ms"):
+        physics.last_capture_time_ms = int(row["last_capture_ms"])
+
+    piece.captured = bool(row["captured"])
+    piece.has_moved = bool(row["has_moved"])
+    piece.arrived_ms = int(row["arrived_ms"])
+
+
+def restore(game, snapshot: GameSnapshot):
+    """
+    מחזיר את המשחק לתמונת המצב: הכלים, אינדקס התפוסה, הטיימרים, התור
+    וזמן הסימולציה (וגם השעון, אם הוא ManualClock).
+    """
+    by_uid: Dict[int, object] = {p.uid: p for p in game.pieces}
+    rows = snapshot.pieces
+    for row in rows:
+        _restore_piece(by_uid[int(row["uid"])], row)
+
+    # אינדקס התפוסה: כלי שעומד למעלה ברשת נכנס אחרון, כך שכלי נדחק נשאר מתחתיו
+    occupancy = game.occupancy
+    occupancy.clear()
+    grid = snapshot.grid
+    live = [by_uid[int(row["uid"])] for row in rows if not row["captured"]]
+    on_top = [grid[p.cell[0], p.cell[1]] == p.uid for p in live]
+    for piece, top in sorted(zip(live, on_top), key=lambda item: item[1]):
+        occupancy.track(piece)
+
+    game.commands.clear()
+    for piece in game.pieces:
+        if piece.is_captured():
+            game.commands.unregister(piece)
+        elif occupancy.cell_of(piece) is not None:
+            game.commands.register(piece)
+    for packed in decode_many(snapshot.commands):
+        game.commands.push(packed)
+
+    game.sim_ms = snapshot.sim_ms
+    if isinstance(game.clock, ManualClock):
+        game.clock.rewind(snapshot.sim_ms)
+    game.reschedule()
@@ -0,0 +1,222 @@
+"""
+קומפיילר וקורא לחבילת ספרייטים מקומפלת (sprite bundle).
+
+הקומפיילר עובר פעם אחת (offline) על עץ pieces/, מפענח את כל הפריימים,
+מקטין אותם לגודל התא וממיר ל-BGRA (הרקע הלבן הופך לשקוף), ושומר הכל
+בקובץ בינארי יחיד יחד עם אינדקס JSON שמכיל גם את config.json של כל מצב ואת moves.txt המפוענח של כל כלי.
+לכל פריים נשמרים גם באפרי המיזוג של Img (BGRA מוכפל ב-alpha ו-255 - alpha),
+כך שבזמן ריצה לא מחשבים ולא מקצים כלום.
+
+בזמן ריצה הקובץ נפתח פעם אחת וממופה לזיכרון (mmap), וכל פריים הוא
+view של NumPy ישירות מעל המיפוי - בלי imread, בלי resize ובלי העתקה.
+חבילה מגרסה אחרת נדחית (ValueError) - צריך לקמפל אותה מחדש.
+
+פורמט הקובץ:
+    MAGIC (4) | VERSION u32 | INDEX_LEN u64 | INDEX (JSON) | padding | DATA
+כל מישור (BGRA, מוכפל, alpha הפוך) ב-DATA מיושר ל-ALIGN בתים.
+
+שימוש:
+    python -m It1_interfaces.SpriteBundle pieces pieces.kfsb --cell 102x103
+"""
+import argparse
+import json
+import mmap
+import pathlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from It1_interfaces.Moves import Moves
+from It1_interfaces.img import blend_planes, to_bgra
+
+MAGIC = b"KFSB"
+VERSION = 3
+ALIGN = 64
+_HEADER = struct.Struct("<4sIQ")
+
+
+_PLANES = ("offset", "premul", "inv_alpha")  # שם השדה באינדקס של כל מישור של פריים
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _sprite_paths(folder: pathlib.Path) -> List[pathlib.Path]:
+    if not folder.is_dir():
+        return []
+    return sorted(
+        [p for p in folder.iterdir()
+         if p.suffix.lower() == ".png" and p.stem.isdigit() and int(p.stem) >= 1],
+        key=lambda p: int(p.stem)
+    )
+
+
+def compile_bundle(pieces_root: pathlib.Path,
+                   out_path: pathlib.Path,
+                   cell_size: Tuple[int, int],
+                   interpolation: int = cv2.INTER_AREA,
+                   chroma_key: Optional[Tuple[int, int, int]] = (255, 255, 255)) -> dict:
+    """
+    מקמפל את כל עץ pieces/ לקובץ bundle אחד.
+
+    :param pieces_root: תיקיית pieces (תיקייה לכל סוג כלי)
+    :param out_path: נתיב קובץ הפלט
+    :param cell_size: (רוחב, גובה) של תא בפיקסלים
+    :param interpolation: דגל האינטרפולציה של ההקטנה
+    :param chroma_key: צבע הרקע שהופך לשקוף (הפריימים נשמרים כ-BGRA)
+    :return: האינדקס שנכתב
+    """
+    pieces_root = pathlib.Path(pieces_root)
+    index = {
+        "cell_size": list(cell_size),
+        "interpolation": int(interpolation),
+        "chroma_key": list(chroma_key) if chroma_key is not None else None,
+        "pieces": {},
+    }
+    blobs: List[np.ndarray] = []
+    offset = 0
+
+    for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+        piece = {"moves": [], "states": {}}
+        moves_path = piece_dir / "moves.txt"
+        if moves_path.exists():
+            piece["moves"] = [list(e) for e in Moves.read_entries(moves_path)]
+
+        states_dir = piece_dir / "states"
+        if states_dir.is_dir():
+            for state_dir in sorted(p for p in states_dir.iterdir() if p.is_dir()):
+                cfg_path = state_dir / "config.json"
+                config = {}
+                if cfg_path.exists():
+                    with open(cfg_path, "r", encoding="utf-8") as f:
+                        config = json.load(f)
+                frames = []
+                for png in _sprite_paths(state_dir / "sprites"):
+                    img = cv2.imread(str(png), cv2.IMREAD_UNCHANGED)
+                    if img is None:
+                        raise FileNotFoundError(f"Cannot load image: {png}")
+                    img = cv2.resize(img, tuple(cell_size), interpolation=interpolation)
+                    img = np.ascontiguousarray(to_bgra(img, chroma_key))
+                    frame = {"shape": list(img.shape), "opaque": bool(img[..., 3].min() == 255)}
+                    for name, plane in zip(_PLANES, (img, *blend_planes(img))):
+                        frame[name] = offset
+                        blobs.append(np.ascontiguousarray(plane))
+                        offset = _align(offset + plane.nbytes)
+                    frames.append(frame)
+                piece["states"][state_dir.name] = {"config": config, "frames": frames}
+        index["pieces"][piece_dir.name] = piece
+
+    index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_HEADER.size + len(index_bytes))
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(b"\0" * (data_start - _HEADER.size - len(index_bytes)))
+        pos = 0
+        for blob in blobs:
+            f.write(blob.tobytes())
+            pos += blob.nbytes
+            pad = _align(pos) - pos
+            f.write(b"\0" * pad)
+            pos += pad
+    return index
+
+
+Sprite = Tuple[np.ndarray, np.ndarray, np.ndarray, bool]
+
+
+class SpriteBundle:
+    """
+    קורא לקובץ bundle שנוצר ע״י compile_bundle.
+    כל הפריימים ובאפרי המיזוג הם views לקריאה בלבד מעל mmap יחיד.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a sprite bundle: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported sprite bundle version {version}: {self.path}")
+        index_bytes = self._mmap[_HEADER.size:_HEADER.size + index_len]
+        self.index = json.loads(index_bytes.decode("utf-8"))
+        self.cell_size: Tuple[int, int] = tuple(self.index["cell_size"])
+        self.interpolation: int = self.index["interpolation"]
+        chroma_key = self.index["chroma_key"]
+        self.chroma_key: Optional[Tuple[int, int, int]] = tuple(chroma_key) if chroma_key is not None else None
+        self._data = np.frombuffer(self._mmap, dtype=np.uint8,
+                                   offset=_align(_HEADER.size + index_len))
+        self._sprites: Dict[Tuple[str, str], List[Sprite]] = {}
+
+    @property
+    def piece_ids(self) -> List[str]:
+        return list(self.index["pieces"])
+
+    def has_piece(self, piece_id: str) -> bool:
+        return piece_id in self.index["pieces"]
+
+    def states(self, piece_id: str) -> List[str]:
+        return list(self.index["pieces"][piece_id]["states"])
+
+    def config(self, piece_id: str, state: str) -> dict:
+        """ה-config.json המפוענח של מצב."""
+        return self.index["pieces"][piece_id]["states"][state]["config"]
+
+    def moves(self, piece_id: str) -> List[Tuple[int, int, Optional[str]]]:
+        """רשומות moves.txt המפוענחות (dr, dc, modifier)."""
+        return [tuple(e) for e in self.index["pieces"][piece_id]["moves"]]
+
+    def sprites(self, piece_id: str, state: str) -> Optional[List[Sprite]]:
+        """
+        הפריימים של מצב כ-(BGRA, מוכפל, alpha הפוך, אטום), המערכים views מעל
+        ה-mmap (zero-copy) - בדיוק מה ש-Img.use_planes מקבל.
+        מחזיר None אם הכלי או המצב לא קיימים בחבילה.
+        """
+        key = (piece_id, state)
+        sprites = self._sprites.get(key)
+        if sprites is None:
+            piece = self.index["pieces"].get(piece_id)
+            if piece is None or state not in piece["states"]:
+                return None
+            sprites = []
+            for fr in piece["states"][state]["frames"]:
+                shape = tuple(fr["shape"])
+                n = int(np.prod(shape))
+                planes = [self._data[fr[name]:fr[name] + n].reshape(shape) for name in _PLANES]
+                sprites.append((*planes, fr["opaque"]))
+            self._sprites[key] = sprites
+        return sprites
+
+    def frames(self, piece_id: str, state: str) -> Optional[List[np.ndarray]]:
+        """
+        הפריימים (BGRA) של מצב כ-views מעל ה-mmap (zero-copy).
+        מחזיר None אם הכלי או המצב לא קיימים בחבילה.
+        """
+        sprites = self.sprites(piece_id, state)
+        return None if sprites is None else [s[0] for s in sprites]
+
+
+def _parse_cell(text: str) -> Tuple[int, int]:
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the pieces/ tree into a sprite bundle.")
+    parser.add_argument("pieces_root", type=pathlib.Path)
+    parser.add_argument("out", type=pathlib.Path)
+    parser.add_argument("--cell", type=_parse_cell, default=(102, 103),
+                        help="cell size in pixels as WxH (default 102x103)")
+    args = parser.parse_args(argv)
+    index = compile_bundle(args.pieces_root, args.out, args.cell)
+    n_frames = sum(len(s["frames"]) for p in index["pieces"].values() for s in p["states"].values())
+    print(f"wrote {args.out}: {len(index['pieces'])} pieces, {n_frames} frames")
+
+
+if __name__ == "__main__":
+    main()
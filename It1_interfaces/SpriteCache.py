@@ -0,0 +1,280 @@
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import cv2
+
+from It1_interfaces.img import Img
+
+if TYPE_CHECKING:
+    from It1_interfaces.SpriteBundle import SpriteBundle
+
+
+class SpriteCache:
+    """
+    מטמון ספרייטים משותף לכל מופעי Graphics בתהליך.
+
+    כל פריים נשמר לפי המפתח (נתיב, גודל יעד, אינטרפולציה, מחלקת Img),
+    כך שקריאה חוזרת לאותו קובץ לא נוגעת בדיסק ולא מפענחת שוב.
+    גם רשימת קבצי ה-PNG של כל תיקייה נשמרת, כדי שגם ה-iterdir לא יחזור.
+    אם חוברה חבילה מקומפלת (attach_bundle), פריימים נלקחים ממנה ישירות,
+    כולל באפרי המיזוג שחושבו בזמן הקומפילציה.
+
+    כשסך הזיכרון של הפריימים עובר את max_bytes, מפונים הפריימים
+    שהשימוש האחרון בהם הוא הישן ביותר (LRU).
+
+    כל פריים מנורמל בזמן הטעינה ל-BGRA עם alpha מוכפל מראש (prepare_sprite);
+    לספרייטים בלי ערוץ alpha הרקע הלבן הופך לשקוף לפי chroma_key.
+
+    prefetch_folder מפענח תיקייה ברקע על מאגר תהליכונים קטן
+    (cv2 משחרר את ה-GIL בזמן הפענוח), כך שלולאת הציור לא נחסמת.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 workers: Optional[int] = None,
+                 chroma_key: Optional[Tuple[int, int, int]] = (255, 255, 255)):
+        self.max_bytes = max_bytes
+        self.chroma_key = chroma_key
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[tuple, Future] = {}
+        self._states: Dict[pathlib.Path, Tuple[str, ...]] = {}
+        self._frames: "OrderedDict[tuple, Img]" = OrderedDict()
+        self._sizes: Dict[tuple, int] = {}
+        self._folders: Dict[pathlib.Path, Optional[Tuple[pathlib.Path, ...]]] = {}
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self._bundles: List[Tuple[pathlib.Path, "SpriteBundle"]] = []
+        self._bundled: Dict[tuple, List[Img]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        """סך הבתים של הפריימים שנמצאים כרגע במטמון."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self,
+            path: pathlib.Path,
+            size: Optional[Tuple[int, int]] = None,
+            interpolation: int = cv2.INTER_AREA,
+            img_cls: type = Img) -> Img:
+        """
+        מחזיר פריים מהמטמון, או טוען אותו מהדיסק בפעם הראשונה.
+
+        :param path: נתיב לקובץ התמונה
+        :param size: (רוחב, גובה) יעד, או None לגודל המקורי
+        :param interpolation: דגל אינטרפולציה של OpenCV
+        :param img_cls: מחלקת התמונה (Img או MockImg בבדיקות)
+        """
+        key = (str(path), size, interpolation, img_cls)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+
+        # הפענוח עצמו מחוץ לנעילה - cv2 משחרר את ה-GIL
+        frame = img_cls().read(str(path), size=size, interpolation=interpolation)
+        frame.prepare_sprite(self.chroma_key)
+        self._store(key, frame)
+        return frame
+
+    def attach_bundle(self, bundle: "SpriteBundle", pieces_root: pathlib.Path):
+        """
+        מחבר חבילת ספרייטים מקומפלת. תיקיות sprites שנמצאות תחת pieces_root
+        ושקיימות בחבילה יוגשו ישירות מה-mmap, בלי קבצי PNG.
+        זורק ValueError אם החבילה קומפלה עם chroma_key אחר משל המטמון.
+        """
+        chroma_key = tuple(self.chroma_key) if self.chroma_key is not None else None
+        if bundle.chroma_key != chroma_key:
+            raise ValueError(f"Sprite bundle {bundle.path} was compiled with chroma key "
+                             f"{bundle.chroma_key}, the cache uses {chroma_key}")
+        with self._lock:
+            entry = (pathlib.Path(pieces_root), bundle)
+            if entry not in self._bundles:
+                self._bundles.append(entry)
+
+    def _bundle_frames(self, folder: pathlib.Path, size=None, interpolation=None) -> Optional[List]:
+        """הפריימים (SpriteBundle.sprites) מהחבילה עבור תיקיית sprites, או None. size=None מתאים לכל גודל."""
+        for root, bundle in self._bundles:
+            if size is not None and (size != bundle.cell_size or interpolation != bundle.interpolation):
+                continue
+            try:
+                parts = pathlib.Path(folder).relative_to(root).parts
+            except ValueError:
+                continue
+            if len(parts) != 4 or parts[1] != "states" or parts[3] != "sprites":
+                continue
+            views = bundle.sprites(parts[0], parts[2])
+            if views is not None:
+                return views
+        return None
+
+    def frame_paths(self, folder: pathlib.Path) -> Optional[Tuple[pathlib.Path, ...]]:
+        """
+        מחזיר את קבצי ה-PNG הממוספרים (1.png, 2.png, ...) בתיקייה, ממוינים.
+        מחזיר None אם התיקייה לא קיימת. התוצאה נשמרת גם כשהיא שלילית.
+        """
+        with self._lock:
+            if folder in self._folders:
+                return self._folders[folder]
+            views = self._bundle_frames(folder) if self._bundles else None
+            if views is not None:
+                pngs = tuple(folder / f"{i}.png" for i in range(1, len(views) + 1))
+                self._folders[folder] = pngs
+                return pngs
+
+        if not folder.exists():
+            pngs = None
+        else:
+            pngs = tuple(sorted(
+                [p for p in folder.iterdir()
+                 if p.suffix.lower() == ".png" and p.stem.isdigit() and int(p.stem) >= 1],
+                key=lambda p: int(p.stem)
+            ))
+        with self._lock:
+            self._folders[folder] = pngs
+        return pngs
+
+    def load_folder(self,
+                    folder: pathlib.Path,
+                    size: Optional[Tuple[int, int]] = None,
+                    interpolation: int = cv2.INTER_AREA,
+                    img_cls: type = Img) -> Optional[List[Img]]:
+        """
+        טוען את כל הפריימים של תיקיית sprites אחת דרך המטמון.
+        מחזיר None אם התיקייה לא קיימת.
+        """
+        if self._bundles:
+            key = (str(folder), size, interpolation, img_cls)
+            with self._lock:
+                frames = self._bundled.get(key)
+            if frames is not None:
+                return frames
+            sprites = self._bundle_frames(folder, size, interpolation)
+            if sprites is not None:
+                frames = [img_cls().use_planes(*sprite) for sprite in sprites]
+                with self._lock:
+                    self._bundled[key] = frames
+                return frames
+
+        pngs = self.frame_paths(folder)
+        if pngs is None:
+            return None
+        return [self.get(p, size, interpolation, img_cls) for p in pngs]
+
+    def is_cached(self,
+                  folder: pathlib.Path,
+                  size: Optional[Tuple[int, int]] = None,
+                  interpolation: int = cv2.INTER_AREA,
+                  img_cls: type = Img) -> bool:
+        """
+        האם load_folder יחזיר מיד, בלי גישה לדיסק ובלי פענוח.
+        תיקייה שידוע שאינה קיימת נחשבת מוכנה (אין מה לטעון).
+        """
+        with self._lock:
+            if (str(folder), size, interpolation, img_cls) in self._bundled:
+                return True
+            if self._bundles and self._bundle_frames(folder, size, interpolation) is not None:
+                return True
+            if folder not in self._folders:
+                return False
+            pngs = self._folders[folder]
+            if pngs is None:
+                return True
+            return all((str(p), size, interpolation, img_cls) in self._frames for p in pngs)
+
+    def prefetch_folder(self,
+                        folder: pathlib.Path,
+                        size: Optional[Tuple[int, int]] = None,
+                        interpolation: int = cv2.INTER_AREA,
+                        img_cls: type = Img) -> Future:
+        """
+        מתזמן טעינה של תיקיית sprites ברקע ומחזיר Future עם רשימת הפריימים.
+        בקשות כפולות לאותה תיקייה מקבלות את אותו Future.
+        """
+        key = (str(folder), size, interpolation, img_cls)
+        with self._lock:
+            fut = self._pending.get(key)
+            if fut is not None:
+                return fut
+            if self.is_cached(folder, size, interpolation, img_cls):
+                fut = Future()
+                fut.set_result(self.load_folder(folder, size, interpolation, img_cls))
+                return fut
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="sprite-prefetch")
+            fut = self._pool.submit(self.load_folder, folder, size, interpolation, img_cls)
+            self._pending[key] = fut
+        fut.add_done_callback(lambda _f: self._pending_done(key))
+        return fut
+
+    def _pending_done(self, key: tuple):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def state_names(self, piece_dir: pathlib.Path) -> Tuple[str, ...]:
+        """שמות תיקיות המצבים (idle, move, ...) של כלי, ממוינים. נשמר במטמון."""
+        with self._lock:
+            names = self._states.get(piece_dir)
+            if names is not None:
+                return names
+            for root, bundle in self._bundles:
+                try:
+                    parts = pathlib.Path(piece_dir).relative_to(root).parts
+                except ValueError:
+                    continue
+                if len(parts) == 1 and bundle.has_piece(parts[0]):
+                    names = tuple(sorted(bundle.states(parts[0])))
+                    self._states[piece_dir] = names
+                    return names
+
+        states_dir = piece_dir / "states"
+        names = tuple(sorted(p.name for p in states_dir.iterdir() if p.is_dir())) if states_dir.is_dir() else ()
+        with self._lock:
+            self._states[piece_dir] = names
+        return names
+
+    def clear(self):
+        """מרוקן את המטמון (פריימים ורשימות תיקיות)."""
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self._folders.clear()
+            self._states.clear()
+            self._bundled.clear()
+            self._nbytes = 0
+
+    def _store(self, key: tuple, frame: Img):
+        nbytes = int(getattr(frame, "nbytes", 0))
+        if nbytes > self.max_bytes:
+            return  # פריים שגדול מכל התקציב לא נשמר
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return
+            self._frames[key] = frame
+            self._sizes[key] = nbytes
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes and self._frames:
+                old_key, _ = self._frames.popitem(last=False)
+                self._nbytes -= self._sizes.pop(old_key)
+
+
+_default_cache = SpriteCache()
+
+
+def get_sprite_cache() -> SpriteCache:
+    """המטמון המשותף לכל התהליך."""
+    return _default_cache
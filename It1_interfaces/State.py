@@ -4,6 +4,10 @@ from It1_interfaces.Graphics import Graphics
 from It1_interfaces.Physics import Physics
 from typing import Dict, Optional
 from typing import Tuple
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+
+_trace = Trace.get("State")
 
 
 
@@ -26,16 +30,18 @@ class State:
         """
         self.transitions[event] = target
 
-    def reset(self, cmd: Command):
+    def reset(self, cmd: Command, now_ms: Optional[int] = None):
         """
         איפוס המצב עם פקודה חדשה.
         מאתחל את הגרפיקה, הפיזיקה ושומר את הפקודה הנוכחית.
         :param cmd: הפקודה שעל פיה מאתחלים
+        :param now_ms: זמן תחילת הפקודה - הפיזיקה מחשבת ממנו מיד את המסלול והדדליין
         """
-        print("State.reset called for", self._physics, "with cmd", cmd)
+        if _trace.debug:
+            _trace.log(DEBUG, "State.reset called for %r with cmd %r", self._physics, cmd)
 
         self._graphics.reset(cmd)
-        self._physics.reset(cmd)
+        self._physics.reset(cmd, now_ms)
         self._current_command = cmd
 
     # def update(self, now_ms: int) -> 'State':
@@ -1,18 +1,44 @@
+from typing import Optional
+
+from It1_interfaces.StateTable import NO_STATE, StateTable
+
+
 class StateMachine:
-    def __init__(self, states: dict, initial: str):
+    """
+    מכונת המצבים של כלי. המעברים נלקחים מ-StateTable (מקומפלת מה-configs של
+    סוג הכלי ומשותפת לכל הכלים מהסוג); בלי טבלה היא נבנית מה-transitions של
+    המצבים. המצב הנוכחי הוא מספר, והמעבר הוא אינדקס לטבלה.
+    """
+
+    def __init__(self, states: dict, initial: str, table: Optional[StateTable] = None):
         self.states = states
-        self.current = states[initial]
+        self.table = table if table is not None else StateTable.from_states(states, initial)
+        self._by_id = [states[name] for name in self.table.names]
+        self.current_id = self.table.index[initial]
+        self.current = self._by_id[self.current_id]
+
+    @property
+    def current_name(self) -> str:
+        return self.table.names[self.current_id]
 
     def process_command(self, cmd, now_ms):
-        next_state= self.current.transitions.get(cmd.type)
-        if next_state:   
-            self.current = next_state
-            self.current.reset(cmd)
-        else:
-            self.current.reset(cmd)
+        target = self.table.next_state(self.current_id, self.table.event_id(cmd.type))
+        if target == NO_STATE:
+            # אין מעבר לפקודה הזו במצב הנוכחי (למשל תנועה בזמן מנוחה) - מתעלמים
+            return
+        next_state = self._by_id[target]
+        # לכל מצב יש Physics משלו - מעבירים אליו את התא הנוכחי של הכלי
+        next_state._physics.place(self.current._physics.current_cell)
+        self.current_id = target
+        self.current = next_state
+        self.current.reset(cmd, now_ms)
         self.current.update(now_ms)
 
     def update(self, now_ms):
         new_cmd = self.current.update(now_ms)
         if new_cmd:
-            self.process_command(new_cmd, now_ms)
\ No newline at end of file
+            # הפיזיקה סיימה: המצב הבא נקבע לפי next_state_when_finished
+            finished = self.table.params[self.current_id].next_state
+            if finished != NO_STATE:
+                new_cmd.type = self.table.names[finished]
+            self.process_command(new_cmd, now_ms)
@@ -0,0 +1,126 @@
+"""
+טבלת מצבים מקומפלת לסוג כלי, מתוך states/*/config.json.
+
+כל מצב מקבל מספר (לפי סדר שמות התיקיות, idle ראשון), וכל אירוע - שם סוג
+הפקודה ("Move", "LongRest") - מקבל את המספר של המצב שהוא מוביל אליו.
+המעברים שמורים ב-tuple שטוח: transitions[state * n + event] הוא המצב הבא או
+NO_STATE, כך ש-StateMachine מחליף מצב בשתי פעולות אינדקס בלי מילונים.
+
+המעברים נגזרים מהקונפיגים:
+  - המצב ההתחלתי (idle) מקבל פקודה לכל מצב עם speed_m_per_sec > 0 (move, jump).
+  - כל מצב עם next_state_when_finished שונה ממנו עובר אליו כשהפיזיקה מסיימת.
+  - כל השאר (למשל פקודת תנועה בזמן מנוחה) נדחה.
+"""
+import re
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+NO_STATE = -1
+INITIAL_STATE = "Idle"
+
+# משך מצבי המנוחה כשב-config אין duration_ms
+DEFAULT_REST_MS = {"LongRest": 2000, "ShortRest": 1000}
+DEFAULT_MOVE_SPEED = 2.0
+
+# קונפיגים כשלסוג הכלי אין תיקיות states (מחזור החיים המקורי)
+DEFAULT_CONFIGS = {
+    "idle": {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"}},
+    "move": {"physics": {"speed_m_per_sec": DEFAULT_MOVE_SPEED, "next_state_when_finished": "long_rest"}},
+    "jump": {"physics": {"speed_m_per_sec": DEFAULT_MOVE_SPEED, "next_state_when_finished": "short_rest"}},
+    "long_rest": {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"}},
+    "short_rest": {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"}},
+}
+
+
+def state_name(folder: str) -> str:
+    """שם תיקייה -> שם מצב/פקודה: "long_rest" -> "LongRest"."""
+    return "".join(part.capitalize() for part in folder.split("_"))
+
+
+def folder_name(state: str) -> str:
+    """"LongRest" -> "long_rest" (כמו Graphics.state_dir_name)."""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', state).lower()
+
+
+class StateParams(NamedTuple):
+    speed_m_s: float
+    next_state: int             # המצב אחרי שהפיזיקה מסיימת, NO_STATE = לא מסתיים
+    rest_ms: Optional[int]      # משך מנוחה למצב עומד שמסתיים
+    fps: float
+    is_loop: bool
+
+
+class StateTable:
+    def __init__(self, names: Sequence[str], params: Sequence[StateParams],
+                 events: Mapping[str, int], transitions: Sequence[int], initial: str = INITIAL_STATE):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.params: Tuple[StateParams, ...] = tuple(params)
+        self.events: Dict[str, int] = dict(events)   # סוג פקודה -> מספר אירוע
+        self.n_events = len(self.events)
+        self.transitions: Tuple[int, ...] = tuple(transitions)
+        self.initial = self.index[initial]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def event_id(self, cmd_type: str) -> int:
+        return self.events.get(cmd_type, NO_STATE)
+
+    def next_state(self, state: int, event: int) -> int:
+        if event == NO_STATE:
+            return NO_STATE
+        return self.transitions[state * self.n_events + event]
+
+    @classmethod
+    def compile(cls, configs: Mapping[str, dict], initial: str = INITIAL_STATE) -> "StateTable":
+        """configs: שם תיקיית מצב -> התוכן של config.json שלה."""
+        if not configs:
+            configs = DEFAULT_CONFIGS
+        names = sorted((state_name(f) for f in configs), key=lambda n: (n != initial, n))
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        params = []
+        transitions = [NO_STATE] * (n * n)
+        for i, name in enumerate(names):
+            cfg = configs[folder_name(name)]
+            physics = cfg.get("physics", {})
+            graphics = cfg.get("graphics", {})
+            speed = float(physics.get("speed_m_per_sec", physics.get("speed_m_s", 0.0)))
+            finished = state_name(physics.get("next_state_when_finished", folder_name(name)))
+            if finished not in index:
+                raise ValueError(f"State {name!r}: next_state_when_finished {finished!r} has no config")
+            next_state = index[finished] if finished != name else NO_STATE
+            rest_ms = None
+            if speed <= 0 and next_state != NO_STATE:
+                rest_ms = int(physics.get("duration_ms", DEFAULT_REST_MS.get(name, 1000)))
+            params.append(StateParams(speed, next_state, rest_ms,
+                                      float(graphics.get("frames_per_sec", 6.0)),
+                                      bool(graphics.get("is_loop", True))))
+            if next_state != NO_STATE:
+                transitions[i * n + next_state] = next_state
+        start = index[initial]
+        for i, p in enumerate(params):
+            if p.speed_m_s > 0:
+                transitions[start * n + i] = i
+        # כל אירוע נקרא על שם המצב שהוא מוביל אליו
+        return cls(names, params, index, transitions, initial)
+
+    @classmethod
+    def from_states(cls, states: Mapping[str, object], initial: str) -> "StateTable":
+        """טבלה ממצבים שנבנו ידנית עם State.set_transition."""
+        names = list(states)
+        index = {name: i for i, name in enumerate(names)}
+        events: Dict[str, int] = {}
+        edges = []
+        for i, name in enumerate(names):
+            for event, target in getattr(states[name], "transitions", {}).items():
+                for target_name, state in states.items():
+                    if state is target:
+                        events.setdefault(event, len(events))
+                        edges.append((i, events[event], index[target_name]))
+                        break
+        transitions = [NO_STATE] * (len(names) * len(events))
+        for i, event, target in edges:
+            transitions[i * len(events) + event] = target
+        params = [StateParams(0.0, NO_STATE, None, 6.0, True)] * len(names)
+        return cls(names, params, events, transitions, initial)
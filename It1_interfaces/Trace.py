@@ -0,0 +1,167 @@
+"""
+מעקב (tracing) לנתיבים חמים במקום print.
+
+כל מודול מחזיק tracer משלו, ובנקודת הקריאה בודקים דגל לפני שבונים את ההודעה:
+
+    _trace = Trace.get("Physics")
+    ...
+    if _trace.debug:
+        _trace.log(DEBUG, "update: cell=%s target=%s", self.current_cell, self.target_pos_meters)
+
+כשהמעקב כבוי זו בדיקת attribute אחת - בלי פירמוט ובלי קריאה לפונקציה.
+כשהוא פעיל הרשומה (זמן, רמה, מודול, תבנית, ארגומנטים) נכנסת לבאפר טבעתי
+בזיכרון, ו-thread ברקע מפרמט וכותב אותה. הפירמוט נדחה ל-thread הזה, לכן
+כדאי להעביר ארגומנטים שלא משתנים (מספרים, tuples, מחרוזות).
+
+הגדרה: Trace.configure("Physics=debug,Piece=info,*=warning") או משתנה הסביבה
+KFCHESS_TRACE באותו פורמט.
+"""
+import atexit
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Deque, Dict, Optional, TextIO, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "off": OFF}
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN"}
+
+DEFAULT_LEVEL = WARNING
+DEFAULT_CAPACITY = 65536
+DEFAULT_FLUSH_INTERVAL_S = 0.05
+ENV_VAR = "KFCHESS_TRACE"
+
+Record = Tuple[float, int, str, str, tuple]
+
+
+class Tracer:
+    """מתג למודול אחד. debug/info/warning הם דגלים מחושבים מראש."""
+
+    __slots__ = ("name", "debug", "info", "warning")
+
+    def __init__(self, name: str, level: int):
+        self.name = name
+        self.set_level(level)
+
+    def set_level(self, level: int):
+        self.debug = level <= DEBUG
+        self.info = level <= INFO
+        self.warning = level <= WARNING
+
+    def log(self, level: int, msg: str, *args):
+        _buffer.append((time.monotonic(), level, self.name, msg, args))
+        _ensure_flusher()
+
+
+class _TraceState:
+    def __init__(self):
+        self.levels: Dict[str, int] = {"*": DEFAULT_LEVEL}
+        self.tracers: Dict[str, Tracer] = {}
+        self.stream: Optional[TextIO] = None
+        self.flush_interval_s = DEFAULT_FLUSH_INTERVAL_S
+        self.flusher: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.t0 = time.monotonic()
+
+    def level_for(self, name: str) -> int:
+        return self.levels.get(name, self.levels["*"])
+
+
+_state = _TraceState()
+_buffer: Deque[Record] = collections.deque(maxlen=DEFAULT_CAPACITY)
+
+
+def get(name: str) -> Tracer:
+    """ה-tracer של מודול (אותו אובייקט לכל הקריאות עם אותו שם)."""
+    tracer = _state.tracers.get(name)
+    if tracer is None:
+        tracer = _state.tracers.setdefault(name, Tracer(name, _state.level_for(name)))
+    return tracer
+
+
+def set_level(name: str, level: int):
+    """קובע רמה למודול ('*' = ברירת המחדל לכל מי שאין לו רמה משלו)."""
+    _state.levels[name] = level
+    for tracer in _state.tracers.values():
+        tracer.set_level(_state.level_for(tracer.name))
+
+
+def parse_spec(spec: str) -> Dict[str, int]:
+    """'Physics=debug,*=off' -> {'Physics': DEBUG, '*': OFF}. שם בלי רמה = debug."""
+    levels = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.partition("=")
+        level = level.strip().lower() or "debug"
+        if level not in LEVELS:
+            raise ValueError(f"Unknown trace level {level!r} in {spec!r}")
+        levels[name.strip()] = LEVELS[level]
+    return levels
+
+
+def configure(spec: Optional[str] = None, stream: Optional[TextIO] = None,
+              capacity: Optional[int] = None, flush_interval_s: Optional[float] = None):
+    """מגדיר רמות לפי spec, ואופציונלית את יעד הכתיבה, גודל הבאפר ותדירות הכתיבה."""
+    global _buffer
+    if capacity is not None:
+        flush()
+        _buffer = collections.deque(maxlen=capacity)
+    if stream is not None:
+        _state.stream = stream
+    if flush_interval_s is not None:
+        _state.flush_interval_s = flush_interval_s
+    if spec is not None:
+        for name, level in parse_spec(spec).items():
+            set_level(name, level)
+
+
+def configure_from_env():
+    spec = os.environ.get(ENV_VAR)
+    if spec:
+        configure(spec)
+
+
+def flush():
+    """מפרמט וכותב את כל הרשומות שבבאפר."""
+    with _state.lock:
+        records = []
+        pop = _buffer.popleft
+        while _buffer:
+            records.append(pop())
+        if not records:
+            return
+        lines = []
+        for ts, level, name, msg, args in records:
+            try:
+                text = msg % args if args else msg
+            except (TypeError, ValueError):
+                text = f"{msg} {args!r}"
+            lines.append(f"[{ts - _state.t0:9.3f}] {_LEVEL_NAMES.get(level, level)} {name}: {text}\n")
+        stream = _state.stream or sys.stdout
+        stream.write("".join(lines))
+        stream.flush()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(_state.flush_interval_s)
+        flush()
+
+
+def _ensure_flusher():
+    if _state.flusher is None:
+        with _state.lock:
+            if _state.flusher is None:
+                _state.flusher = threading.Thread(target=_flush_loop, name="trace-flush", daemon=True)
+                _state.flusher.start()
+
+
+atexit.register(flush)
@@ -0,0 +1,184 @@
+"""
+Closed-form motion: a move is a straight line from `start` to `end` that
+begins at `t0_ms` and lasts `duration_ms`. The position at any time is a
+single interpolation, so renderers, collision checks and network
+interpolation can query it without stepping the simulation.
+
+`positions_at` evaluates many trajectories at once with NumPy.
+
+FixedTrajectory is the integer variant for lockstep simulation: positions
+are in SCALE units per meter (millimeters), speeds in units per second and
+times in whole milliseconds. Durations use an integer square root and
+positions integer division, so the same command stream gives bit-for-bit
+identical results on every machine.
+"""
+import math
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+Vec = Tuple[float, float]
+FixedVec = Tuple[int, int]
+
+SCALE = 1000  # fixed-point units per meter
+
+
+class Trajectory(NamedTuple):
+    start: Vec
+    end: Vec
+    t0_ms: int
+    duration_ms: int
+
+    @classmethod
+    def between(cls, start: Vec, end: Vec, t0_ms: int, speed_m_s: float) -> "Trajectory":
+        """A move at constant speed; the duration is rounded up to whole milliseconds."""
+        distance = math.hypot(end[0] - start[0], end[1] - start[1])
+        return cls(tuple(start), tuple(end), t0_ms, math.ceil(distance / speed_m_s * 1000))
+
+    @property
+    def end_ms(self) -> int:
+        return self.t0_ms + self.duration_ms
+
+    @property
+    def velocity(self) -> Vec:
+        """Meters per millisecond (zero for an instant move)."""
+        if self.duration_ms <= 0:
+            return 0.0, 0.0
+        return ((self.end[0] - self.start[0]) / self.duration_ms,
+                (self.end[1] - self.start[1]) / self.duration_ms)
+
+    def progress(self, now_ms: float) -> float:
+        """Fraction of the move done at `now_ms`, clamped to [0, 1]."""
+        if now_ms >= self.end_ms:
+            return 1.0
+        if now_ms <= self.t0_ms:
+            return 0.0
+        return (now_ms - self.t0_ms) / self.duration_ms
+
+    def at(self, now_ms: float) -> Vec:
+        """Position at `now_ms` (the start before t0, the end after arrival)."""
+        f = self.progress(now_ms)
+        if f == 1.0:
+            return self.end
+        return (self.start[0] + (self.end[0] - self.start[0]) * f,
+                self.start[1] + (self.end[1] - self.start[1]) * f)
+
+
+def stack(trajectories: Sequence[Trajectory]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Column arrays (starts (n, 2), ends (n, 2), t0 (n,), duration (n,)) for `positions_at`."""
+    n = len(trajectories)
+    starts = np.empty((n, 2))
+    ends = np.empty((n, 2))
+    t0 = np.empty(n)
+    duration = np.empty(n)
+    for i, t in enumerate(trajectories):
+        starts[i] = t.start
+        ends[i] = t.end
+        t0[i] = t.t0_ms
+        duration[i] = t.duration_ms
+    return starts, ends, t0, duration
+
+
+def positions_at(trajectories: Union[Sequence[Trajectory], tuple],
+                 now_ms: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Positions of all trajectories at `now_ms` as an (n, 2) array.
+
+    `trajectories` is a sequence of Trajectory or the result of `stack`
+    (to evaluate the same set at many times without rebuilding the arrays).
+    `now_ms` is a scalar or one time per trajectory.
+    """
+    if isinstance(trajectories, tuple) and len(trajectories) == 4 and isinstance(trajectories[0], np.ndarray):
+        starts, ends, t0, duration = trajectories
+    else:
+        starts, ends, t0, duration = stack(trajectories)
+    elapsed = np.asarray(now_ms, dtype=float) - t0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = np.where(duration > 0, elapsed / duration, 1.0)
+    f = np.clip(f, 0.0, 1.0)
+    return starts + (ends - starts) * f[:, None]
+
+
+def to_fixed(pos: Vec) -> FixedVec:
+    """Meters -> fixed-point units (rounded to the nearest unit)."""
+    return round(pos[0] * SCALE), round(pos[1] * SCALE)
+
+
+def from_fixed(pos_fx: FixedVec) -> Vec:
+    """Fixed-point units -> meters (for rendering only)."""
+    return pos_fx[0] / SCALE, pos_fx[1] / SCALE
+
+
+def fixed_speed(speed_m_s: float) -> int:
+    """Meters per second -> fixed-point units per second."""
+    return round(speed_m_s * SCALE)
+
+
+def ceil_isqrt(n: int) -> int:
+    """Smallest integer r with r * r >= n."""
+    r = math.isqrt(n)
+    return r if r * r == n else r + 1
+
+
+class FixedTrajectory(NamedTuple):
+    start_fx: FixedVec
+    end_fx: FixedVec
+    t0_ms: int
+    duration_ms: int
+
+    @classmethod
+    def between(cls, start_fx: FixedVec, end_fx: FixedVec, t0_ms: int, speed_fx: int) -> "FixedTrajectory":
+        """
+        A move at `speed_fx` units per second. The duration is the smallest
+        whole number of milliseconds that covers the distance:
+        ceil(sqrt(d2) * 1000 / speed) == ceil(ceil_isqrt(d2 * 1000**2) / speed).
+        """
+        dr, dc = end_fx[0] - start_fx[0], end_fx[1] - start_fx[1]
+        reach = ceil_isqrt((dr * dr + dc * dc) * 1_000_000)
+        return cls(tuple(start_fx), tuple(end_fx), t0_ms, -(-reach // speed_fx))
+
+    @property
+    def start(self) -> Vec:
+        return from_fixed(self.start_fx)
+
+    @property
+    def end(self) -> Vec:
+        return from_fixed(self.end_fx)
+
+    @property
+    def end_ms(self) -> int:
+        return self.t0_ms + self.duration_ms
+
+    @property
+    def end_cell(self) -> Tuple[int, int]:
+        return self.end_fx[0] // SCALE, self.end_fx[1] // SCALE
+
+    @property
+    def velocity(self) -> Vec:
+        return Trajectory(self.start, self.end, self.t0_ms, self.duration_ms).velocity
+
+    def elapsed(self, now_ms: int) -> int:
+        """Milliseconds of the move done at `now_ms`, clamped to [0, duration_ms]."""
+        return min(max(now_ms - self.t0_ms, 0), self.duration_ms)
+
+    def at_fixed(self, now_ms: int) -> FixedVec:
+        elapsed = self.elapsed(now_ms)
+        if elapsed == self.duration_ms:
+            return self.end_fx
+        return (self.start_fx[0] + (self.end_fx[0] - self.start_fx[0]) * elapsed // self.duration_ms,
+                self.start_fx[1] + (self.end_fx[1] - self.start_fx[1]) * elapsed // self.duration_ms)
+
+    def at(self, now_ms: int) -> Vec:
+        return from_fixed(self.at_fixed(now_ms))
+
+
+def fixed_positions_at(trajectories: Sequence[FixedTrajectory], now_ms: Union[int, np.ndarray]) -> np.ndarray:
+    """Positions in fixed-point units as an (n, 2) int64 array, same rounding as FixedTrajectory.at_fixed."""
+    starts = np.array([t.start_fx for t in trajectories], dtype=np.int64).reshape(-1, 2)
+    ends = np.array([t.end_fx for t in trajectories], dtype=np.int64).reshape(-1, 2)
+    t0 = np.array([t.t0_ms for t in trajectories], dtype=np.int64)
+    duration = np.array([t.duration_ms for t in trajectories], dtype=np.int64)
+    elapsed = np.clip(np.asarray(now_ms, dtype=np.int64) - t0, 0, duration)
+    done = elapsed == duration
+    step = (ends - starts) * elapsed[:, None] // np.maximum(duration, 1)[:, None]
+    return np.where(done[:, None], ends, starts + step)
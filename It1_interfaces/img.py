@@ -5,9 +5,24 @@ import pathlib
 import cv2
 import numpy as np
 
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG
+
+_trace = Trace.get("Img")
+
 class Img:
     def __init__(self):
         self.img = None
+        self._premul = None       # BGRA premultiplied by alpha (uint8)
+        self._inv_alpha = None    # 255 - alpha, replicated to 4 channels (uint8)
+        self._opaque = False
+        self._blend_cache = {}    # dst channel count -> (premul, inv_alpha)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the pixels plus the precomputed blending buffers."""
+        return sum(int(getattr(a, "nbytes", 0))
+                   for a in (self.img, getattr(self, "_premul", None), getattr(self, "_inv_alpha", None)))
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -53,9 +68,62 @@ class Img:
 
         return self
 
-    def draw_on(self, other_img, x, y):
-        print(f"Drawing+++++++  {self} at ({x}, {y})")
-        print(f"other img {other_img} at ({x}, {y})")
+    def prepare_sprite(self, chroma_key: tuple[int, int, int] | None = None,
+                       tolerance: int = 8) -> "Img":
+        """
+        Normalize the pixels to BGRA once and precompute the blending buffers.
+
+        Parameters
+        ----------
+        chroma_key : (b, g, r) | None
+            For images without an alpha channel: pixels within `tolerance`
+            of this colour that are connected to the image border become
+            transparent (the sprites are drawn on a flat white background).
+        tolerance : int
+            Per-channel distance from `chroma_key` still treated as background.
+
+        Returns
+        -------
+        Img
+            `self`, so it can be chained after `read`.
+        """
+        if self.img is None:
+            raise ValueError("Image not loaded.")
+        self.img = to_bgra(self.img, chroma_key, tolerance)
+        premul, inv_alpha = blend_planes(self.img)
+        return self.use_planes(self.img, premul, inv_alpha, bool(self.img[..., 3].min() == 255))
+
+    def use_planes(self, bgra: np.ndarray, premul: np.ndarray, inv_alpha: np.ndarray,
+                   opaque: bool) -> "Img":
+        """
+        Adopt pixels and blending buffers computed elsewhere (e.g. views into
+        a compiled sprite bundle) as they are - nothing is copied or allocated.
+        """
+        self.img = bgra
+        self._premul = premul
+        self._inv_alpha = inv_alpha
+        self._opaque = opaque
+        self._blend_cache = {4: (premul, inv_alpha)}
+        return self
+
+    def _blend_buffers(self, channels: int):
+        if self._premul is None:
+            self.prepare_sprite()
+        buffers = self._blend_cache.get(channels)
+        if buffers is None:
+            buffers = (np.ascontiguousarray(self._premul[..., :channels]),
+                       np.ascontiguousarray(self._inv_alpha[..., :channels]))
+            self._blend_cache[channels] = buffers
+        return buffers
+
+    def draw_on(self, other_img, x, y, clip: tuple[int, int, int, int] | None = None):
+        """
+        Alpha-blend this image onto `other_img` with its top-left at (x, y).
+        If `clip` = (x0, y0, x1, y1) is given, only pixels of `other_img`
+        inside that rectangle are touched.
+        """
+        if _trace.debug:
+            _trace.log(DEBUG, "draw_on: %r onto %r at (%d, %d)", self, other_img, x, y)
 
         if self.img is None : 
             raise ValueError("self images must be loaded before drawing.")
@@ -63,27 +131,30 @@ class Img:
         if other_img.img is None:
             raise ValueError("Other image must be loaded before drawing.")
 
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
-
         h, w = self.img.shape[:2]
         H, W = other_img.img.shape[:2]
 
         if y + h > H or x + w > W:
             raise ValueError("Logo does not fit at the specified position.")
 
+        premul, inv_alpha = self._blend_buffers(other_img.img.shape[2])
+        if clip is not None:
+            sx0, sy0 = max(0, clip[0] - x), max(0, clip[1] - y)
+            sx1, sy1 = min(w, clip[2] - x), min(h, clip[3] - y)
+            if sx0 >= sx1 or sy0 >= sy1:
+                return
+            premul = premul[sy0:sy1, sx0:sx1]
+            inv_alpha = inv_alpha[sy0:sy1, sx0:sx1]
+            x, y, w, h = x + sx0, y + sy0, sx1 - sx0, sy1 - sy0
+
         roi = other_img.img[y:y + h, x:x + w]
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
+        if self._opaque:
+            roi[...] = premul
         else:
-            other_img.img[y:y + h, x:x + w] = self.img
+            # dst = src_premul + dst * (255 - a) / 255, in place, integer only
+            cv2.multiply(roi, inv_alpha, dst=roi, scale=1 / 255.0)
+            cv2.add(roi, premul, dst=roi)
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
@@ -92,11 +163,12 @@ class Img:
                     cv2.FONT_HERSHEY_SIMPLEX, font_size,
                     color, thickness, cv2.LINE_AA)
 
-    def show(self, wait_ms=0):
+    def show(self, wait_ms=1):
+        """Show in the "Image" window; wait_ms=0 blocks until a key is pressed."""
         if self.img is None:
             raise ValueError("Image not loaded.")
         cv2.imshow("Image", self.img)
-        cv2.waitKey(0)
+        cv2.waitKey(wait_ms)
         #cv2.destroyAllWindows()
 
     def draw_rect(self, x, y, w, h, color, thickness=2):
@@ -106,4 +178,49 @@ class Img:
         new_img = Img()
         if self.img is not None:
             new_img.img = self.img.copy()
-        return new_img
\ No newline at end of file
+        return new_img
+
+    def clone(self):
+        """Alias of copy(), used by Board.clone()."""
+        return self.copy()
+
+
+def blend_planes(bgra: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The blending buffers of a BGRA sprite: the colour premultiplied by alpha
+    (with the alpha itself kept in the 4th channel) and 255 - alpha
+    replicated to 4 channels.
+    """
+    alpha = bgra[..., 3]
+    alpha4 = cv2.merge([alpha, alpha, alpha, alpha])
+    premul = cv2.multiply(bgra, alpha4, scale=1 / 255.0)
+    premul[..., 3] = alpha
+    return premul, cv2.bitwise_not(alpha4)
+
+
+def to_bgra(pixels: np.ndarray,
+            chroma_key: tuple[int, int, int] | None = None,
+            tolerance: int = 8) -> np.ndarray:
+    """
+    Return `pixels` as a BGRA uint8 array.
+
+    Grey and BGR inputs get an opaque alpha channel, or - when `chroma_key`
+    is given - alpha 0 for the border-connected region matching the key.
+    BGRA input is returned unchanged (no copy).
+    """
+    if pixels.ndim == 3 and pixels.shape[2] == 4:
+        return pixels
+    if pixels.ndim == 2 or pixels.shape[2] == 1:
+        return cv2.cvtColor(pixels, cv2.COLOR_GRAY2BGRA)
+
+    bgra = cv2.cvtColor(pixels, cv2.COLOR_BGR2BGRA)
+    if chroma_key is not None:
+        key = np.array(chroma_key, dtype=np.int16)
+        near = np.all(np.abs(pixels.astype(np.int16) - key) <= tolerance, axis=2).astype(np.uint8)
+        # only the background connected to the border is keyed out, so white
+        # details inside the piece stay opaque
+        _, labels = cv2.connectedComponents(near, connectivity=4)
+        border = np.concatenate([labels[0], labels[-1], labels[:, 0], labels[:, -1]])
+        background = np.unique(border[border > 0])
+        bgra[..., 3][np.isin(labels, background)] = 0
+    return bgra
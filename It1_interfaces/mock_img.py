@@ -25,7 +25,10 @@ class MockImg(Img):
         self.W = self.H = 1
         return self                        # chain-call compatible
 
-    def draw_on(self, other, x, y):
+    def prepare_sprite(self, *_, **__):
+        return self
+
+    def draw_on(self, other, x, y, clip=None):
         MockImg.traj.append((x, y))
 
     def put_text(self, txt, x, y, font_size, *_, **__):
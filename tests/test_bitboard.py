@@ -0,0 +1,72 @@
+import itertools
+import random
+from It1_interfaces.Bitboard import BitboardMoves, iter_cells, square_bit
+from It1_interfaces.Moves import Moves
+
+ROOK = tuple((k * dr, k * dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)) for k in range(1, 8))
+KNIGHT = ((1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1))
+
+
+def bits(cells, cols=8):
+    mask = 0
+    for r, c in cells:
+        mask |= square_bit(r, c, cols)
+    return mask
+
+
+def slow_legal(directions, jumps, dims, src, occupied_cells, own_cells):
+    """מימוש ישיר: הולכים לאורך כל כיוון ונעצרים בכלי הראשון."""
+    rows, cols = dims
+    result = set()
+    for ur, uc in directions:
+        for k in range(1, 8):
+            cell = (src[0] + ur * k, src[1] + uc * k)
+            if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+                break
+            result.add(cell)
+            if cell in occupied_cells:
+                break
+    for dr, dc in jumps:
+        cell = (src[0] + dr, src[1] + dc)
+        if 0 <= cell[0] < rows and 0 <= cell[1] < cols:
+            result.add(cell)
+    return result - set(own_cells)
+
+
+def test_rook_rays_stop_at_first_blocker():
+    bb = BitboardMoves(ROOK, (8, 8))
+    occupied = bits([(3, 6), (5, 3), (0, 3)])
+    dests = set(iter_cells(bb.legal_mask(3, 3, occupied, own=bits([(3, 6)])), 8))
+    assert (3, 5) in dests and (3, 6) not in dests and (3, 7) not in dests   # חסום ע"י כלי עצמי
+    assert (5, 3) in dests and (6, 3) not in dests                          # אכילה, ולא מעבר
+    assert (0, 3) in dests
+    assert (3, 0) in dests                                                    # קרן פתוחה עד הקצה
+
+
+def test_knight_jumps_are_not_blocked():
+    bb = BitboardMoves(KNIGHT, (8, 8))
+    everything = (1 << 64) - 1
+    assert set(iter_cells(bb.legal_mask(0, 0, everything & ~bits([(1, 2), (2, 1)])), 8)) == {(1, 2), (2, 1)}
+
+
+def test_pawn_double_step_blocked_by_piece_in_front():
+    moves = Moves.from_entries([(-1, 0, "non_capture"), (-2, 0, "1st")], (8, 8))
+    assert moves.legal_moves(6, 0) == ((4, 0), (5, 0))
+    # הצעד הבודד הוא non_capture, ולכן גם הוא נחסם
+    assert moves.legal_moves(6, 0, occupied=bits([(5, 0)])) == ()
+    assert moves.legal_moves(6, 0, occupied=bits([(4, 0)]), own=bits([(4, 0)])) == ((5, 0),)
+
+
+def test_matches_naive_generator_on_random_boards():
+    rng = random.Random(7)
+    directions = [(1, 0), (-1, 0), (0, 1), (0, -1)] + list(itertools.product((1, -1), repeat=2))
+    queen = tuple((k * dr, k * dc) for dr, dc in directions for k in range(1, 8))
+    dims = (10, 12)  # לוח גדול מ-64 משבצות
+    bb = BitboardMoves(queen + KNIGHT, dims)
+    cells = [(r, c) for r in range(dims[0]) for c in range(dims[1])]
+    for _ in range(50):
+        occupied_cells = set(rng.sample(cells, 30))
+        own_cells = set(rng.sample(sorted(occupied_cells), 10))
+        src = rng.choice(cells)
+        got = set(iter_cells(bb.legal_mask(*src, bits(occupied_cells, 12), bits(own_cells, 12)), 12))
+        assert got == slow_legal(directions, KNIGHT, dims, src, occupied_cells, own_cells)
@@ -0,0 +1,31 @@
+import pytest
+
+from It1_interfaces.Clock import ManualClock, MonotonicClock
+from It1_interfaces.InputListener import InputListener
+
+
+def test_manual_clock_only_moves_forward_when_told():
+    clock = ManualClock(start_ms=100)
+    assert clock.now_ms() == 100
+    assert clock.advance(50) == 150
+    clock.sleep_until(1000)
+    assert clock.now_ms() == 1000
+    clock.sleep_until(10)  # דדליין שעבר לא מחזיר את השעון אחורה
+    assert clock.now_ms() == 1000
+    with pytest.raises(ValueError):
+        clock.set(999)
+
+
+def test_monotonic_clock_sleeps_until_deadline():
+    clock = MonotonicClock()
+    deadline = clock.now_ms() + 5
+    clock.sleep_until(deadline)
+    assert clock.now_ms() >= deadline
+
+
+def test_input_events_are_stamped_by_the_given_clock():
+    clock = ManualClock(start_ms=42)
+    listener = InputListener(clock)
+    listener.on_key("a", True)
+    assert listener.pending()
+    assert listener.drain()[0].timestamp_ms == 42
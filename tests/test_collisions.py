@@ -0,0 +1,144 @@
+import itertools
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from It1_interfaces.Collisions import CollisionEngine, first_contact, first_contact_fixed, segments_of
+from It1_interfaces.Command import Command
+from It1_interfaces.Physics import IdlePhysics, MovePhysics
+
+_uids = itertools.count(1)
+
+
+def make_piece(owner, cell, target=None, start_ms=1000, kind="Move", speed=2.0, fixed_point=False):
+    if target is None:
+        physics = MovePhysics(cell, board=None, fixed_point=True) if fixed_point else IdlePhysics(cell, board=None)
+    else:
+        physics = MovePhysics(cell, board=None, speed_m_s=speed, fixed_point=fixed_point)
+        physics.reset(Command(timestamp=start_ms, piece_id="X", type=kind, params=[cell, target],
+                              target_cell=target))
+        physics.start_time_ms = start_ms
+    return SimpleNamespace(uid=next(_uids), owner=owner,
+                           state_machine=SimpleNamespace(current=SimpleNamespace(_physics=physics)))
+
+
+def test_head_on_pieces_meet_in_the_middle_and_later_mover_wins():
+    a = make_piece("P1", (0, 0), (0, 4), start_ms=100)
+    b = make_piece("P2", (0, 4), (0, 0), start_ms=200)
+    events = CollisionEngine().detect([a, b], 0, 5000)
+    assert len(events) == 1
+    event = events[0]
+    assert (event.capturer, event.captured) == (b, a)
+    # a ב-(0, 0.2 + 2t), b ב-(0, 4 - 2(t - 0.1)): מגע כשהמרחק 0.5
+    assert event.time_ms == pytest.approx(1025.0)
+
+
+def test_mover_captures_resting_piece_before_arriving():
+    mover = make_piece("P1", (6, 0), (5, 0))
+    resting = make_piece("P2", (5, 0))
+    events = CollisionEngine().detect([resting, mover], 1000, 2000)
+    assert [(e.capturer, e.captured) for e in events] == [(mover, resting)]
+    assert events[0].time_ms == pytest.approx(1250.0)
+
+
+def test_jumping_piece_is_airborne_until_it_lands():
+    jumper = make_piece("P1", (2, 0), (2, 4), kind="Jump")
+    crosser = make_piece("P2", (0, 2), (4, 2))
+    assert CollisionEngine().detect([jumper, crosser], 1000, 6000) == []
+    # נוחת על כלי שעומד ביעד - אוכל אותו ברגע הנחיתה
+    resting = make_piece("P2", (2, 4))
+    events = CollisionEngine().detect([jumper, resting], 1000, 6000)
+    assert [(e.time_ms, e.capturer, e.captured) for e in events] == [(3000.0, jumper, resting)]
+
+
+def test_same_owner_never_collides_and_window_is_respected():
+    a = make_piece("P1", (0, 0), (0, 4))
+    b = make_piece("P1", (0, 4), (0, 0))
+    assert CollisionEngine().detect([a, b], 1000, 6000) == []
+    c = make_piece("P2", (0, 4), (0, 0))
+    assert CollisionEngine().detect([a, c], 1000, 1500) == []
+    assert len(CollisionEngine().detect([a, c], 1500, 2500)) == 1
+
+
+def test_sweep_matches_all_pairs_on_random_scenarios():
+    rng = random.Random(3)
+    for _ in range(30):
+        pieces = []
+        for _ in range(12):
+            cell = (rng.randrange(8), rng.randrange(8))
+            if rng.random() < 0.6:
+                dr, dc = rng.choice([(0, 1), (1, 0), (1, 1), (-1, 1)])
+                k = rng.randint(1, 3)
+                target = (cell[0] + dr * k, cell[1] + dc * k)
+                pieces.append(make_piece(rng.choice("AB"), cell, target, start_ms=rng.randrange(1, 500)))
+            else:
+                pieces.append(make_piece(rng.choice("AB"), cell))
+        got = {(e.capturer.uid, e.captured.uid): e.time_ms for e in CollisionEngine().detect(pieces, 0, 3000)}
+
+        expected = {}
+        segments = [s for p in pieces for s in segments_of(p, 0, 3000)]
+        for s, o in itertools.combinations(segments, 2):
+            if s.piece is o.piece or s.piece.owner == o.piece.owner:
+                continue
+            if not (s.moving or o.moving or s.started_ms != o.started_ms):
+                continue
+            t = first_contact(s, o)
+            if t is None:
+                continue
+            key = (s.piece.uid, o.piece.uid)
+            if s.started_ms < o.started_ms or (s.started_ms == o.started_ms and s.piece.uid > o.piece.uid):
+                key = key[::-1]
+            expected[key] = min(t, expected.get(key, t))
+        assert got.keys() == expected.keys()
+        for key, t in expected.items():
+            assert got[key] == pytest.approx(t)
+
+
+def test_fixed_point_contact_is_an_integer_millisecond():
+    a = make_piece("P1", (0, 0), (0, 4), start_ms=100, fixed_point=True)
+    b = make_piece("P2", (0, 4), (0, 0), start_ms=200, fixed_point=True)
+    resting = make_piece("P2", (3, 3), fixed_point=True)
+    mover = make_piece("P1", (3, 0), (3, 5), start_ms=1, speed=3.0, fixed_point=True)
+
+    events = CollisionEngine().detect([a, b, resting, mover], 0, 5000)
+    times = {(e.capturer.uid, e.captured.uid): e.time_ms for e in events}
+    # אותו מגע כמו בחשבון הצף, אבל כמספר שלם
+    assert times[(b.uid, a.uid)] == 1025 and type(times[(b.uid, a.uid)]) is int
+    # (3000, 5000 (t - 1) / 1667) נכנס לרדיוס 500 של (3000, 3000) ב-t >= 1 + 2500 * 1667 / 5000 = 834.5
+    assert times[(mover.uid, resting.uid)] == 835
+
+
+def test_fixed_point_contact_matches_brute_force_scan():
+    rng = random.Random(5)
+    for _ in range(200):
+        a = ((rng.randrange(-3000, 3000), rng.randrange(-3000, 3000)), rng.randrange(0, 50),
+             (rng.randrange(-4000, 4000), rng.randrange(-4000, 4000)), rng.randrange(1, 2000))
+        b = ((rng.randrange(-3000, 3000), rng.randrange(-3000, 3000)), rng.randrange(0, 50),
+             (0, 0), 1) if rng.random() < 0.3 else \
+            ((rng.randrange(-3000, 3000), rng.randrange(-3000, 3000)), rng.randrange(0, 50),
+             (rng.randrange(-4000, 4000), rng.randrange(-4000, 4000)), rng.randrange(1, 2000))
+
+        def dist2(t):
+            # המרחק המדויק (שברים) כפול המכנים, כמו ב-first_contact_fixed
+            (oa, ta, da, na), (ob, tb, db, nb) = a, b
+            d = [(oa[i] * na + da[i] * (t - ta)) * nb - (ob[i] * nb + db[i] * (t - tb)) * na for i in (0, 1)]
+            return d[0] ** 2 + d[1] ** 2, (500 * na * nb) ** 2
+
+        expected = next((t for t in range(100, 1500) if dist2(t)[0] <= dist2(t)[1]), None)
+        assert first_contact_fixed(a, b, 100, 1499, 500) == expected
+
+
+def test_wider_radius_widens_the_sweep_bounds():
+    mover = make_piece("P1", (0, 0), (0, 4))
+    resting = make_piece("P2", (2, 2))
+    engine = CollisionEngine(radius=2.5)
+    # כל הזוגות, בלי sweep: המגע קיים ברדיוס 2.5 (מרחק 2 כשהכלי עובר ב-(0, 2))
+    expected = [first_contact(s, o, 2.5) for s in segments_of(mover, 1000, 4000)
+                for o in segments_of(resting, 1000, 4000)]
+    expected = min(t for t in expected if t is not None)
+
+    events = engine.detect([mover, resting], 1000, 4000)
+    assert [(e.capturer, e.captured) for e in events] == [(mover, resting)]
+    assert events[0].time_ms == pytest.approx(expected)
+    assert CollisionEngine().detect([mover, resting], 1000, 4000) == []
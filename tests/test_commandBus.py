@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from It1_interfaces.Command import Command
+from It1_interfaces.CommandBus import CommandBus
+from It1_interfaces.CommandCodec import PackedCommand
+
+
+def make_piece(uid):
+    return SimpleNamespace(uid=uid, on_command=MagicMock())
+
+
+def cmd(ts, uid=None, piece_id="PW", src=(6, 0), dst=(5, 0)):
+    return Command(timestamp=ts, piece_id=piece_id, type="Move", params=[src, dst], piece_uid=uid)
+
+
+def test_due_commands_come_out_in_timestamp_then_sequence_order():
+    bus = CommandBus()
+    bus.push(cmd(30, uid=1))
+    bus.push(cmd(10, uid=2))
+    bus.push(cmd(10, uid=3))
+    bus.push(cmd(50, uid=4))
+    assert [c.piece_uid for c, _ in bus.due(30)] == [2, 3, 1]
+    assert len(bus) == 1
+    assert bus.due(40) == []
+    assert [c.piece_uid for c, _ in bus.due(50)] == [4]
+
+
+def test_newer_command_for_same_piece_supersedes_pending_one():
+    bus = CommandBus()
+    first, second = cmd(10, uid=1, dst=(5, 0)), cmd(20, uid=1, dst=(4, 0))
+    assert bus.push(first)
+    assert bus.push(second)
+    # פקודה שהגיעה באיחור עם זמן מוקדם יותר לא דורסת את המאוחרת
+    assert not bus.push(cmd(15, uid=1, dst=(3, 0)))
+    assert [c for c, _ in bus.due(100)] == [second]
+    assert bus.coalesced == 2
+
+
+def test_dispatch_routes_by_uid_index_attached_piece_or_resolver():
+    a, b, c = make_piece(1), make_piece(2), make_piece(3)
+    resolve = MagicMock(return_value=c)
+    bus = CommandBus(resolve=resolve)
+    bus.register(a)
+    bus.register(b)
+    to_a, to_b, to_c = cmd(1, uid=1), cmd(2), cmd(3, piece_id="QW")
+    bus.push(to_a)
+    bus.push(to_b, piece=b)
+    bus.push(to_c)
+    bus.push(cmd(4, uid=99))  # כלי לא רשום (למשל נאכל) - הפקודה נזרקת
+
+    assert bus.dispatch(10) == 3
+    a.on_command.assert_called_once_with(to_a)
+    b.on_command.assert_called_once_with(to_b)
+    c.on_command.assert_called_once_with(to_c)
+    resolve.assert_called_once_with(to_c)
+
+    bus.unregister(a)
+    bus.push(cmd(20, uid=1))
+    assert bus.dispatch(20) == 0
+
+
+def test_packed_commands_stay_packed_until_dispatch():
+    a = make_piece(7)
+    bus = CommandBus()
+    bus.register(a)
+    packed = PackedCommand.of(10, "QW", "Move", (7, 3), (5, 3), uid=7)
+    assert bus.push(packed)
+    assert bus.pending() == [(packed, None)]
+    # פקודה חדשה לאותו כלי מאחדת גם כשהיא דחוסה
+    newer = PackedCommand.of(20, "QW", "Move", (7, 3), (4, 3), uid=7)
+    assert bus.push(newer)
+    assert bus.coalesced == 1
+
+    assert bus.dispatch(100) == 1
+    delivered = a.on_command.call_args[0][0]
+    assert isinstance(delivered, Command)
+    assert (delivered.timestamp, delivered.piece_uid, delivered.target_cell) == (20, 7, (4, 3))
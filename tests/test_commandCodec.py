@@ -0,0 +1,47 @@
+import pytest
+
+from It1_interfaces.Command import Command
+from It1_interfaces.CommandCodec import (NO_CELL, RECORD, PackedCommand, decode, decode_many, encode,
+                                         encode_many, from_notation, pack_cell, to_notation, unpack_cell)
+
+
+def test_notation_round_trip_matches_game_format():
+    cmd = from_notation("QBMe5e8", timestamp=1500, uid=7)
+    assert (cmd.piece_id, cmd.type, unpack_cell(cmd.src), unpack_cell(cmd.dst)) == ("QB", "Move", (4, 4), (7, 4))
+    assert to_notation(cmd) == "QBMe5e8"
+    assert to_notation(from_notation("NWJb1c3")) == "NWJb1c3"
+    with pytest.raises(ValueError):
+        from_notation("QBXe5e8")
+    with pytest.raises(ValueError):
+        to_notation(PackedCommand.of(0, "KB", "LongRest"))
+
+
+def test_command_conversion_keeps_cells_uid_and_notation():
+    packed = PackedCommand.of(1234, "PW", "Move", (6, 0), (5, 0), uid=3)
+    cmd = packed.to_command()
+    assert (cmd.timestamp, cmd.piece_id, cmd.type, cmd.target_cell, cmd.piece_uid) == (1234, "PW", "Move", (5, 0), 3)
+    assert cmd.params == [(6, 0), (5, 0), "PWMa7a6"]
+    assert PackedCommand.from_command(cmd) == packed
+
+    rest = PackedCommand.from_command(Command(timestamp=9, piece_id="KB", type="LongRest", params=[]))
+    assert (rest.src, rest.dst, rest.to_command().params) == (NO_CELL, NO_CELL, [])
+
+
+def test_packed_commands_are_hashable_ordered_and_binary_fixed_width():
+    a = PackedCommand.of(20, "RW", "Move", (7, 0), (3, 0))
+    b = PackedCommand.of(10, "RB", "Jump", (0, 0), (2, 1), uid=2**32 - 1)
+    assert sorted([a, b]) == [b, a]
+    assert len({a, b, PackedCommand.of(20, "RW", "Move", (7, 0), (3, 0))}) == 2
+
+    assert len(encode(a)) == RECORD.size == 16
+    assert decode(encode(b)) == b
+    blob = encode_many([a, b])
+    assert len(blob) == 2 * RECORD.size
+    assert list(decode_many(blob)) == [a, b]
+    assert decode(blob, RECORD.size) == b
+
+
+def test_cell_packing_limits():
+    assert unpack_cell(pack_cell((14, 14))) == (14, 14)
+    with pytest.raises(ValueError):
+        pack_cell((15, 0))
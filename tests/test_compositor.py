@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from It1_interfaces.img import Img
+from It1_interfaces.Compositor import Compositor
+
+
+def make_img(pixels: np.ndarray) -> Img:
+    img = Img()
+    img.img = pixels
+    return img
+
+
+def full_redraw(background: Img, sprites, rects=()):
+    """הרכבה מלאה כמו בלולאה הישנה - העתק רקע וצייר הכל."""
+    out = background.copy()
+    for img, x, y in sprites:
+        img.draw_on(out, x, y)
+    for x, y, w, h, color, thickness in rects:
+        out.draw_rect(x, y, w, h, color, thickness)
+    return out.img
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(1)
+    background = make_img(rng.integers(0, 256, (60, 80, 4), dtype=np.uint8))
+    sprite_px = rng.integers(0, 256, (10, 10, 4), dtype=np.uint8)
+    sprite_px[..., 3] = rng.choice([0, 128, 255], (10, 10))
+    a = make_img(sprite_px)
+    b = make_img(np.ascontiguousarray(sprite_px[::-1]))
+    return background, a, b
+
+
+def test_first_render_matches_full_redraw(scene):
+    background, a, b = scene
+    comp = Compositor(background)
+
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 5, 5)
+    comp.put_sprite("p2", b, 10, 8)
+    comp.put_rect("cursor", 0, 0, 10, 10, (255, 0, 0, 255), thickness=3)
+    comp.render()
+
+    expected = full_redraw(background, [(a, 5, 5), (b, 10, 8)],
+                           [(0, 0, 10, 10, (255, 0, 0, 255), 3)])
+    assert np.array_equal(comp.canvas.img, expected)
+
+
+def test_unchanged_frame_has_no_damage(scene):
+    background, a, _ = scene
+    comp = Compositor(background)
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 5, 5)
+    comp.render()
+
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 5, 5)
+    assert comp.render() == []
+
+
+def test_moving_and_animating_only_redraws_affected_regions(scene):
+    background, a, b = scene
+    comp = Compositor(background)
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 5, 5)
+    comp.put_sprite("p2", a, 50, 40)
+    comp.put_rect("cursor", 20, 20, 10, 10, (0, 255, 0, 255), thickness=5)
+    comp.render()
+
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 12, 9)   # זז ונחתך עם הסמן
+    comp.put_sprite("p2", b, 50, 40)  # פריים אנימציה התחלף
+    comp.put_rect("cursor", 30, 20, 10, 10, (0, 255, 0, 255), thickness=5)
+    damage = comp.render()
+
+    expected = full_redraw(background, [(a, 12, 9), (b, 50, 40)],
+                           [(30, 20, 10, 10, (0, 255, 0, 255), 5)])
+    assert np.array_equal(comp.canvas.img, expected)
+    covered = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in damage)
+    assert covered < 60 * 80
+
+
+def test_item_not_reported_is_erased(scene):
+    background, a, _ = scene
+    comp = Compositor(background)
+    comp.begin_frame()
+    comp.put_sprite("p1", a, 5, 5)
+    comp.render()
+
+    comp.begin_frame()
+    damage = comp.render()
+
+    assert damage == [(5, 5, 15, 15)]
+    assert np.array_equal(comp.canvas.img, background.img)
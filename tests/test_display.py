@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from It1_interfaces.img import Img
+from It1_interfaces.Display import (Cv2Display, NullDisplay, RawFileDisplay,
+                                    RingBufferDisplay, create_display)
+
+
+def make_frame(value: int) -> Img:
+    img = Img()
+    img.img = np.full((4, 5, 3), value, dtype=np.uint8)
+    return img
+
+
+def test_cv2_display_does_not_block():
+    display = Cv2Display(window="Game")
+    with patch("cv2.imshow") as imshow, patch("cv2.waitKey", return_value=-1) as wait:
+        frame = make_frame(1)
+        display.show(frame)
+        display.show(frame)
+        assert display.poll_key() == -1
+
+    assert imshow.call_count == 2
+    wait.assert_called_once_with(1)
+
+
+def test_null_display_counts_frames():
+    display = create_display("null")
+    assert isinstance(display, NullDisplay)
+    for i in range(3):
+        display.show(make_frame(i))
+    assert display.frames_shown == 3
+    assert display.poll_key() == -1
+
+
+def test_ring_buffer_keeps_last_frames_in_order():
+    display = RingBufferDisplay(capacity=3)
+    for i in range(5):
+        display.show(make_frame(i))
+
+    assert [int(f[0, 0, 0]) for f in display.frames()] == [2, 3, 4]
+    assert int(display.last()[0, 0, 0]) == 4
+
+
+def test_ring_buffer_copies_frames():
+    display = RingBufferDisplay(capacity=2)
+    frame = make_frame(7)
+    display.show(frame)
+    frame.img[:] = 0
+    assert int(display.last()[0, 0, 0]) == 7
+
+
+def test_raw_file_display_writes_frames(tmp_path):
+    path = tmp_path / "out.raw"
+    with RawFileDisplay(path) as display:
+        for i in range(3):
+            display.show(make_frame(i))
+
+    frames = np.fromfile(path, np.uint8).reshape(-1, *display.frame_shape)
+    assert frames.shape == (3, 4, 5, 3)
+    assert [int(f[0, 0, 0]) for f in frames] == [0, 1, 2]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_display("opengl")
@@ -4,6 +4,9 @@ from It1_interfaces.Game import Game
 from It1_interfaces.Board import Board
 from It1_interfaces.Piece import Piece
 from It1_interfaces.Command import Command
+from It1_interfaces.Clock import ManualClock
+from It1_interfaces.Display import NullDisplay
+from It1_interfaces.Player import Player
 
 
 class MockPiece(Piece):
@@ -125,5 +128,199 @@ class TestGame(unittest.TestCase):
             mock_print.assert_called_once_with("The winner is: piece1")
 
 
+
+class TestGameLoop(unittest.TestCase):
+    def setUp(self):
+        self.board = MockBoard()
+        self.pieces = [MockPiece("a"), MockPiece("b")]
+
+    def test_simulation_ticks_at_fixed_rate_independent_of_render_rate(self):
+        game = Game(self.pieces, self.board, display=NullDisplay(), tick_ms=5, render_fps=100)
+        game.run(max_frames=10)
+        self.assertEqual(game.frames, 10)
+        self.assertEqual(game.display.frames_shown, 10)
+        # 10 פריימים ב-100FPS הם ~90ms, כלומר ~19 צעדים של 5ms
+        self.assertGreaterEqual(game.ticks, 15)
+        self.assertLessEqual(game.ticks, 30)
+
+    def test_dropped_ticks_keep_sim_time_in_step_with_the_clock(self):
+        clock = ManualClock(1000)
+
+        class SlowDisplay(NullDisplay):
+            def show(self, frame):
+                super().show(frame)
+                clock.advance(200)  # פריים איטי: פיגור של 20 צעדים, יותר מ-max_catch_up_ticks
+
+        game = Game(self.pieces, self.board, display=SlowDisplay(), tick_ms=10, render_fps=100,
+                    max_catch_up_ticks=5, clock=clock)
+        game.run(max_frames=4)
+        self.assertEqual(game.frames, 4)
+        # לפני הפריים האחרון זמן הסימולציה הקדים את השעון לכל היותר בצעד אחד -
+        # הוא לא נשאר מאחור בצעדים שוויתרנו עליהם
+        self.assertLessEqual(abs(game.sim_ms - (clock.now_ms() - 200)), game.tick_ms)
+        self.assertLess(game.ticks, 4 * 20)
+
+    def test_uncapped_render_does_not_sleep(self):
+        game = Game(self.pieces, self.board, display=NullDisplay(), render_fps=None)
+        with patch.object(Game, "_sleep_until") as mock_sleep:
+            game.run(max_frames=3)
+        self.assertEqual(game.frames, 3)
+        mock_sleep.assert_not_called()
+
+    def make_player(self):
+        return Player(id="P1", controls={"up": "w", "down": "s", "left": "a", "right": "d",
+                                         "select_piece": "space", "move_piece": "enter"},
+                      pos=[0, 0], color=(0, 0, 0, 255))
+
+    def test_key_events_are_drained_once_per_tick(self):
+        player = self.make_player()
+        game = Game(self.pieces, self.board, players=[player], display=NullDisplay())
+        game.input.on_key("s", True, timestamp_ms=10)
+        game.input.on_key("s", False, timestamp_ms=20)
+        game.input.on_key("D", True, timestamp_ms=30)
+        game._tick()
+        self.assertEqual(player.pos, [1, 1])
+        self.assertEqual(game.input.drain(), [])
+
+    def test_held_key_repeats_cursor_but_not_selection(self):
+        player = self.make_player()
+        game = Game(self.pieces, self.board, players=[player], display=NullDisplay())
+        with patch.object(game, "_select_piece") as mock_select:
+            for ts in (0, 30, 60):
+                game.input.on_key("s", True, timestamp_ms=ts)
+                game.input.on_key("space", True, timestamp_ms=ts)
+            game._tick()
+        self.assertEqual(player.pos, [3, 0])
+        mock_select.assert_called_once_with(player)
+
+    def test_move_command_uses_key_event_timestamp(self):
+        player = self.make_player()
+        piece = MagicMock()
+        piece.piece_id = "PW"
+        piece.is_captured.return_value = False
+        piece.state_machine.current._moves.get_moves.return_value = [(1, 0)]
+        player.selected_piece, player.select_source = piece, (0, 0)
+        game = Game(self.pieces, self.board, players=[player], display=NullDisplay())
+        game.input.on_key("s", True, timestamp_ms=100)
+        game.input.on_key("enter", True, timestamp_ms=1234)
+        game._tick()
+        cmd = piece.on_command.call_args[0][0]
+        self.assertEqual((cmd.type, cmd.timestamp, cmd.target_cell), ("Move", 1234, (1, 0)))
+
+    def test_esc_event_stops_the_game(self):
+        game = Game(self.pieces, self.board, display=NullDisplay())
+        game.input.on_key("esc", True)
+        game._tick()
+        self.assertFalse(game.running)
+
+
+class TestScheduling(unittest.TestCase):
+    def setUp(self):
+        import pathlib
+        from It1_interfaces.PieceFactory import PieceFactory
+        self.board = Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                           W_cells=8, H_cells=8, img=None)
+        factory = PieceFactory(self.board, pathlib.Path(__file__).resolve().parent.parent / "pieces")
+        self.mover = factory.create_piece("QW", (6, 0))
+        self.idle = factory.create_piece("KB", (0, 4))
+        self.mover.owner, self.idle.owner = "P1", "P2"
+        self.game = Game([self.mover, self.idle], self.board, display=NullDisplay())
+        self.game.sim_ms = 1000
+
+    def test_idle_pieces_are_not_updated(self):
+        with patch.object(self.idle, "update") as idle_update:
+            for _ in range(50):
+                self.game._tick()
+        idle_update.assert_not_called()
+        self.assertIsNone(self.game.next_deadline())
+
+    def test_move_and_rest_complete_at_their_deadlines(self):
+        self.mover.on_command(Command(timestamp=1000, piece_id="QW", type="Move", params=[(6, 0), (4, 0)]))
+        arrive = self.game.next_deadline()
+        self.assertEqual(arrive, self.mover.next_deadline())
+        with patch.object(self.mover, "update", wraps=self.mover.update) as update:
+            while self.game.sim_ms < arrive:
+                self.game._tick()
+            self.assertEqual(update.call_count, 1)
+        self.assertEqual(self.mover.cell, (4, 0))
+        self.assertEqual(self.mover.state_machine.current_name, "LongRest")
+
+        rest_end = self.game.next_deadline()
+        self.assertEqual(rest_end, self.mover.next_deadline())
+        while self.game.sim_ms < rest_end:
+            self.game._tick()
+        self.assertEqual(self.mover.state_machine.current_name, "Idle")
+        self.assertIsNone(self.game.next_deadline())
+
+    def test_positions_at_queries_moving_pieces_without_stepping(self):
+        self.mover.on_command(Command(timestamp=1000, piece_id="QW", type="Move", params=[(6, 0), (4, 0)]))
+        arrive = self.mover.next_deadline()
+        pieces, positions = self.game.positions_at((1000 + arrive) / 2)
+        self.assertEqual(pieces, [self.mover, self.idle])
+        self.assertAlmostEqual(positions[0][0], 5.0, places=2)
+        self.assertEqual(tuple(positions[1]), (0.0, 4.0))
+        self.assertEqual(self.mover.cell, (6, 0))
+
+
+class TestHeadless(unittest.TestCase):
+    def setUp(self):
+        import pathlib
+        from It1_interfaces.GameSetup import load_game
+        self.board = Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                           W_cells=8, H_cells=8, img=None)
+        root = pathlib.Path(__file__).resolve().parent.parent
+        self.pieces = load_game(root, self.board, workers=2, headless=True).pieces
+        self.game = Game.headless(self.pieces, self.board)
+
+    def piece_at(self, cell):
+        return self.game.occupancy.at(cell)
+
+    def test_simulate_runs_command_stream_in_virtual_time(self):
+        from It1_interfaces.CommandCodec import from_notation
+        pawn, other = self.piece_at((6, 0)), self.piece_at((1, 1))
+        cmds = [from_notation("PWMa7a6", 100).to_command(),
+                from_notation("PBMb2b3", 150).to_command(),
+                from_notation("PWMa6a5", 60_000).to_command()]
+        end = self.game.simulate(cmds)
+
+        self.assertEqual((pawn.cell, other.cell), ((4, 0), (2, 1)))
+        self.assertEqual(pawn.state_machine.current_name, "Idle")
+        self.assertGreater(end, 60_000)
+        self.assertEqual(self.game.clock.now_ms(), end)
+        # דקה של משחק, אבל רק הצעדים שבהם קרה משהו רצו
+        self.assertLess(self.game.ticks, 20)
+
+    def test_run_sleeps_until_next_frame_when_nothing_is_scheduled(self):
+        game = Game(self.pieces, self.board, display=NullDisplay(), tick_ms=10, render_fps=10,
+                    clock=ManualClock())
+        game.run(max_frames=5)
+        self.assertEqual(game.frames, 5)
+        self.assertEqual(game.clock.now_ms(), 400)
+        # צעד אחד לכל פריים (להדביק את הסימולציה), לא עשרה
+        self.assertLessEqual(game.ticks, 5)
+
+    def test_collision_sweep_only_sees_movers_and_pieces_in_their_path(self):
+        from It1_interfaces.CommandCodec import from_notation
+        pawn = self.piece_at((6, 0))
+        self.game.simulate([from_notation("PWMa7a6", 100).to_command()], until_ms=200)
+        self.assertEqual(list(self.game._movers.values()), [pawn])
+        near = {p.cell for p in self.game._collision_candidates()}
+        self.assertEqual(near, {(6, 0), (6, 1), (7, 0), (7, 1)})
+
+        # אחרי ההגעה הכלי במנוחה: יש דדליין, אבל אין מה להעביר לזיהוי ההתנגשויות
+        self.game.simulate(until_ms=2000)
+        self.assertEqual(pawn.cell, (5, 0))
+        self.assertTrue(self.game._deadlines)
+        self.assertEqual(self.game._movers, {})
+
+    def test_advance_skips_idle_time_on_the_tick_grid(self):
+        self.assertEqual(self.game.advance(3_600_000), 0)
+        self.assertEqual(self.game.sim_ms, 3_600_000)
+        self.game.input.on_key("esc", True)
+        self.assertEqual(self.game.advance(25), 1)
+        self.assertFalse(self.game.running)
+        self.assertEqual(self.game.sim_ms, 3_600_010)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import pathlib
+
+from It1_interfaces.Board import Board
+from It1_interfaces.GameSetup import load_game, owner_for, read_positions
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def make_board():
+    return Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                 W_cells=8, H_cells=8, img=None)
+
+
+def test_read_positions_assigns_owners(tmp_path):
+    path = tmp_path / "board.txt"
+    path.write_text("# הערה\nPW 6 0\n\nKB 0 4\nXX 3 3\nbad line\n", encoding="utf-8")
+    assert read_positions(path) == [("PW", 6, 0, "P1"), ("KB", 0, 4, "P2"), ("XX", 3, 3, None)]
+    assert owner_for("QW", 0) == "P1"
+
+
+def test_load_game_builds_all_pieces_with_phase_timings():
+    board = make_board()
+    setup = load_game(ROOT, board, workers=2)
+    positions = read_positions(ROOT / "board.txt")
+
+    assert list(setup.timings) == ["discover", "decode", "template", "assemble"]
+    assert all(t >= 0 for t in setup.timings.values())
+    assert board.img is not None and board.img.img.shape == setup.board_img.img.shape
+    assert [(p.piece_id, p.cell, p.owner) for p in setup.pieces] == \
+        [(pid, (r, c), owner) for pid, r, c, owner in positions]
+    assert set(setup.factory.templates) == {pid for pid, _, _, _ in positions}
+    # הפריימים של כל המצבים כבר מפוענחים - אין טעינה בזמן המשחק
+    graphics = setup.pieces[0].state_machine.current._graphics
+    assert graphics.is_ready("move") and graphics.frames
+
+
+def test_headless_setup_uses_mock_images():
+    from It1_interfaces.mock_img import MockImg
+
+    board = make_board()
+    setup = load_game(ROOT, board, workers=2, headless=True)
+    assert isinstance(setup.board_img, MockImg)
+    graphics = setup.pieces[0].state_machine.current._graphics
+    assert graphics.frames and all(isinstance(f, MockImg) for f in graphics.frames)
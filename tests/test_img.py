@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from It1_interfaces.img import Img, to_bgra
+
+
+def make_img(pixels: np.ndarray) -> Img:
+    img = Img()
+    img.img = pixels
+    return img
+
+
+def test_to_bgra_chroma_key_only_removes_border_connected_background():
+    pixels = np.full((7, 7, 3), 255, dtype=np.uint8)
+    pixels[1:6, 1:6] = (10, 20, 30)   # גוף הכלי
+    pixels[3, 3] = (255, 255, 255)    # פרט לבן בתוך הכלי
+
+    bgra = to_bgra(pixels, chroma_key=(255, 255, 255))
+
+    assert bgra.shape == (7, 7, 4)
+    assert bgra[0, 0, 3] == 0
+    assert bgra[2, 2, 3] == 255
+    assert bgra[3, 3, 3] == 255
+
+
+def test_to_bgra_keeps_existing_alpha_without_copy():
+    pixels = np.zeros((2, 2, 4), dtype=np.uint8)
+    assert to_bgra(pixels, chroma_key=(0, 0, 0)) is pixels
+
+
+def test_draw_on_matches_float_alpha_blend():
+    rng = np.random.default_rng(0)
+    sprite = rng.integers(0, 256, (6, 5, 4), dtype=np.uint8)
+    board_px = rng.integers(0, 256, (10, 10, 4), dtype=np.uint8)
+    board = make_img(board_px.copy())
+
+    make_img(sprite).draw_on(board, 2, 3)
+
+    a = sprite[..., 3:4] / 255.0
+    expected = board_px[3:9, 2:7, :3] * (1 - a) + sprite[..., :3] * a
+    assert np.abs(board.img[3:9, 2:7, :3].astype(int) - expected).max() <= 1.5
+    assert np.array_equal(board.img[:3], board_px[:3])
+
+
+def test_draw_on_three_channel_destination():
+    sprite = np.zeros((2, 2, 4), dtype=np.uint8)
+    sprite[..., :3] = 200
+    sprite[0, 0, 3] = 255
+    board = make_img(np.full((4, 4, 3), 50, dtype=np.uint8))
+
+    make_img(sprite).draw_on(board, 0, 0)
+
+    assert tuple(board.img[0, 0]) == (200, 200, 200)
+    assert tuple(board.img[1, 1]) == (50, 50, 50)
+
+
+def test_opaque_sprite_is_copied():
+    sprite = make_img(np.full((3, 3, 3), 77, dtype=np.uint8))
+    board = make_img(np.zeros((5, 5, 4), dtype=np.uint8))
+
+    sprite.draw_on(board, 1, 1)
+
+    assert (board.img[1:4, 1:4, :3] == 77).all()
+    assert (board.img[1:4, 1:4, 3] == 255).all()
+
+
+def test_draw_on_out_of_bounds_raises():
+    sprite = make_img(np.zeros((3, 3, 4), dtype=np.uint8))
+    board = make_img(np.zeros((4, 4, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        sprite.draw_on(board, 2, 2)
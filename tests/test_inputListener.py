@@ -0,0 +1,44 @@
+import threading
+from It1_interfaces.InputListener import InputListener, KeyEvent
+
+
+def test_events_are_drained_in_order_with_repeat_flag():
+    listener = InputListener()
+    listener.on_key("W", True, timestamp_ms=1)
+    listener.on_key("w", True, timestamp_ms=2)
+    listener.on_key("w", False, timestamp_ms=3)
+    listener.on_key("w", True, timestamp_ms=4)
+
+    assert listener.drain() == [
+        KeyEvent(1, "w", True, False),
+        KeyEvent(2, "w", True, True),
+        KeyEvent(3, "w", False, False),
+        KeyEvent(4, "w", True, False),
+    ]
+    assert listener.drain() == []
+
+
+def test_events_get_monotonic_timestamps_by_default():
+    listener = InputListener()
+    before = listener.now_ms()
+    listener.on_key("a", True)
+    (event,) = listener.drain()
+    assert before <= event.timestamp_ms <= listener.now_ms()
+
+
+def test_events_from_another_thread_are_not_lost():
+    listener = InputListener()
+
+    def produce():
+        for i in range(1000):
+            listener.on_key("k", i % 2 == 0, timestamp_ms=i)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    drained = []
+    while producer.is_alive():
+        drained.extend(listener.drain())
+    producer.join()
+    drained.extend(listener.drain())
+
+    assert [e.timestamp_ms for e in drained] == list(range(1000))
@@ -38,7 +38,7 @@ def test_moves_empty_file_results_in_no_moves():
     dims = (3, 3)
     moves = Moves(file_path, dims)
 
-    assert moves.get_moves(1, 1) == []
+    assert moves.get_moves(1, 1) == ()
 
 def test_moves_file_with_comments_and_empty_lines():
     content = """
@@ -70,9 +70,80 @@ def test_get_moves_no_valid_moves_when_out_of_bounds():
     r, c = 2, 2
     valid = moves.get_moves(r, c)
     # תנועות (3,2) ו(2,3) מחוץ ללוח -> לא יחזרו
-    assert valid == []
+    assert valid == ()
 
 def test_raises_file_not_found():
     with pytest.raises(FileNotFoundError):
         Moves(Path("non_existent_file.txt"), (5,5))
 
+
+
+def test_get_moves_is_shared_immutable_table_lookup():
+    content = """
+    1, 0
+    0, 1
+    """
+    dims = (3, 3)
+    a = Moves(write_temp_file(content), dims)
+    b = Moves.from_entries([(1, 0, None), (0, 1, None)], dims)
+
+    # אותו סוג כלי ואותו לוח -> אותה טבלה, ואותו אובייקט מוחזר בכל קריאה
+    assert a.table is b.table
+    assert a.get_moves(0, 0) is b.get_moves(0, 0)
+    assert a.get_moves(0, 0) == ((1, 0), (0, 1))
+    assert isinstance(a.get_moves(0, 0), tuple)
+
+    assert Moves.from_entries([(1, 0, None)], (4, 4)).table is not a.table
+    assert a.get_moves(5, 5) == ()
+
+
+def test_move_table_compact_arrays():
+    moves = Moves.from_entries([(1, 1, None), (-1, -1, None)], (3, 3))
+    table = moves.table
+    assert table.targets.dtype.name == "int16"
+    assert len(table.offsets) == 3 * 3 + 1
+    assert table.destinations(1, 1).tolist() == [[2, 2], [0, 0]]
+    with pytest.raises(ValueError):
+        table.destinations(1, 1)[0, 0] = 9
+
+
+PAWN = [(-1, 0, "non_capture"), (-2, 0, "1st"), (-1, -1, "capture"), (-1, 1, "capture")]
+
+
+def bit(r, c, cols=8):
+    return 1 << (r * cols + c)
+
+
+def test_pawn_modifiers_are_enforced():
+    moves = Moves.from_entries(PAWN, (8, 8))
+    # לוח ריק, צעד ראשון: רק התקדמות (אין מה לאכול באלכסון)
+    assert moves.legal_moves(6, 3) == ((4, 3), (5, 3))
+    # אחרי שהכלי זז: אין צעד כפול
+    assert moves.legal_moves(6, 3, first_move=False) == ((5, 3),)
+    # כלי יריב באלכסון ומולו: אוכלים באלכסון, לא קדימה
+    enemy = bit(5, 2) | bit(5, 3)
+    assert moves.legal_moves(6, 3, occupied=enemy) == ((5, 2),)
+    # כלי עצמי באלכסון לא נאכל
+    own = bit(5, 4)
+    assert not moves.is_legal((6, 3), (5, 4), occupied=own, own=own)
+    assert moves.is_legal((6, 3), (5, 2), occupied=enemy | own, own=own)
+
+
+def test_untagged_line_overrides_modifier_for_same_delta():
+    moves = Moves.from_entries([(1, 0, "capture"), (1, 0, None)], (8, 8))
+    assert moves.legal_moves(0, 0) == ((1, 0),)
+    assert moves.rules.modifiers == {}
+
+
+def test_custom_modifier_registry():
+    from It1_interfaces import Moves as moves_module
+    moves_module.register_modifier("edge_only", lambda ctx: ~0xFF)  # רק לשורה 0
+    try:
+        moves = Moves.from_entries([(-1, 0, "edge_only"), (0, 1, None)], (8, 8))
+        assert moves.legal_moves(1, 0) == ((0, 0), (1, 1))
+        assert moves.legal_moves(2, 0) == ((2, 1),)
+        # שמות נרדפים ושילוב modifiers באותה שורה
+        assert moves_module.parse_modifiers("quiet:first") == {"non_capture", "1st"}
+    finally:
+        del moves_module.MODIFIERS["edge_only"]
+        del moves_module._aliases["edge_only"]
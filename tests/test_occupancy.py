@@ -0,0 +1,97 @@
+import numpy as np
+from It1_interfaces.Occupancy import OccupancyIndex
+
+
+class FakePiece:
+    _next = 1
+
+    def __init__(self, cell, owner=None):
+        self.uid = FakePiece._next
+        FakePiece._next += 1
+        self.cell = cell
+        self.owner = owner
+        self.on_arrive = None
+
+    def arrive(self, cell):
+        self.cell = cell
+        self.on_arrive(self)
+
+
+def test_track_and_lookup():
+    index = OccupancyIndex(4, 5)
+    a, b = FakePiece((0, 0)), FakePiece((3, 4))
+    index.track(a)
+    index.track(b)
+
+    assert index.at((0, 0)) is a
+    assert index.at((3, 4)) is b
+    assert index.at((1, 1)) is None
+    assert index.is_free((1, 1)) and not index.is_free((0, 0))
+    assert index.cell_of(b) == (3, 4)
+    assert np.count_nonzero(index.grid) == 2
+
+
+def test_pieces_without_cell_are_not_indexed():
+    index = OccupancyIndex(2, 2)
+    piece = FakePiece(None)
+    assert index.track(piece) is False
+    assert len(index) == 0
+
+
+def test_arrival_moves_handle_and_reports_displaced_piece():
+    index = OccupancyIndex(4, 4)
+    a, b = FakePiece((0, 0)), FakePiece((1, 1))
+    index.track(a)
+    index.track(b)
+
+    a.arrive((0, 1))
+    assert index.is_free((0, 0))
+    assert index.at((0, 1)) is a
+
+    a.arrive((1, 1))
+    assert index.at((1, 1)) is a
+    assert index.drain_arrivals() == [(a, None), (a, b)]
+    assert index.drain_arrivals() == []
+
+    index.remove(b)  # נאכל
+    assert index.at((1, 1)) is a
+    assert index.cell_of(b) is None
+
+
+def test_pieces_in_box_includes_displaced_and_clips_to_board():
+    index = OccupancyIndex(4, 4)
+    a, b, c = FakePiece((0, 0)), FakePiece((1, 2)), FakePiece((3, 3))
+    for p in (a, b, c):
+        index.track(p)
+    a.arrive((1, 2))  # b נדחק מתחת ל-a
+
+    assert {p.uid for p in index.pieces_in(-1, 1, 1, 2)} == {a.uid, b.uid}
+    assert index.pieces_in(2, 9, 3, 9) == [c]
+    assert index.pieces_in(0, 0, 0, 0) == []
+
+
+def test_displaced_piece_returns_when_arrival_leaves():
+    index = OccupancyIndex(4, 4)
+    a, b = FakePiece((0, 0)), FakePiece((2, 2))
+    index.track(a)
+    index.track(b)
+
+    a.arrive((2, 2))
+    a.arrive((3, 3))
+    assert index.at((2, 2)) is b
+    assert index.at((3, 3)) is a
+
+
+def test_bitboards_follow_moves_and_captures():
+    index = OccupancyIndex(4, 4)
+    a, b = FakePiece((0, 0), "P1"), FakePiece((1, 1), "P2")
+    index.track(a)
+    index.track(b)
+    assert index.occupied == (1 << 0) | (1 << 5)
+    assert index.owner_bits("P1") == 1 << 0
+
+    a.arrive((1, 1))
+    index.remove(b)
+    assert index.occupied == 1 << 5
+    assert index.owner_bits("P1") == 1 << 5
+    assert index.owner_bits("P2") == 0
@@ -58,6 +58,15 @@ class TestPhysicsBase(unittest.TestCase):
         self.assertEqual(self.physics.target_pos_meters, (4.0, 5.0))
         self.assertEqual(self.physics.current_command, cmd)
     
+    def test_reset_with_start_time_builds_trajectory_and_deadline(self):
+        """With a start time, reset knows the whole move before any update"""
+        self.physics.reset(MockCommand(target_cell=(2, 5)), 1000)
+
+        self.assertEqual(self.physics.start_time_ms, 1000)
+        self.assertEqual(self.physics.finish_ms, 3000)  # 2 meters at 1 m/s
+        self.assertEqual(self.physics.trajectory.t0_ms, 1000)
+        self.assertEqual(self.physics.position_at(2000), (2.0, 4.0))
+
     def test_reset_with_no_target_command(self):
         """Test reset with command that has no target"""
         cmd = MockCommand(target_cell=None)
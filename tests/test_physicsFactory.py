@@ -21,6 +21,11 @@ class TestPhysicsFactory(unittest.TestCase):
         self.assertIsInstance(physics_obj, MovePhysics)
         self.assertEqual(physics_obj.current_cell, (2, 3))
 
+    def test_fixed_point_factory_creates_fixed_point_movers(self):
+        factory = PhysicsFactory(self.board, fixed_point=True)
+        self.assertTrue(factory.create((2, 3), {'type': 'move'}).fixed_point)
+        self.assertFalse(self.factory.create((2, 3), {'type': 'move'}).fixed_point)
+
     def test_create_default_physics(self):
         # במידה ולא מועבר 'type' או סוג לא מוכר, מחזיר אובייקט Physics רגיל
         cfg = {}
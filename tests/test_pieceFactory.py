@@ -5,10 +5,29 @@ import pytest
 from unittest.mock import MagicMock, patch, mock_open
 # הוסף את הנתיב לתיקיית המודולים (התאם לפי הסביבה שלך)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
-from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.Board import Board
+from It1_interfaces.Command import Command
+from It1_interfaces.Display import NullDisplay
+from It1_interfaces.Game import Game
+from It1_interfaces.PieceFactory import LONG_REST_MS, PieceFactory
 from It1_interfaces.Piece import Piece
 from It1_interfaces.State import State
 
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def board():
+    return Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                 W_cells=8, H_cells=8, img=None)
+
+
+@pytest.fixture
+def factory(board):
+    """מפעל כלים אמיתי מעל תיקיית pieces של הפרויקט."""
+    return PieceFactory(board, ROOT / "pieces")
+
+
 @patch('PieceFactory.GraphicsFactory')
 @patch('PieceFactory.PhysicsFactory')  
 @patch('PieceFactory.Moves')
@@ -61,4 +80,67 @@ def test_create_piece(mock_json_load, mock_file_open, mock_state_class, mock_mov
     mock_state_class.from_config.assert_called()
     
     # 3. בדיקה ש-key של "soldier" נמצא במילון ה-state_machine_templates
-    assert "soldier" in factory.state_machine_templates
\ No newline at end of file
+    assert "soldier" in factory.state_machine_templates
+
+def test_piece_lifecycle_move_rest_idle(factory):
+    """כלי אמיתי: Idle -> Move -> LongRest -> Idle, והתא עובר בין המצבים."""
+    piece = factory.create_piece("PW", (6, 0))
+    states = piece.state_machine.states
+
+    piece.on_command(Command(timestamp=1000, piece_id="PW", type="Move", params=[(6, 0), (5, 0)]))
+    assert piece.state_machine.current is states["Move"]
+
+    t = 1000
+    while piece.state_machine.current is states["Move"] and t < 10000:
+        t += 10
+        piece.update(t)
+    assert piece.state_machine.current is states["LongRest"]
+    assert piece.cell == (5, 0)
+    assert piece.arrived_ms == t
+
+    # תנועה בזמן מנוחה נדחית
+    piece.on_command(Command(timestamp=t, piece_id="PW", type="Move", params=[(5, 0), (4, 0)]))
+    assert piece.state_machine.current is states["LongRest"]
+
+    piece.update(t + 10)
+    piece.update(t + 10 + LONG_REST_MS)
+    assert piece.state_machine.current is states["Idle"]
+    assert piece.cell == (5, 0)
+
+
+def test_game_captures_piece_on_arrival(board, factory):
+    white = factory.create_piece("QW", (6, 0))
+    black = factory.create_piece("PB", (5, 0))
+    white.owner, black.owner = "P1", "P2"
+    game = Game([white, black], board, display=NullDisplay())
+    assert game.occupancy.at((5, 0)) is black
+
+    white.on_command(Command(timestamp=0, piece_id="QW", type="Move", params=[(6, 0), (5, 0)]))
+    for _ in range(300):
+        game._tick()
+        if black.is_captured() and white.cell == (5, 0):
+            break
+
+    assert black.is_captured()
+    assert game.occupancy.at((5, 0)) is white
+    assert game.occupancy.is_free((6, 0))
+
+
+def test_pieces_of_same_type_are_cloned_from_one_template(factory):
+    with patch.object(factory, "_build_template", wraps=factory._build_template) as build:
+        pawns = [factory.create_piece("PW", (6, c)) for c in range(8)]
+        factory.create_piece("RW", (7, 0))
+    assert build.call_count == 2
+    assert set(factory.templates) == {"PW", "RW"}
+
+    a, b = pawns[0], pawns[1]
+    ga, gb = a.state_machine.current._graphics, b.state_machine.current._graphics
+    # נתונים לקריאה בלבד משותפים
+    assert a.state_machine.current._moves is b.state_machine.current._moves
+    assert ga.frames is gb.frames
+    # מצב המשחק נפרד לכל כלי
+    assert ga is not gb
+    assert a.state_machine.current is not b.state_machine.current
+    a.on_command(Command(timestamp=0, piece_id="PW", type="Move", params=[(6, 0), (5, 0)]))
+    assert b.state_machine.current is b.state_machine.states["Idle"]
+    assert b.cell == (6, 1)
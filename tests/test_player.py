@@ -0,0 +1,61 @@
+import pathlib
+
+import pytest
+
+from It1_interfaces.Board import Board
+from It1_interfaces.Clock import ManualClock
+from It1_interfaces.CommandBus import CommandBus
+from It1_interfaces.CommandCodec import PackedCommand
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.Player import Player
+from It1_interfaces.mock_img import MockImg
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def pieces():
+    board = Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                  W_cells=8, H_cells=8, img=None)
+    factory = PieceFactory(board, ROOT / "pieces", img_cls=MockImg)
+    white, black = factory.create_piece("PW", (6, 0)), factory.create_piece("PB", (1, 0))
+    white.owner, black.owner = "P1", "P2"
+    return white, black
+
+
+def make_player(pos):
+    return Player(id="P1", controls={}, pos=list(pos), color=(255, 0, 0, 255))
+
+
+def test_move_command_goes_through_the_bus_to_the_piece(pieces):
+    white, black = pieces
+    bus = CommandBus()
+    for piece in pieces:
+        bus.register(piece)
+    clock = ManualClock(1000)
+    player = make_player((6, 0))
+
+    player.try_select_or_command(pieces, bus, clock)
+    assert player.selected_piece is white and len(bus) == 0
+
+    player.pos[0] = 5
+    player.try_select_or_command(pieces, bus, clock)
+    assert player.selected_piece is None
+    [(cmd, _)] = bus.pending()
+    assert cmd == PackedCommand.of(1000, "PW", "Move", (6, 0), (5, 0), white.uid)
+
+    assert bus.dispatch(1000) == 1
+    assert white.state_machine.current_name == "Move"
+    assert black.state_machine.current_name == "Idle"
+
+
+def test_cannot_select_opponent_piece(pieces):
+    bus = CommandBus()
+    player = make_player((1, 0))
+    player.try_select_or_command(pieces, bus, ManualClock())
+    assert player.selected_piece is None and len(bus) == 0
+
+
+def test_clock_must_be_passed_explicitly(pieces):
+    with pytest.raises(TypeError):
+        make_player((6, 0)).try_select_or_command(pieces, CommandBus())
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from It1_interfaces.img import Img
+from It1_interfaces.Board import Board
+from It1_interfaces.Renderer import LayeredRenderer
+
+
+def make_img(pixels: np.ndarray) -> Img:
+    img = Img()
+    img.img = pixels
+    return img
+
+
+class FakePiece:
+    """כלי דמה עם state machine מינימלי: Idle/Move, גרפיקה ותא."""
+    def __init__(self, img, cell):
+        self.cell = cell
+        graphics = SimpleNamespace(get_img=lambda: img)
+        physics = SimpleNamespace(current_cell=cell)
+        idle = SimpleNamespace(_graphics=graphics, _physics=physics)
+        move = SimpleNamespace(_graphics=graphics, _physics=physics)
+        self.state_machine = SimpleNamespace(states={"Idle": idle, "Move": move}, current=idle)
+
+    def start_moving(self):
+        self.state_machine.current = self.state_machine.states["Move"]
+
+    def move_to(self, cell):
+        self.state_machine.current._physics.current_cell = cell
+
+
+@pytest.fixture
+def setup():
+    rng = np.random.default_rng(2)
+    background = make_img(rng.integers(0, 256, (40, 40, 4), dtype=np.uint8))
+    board = Board(cell_H_pix=10, cell_W_pix=10, cell_H_m=1, cell_W_m=1,
+                  W_cells=4, H_cells=4, img=None)
+    sprite = rng.integers(0, 256, (10, 10, 4), dtype=np.uint8)
+    sprite[..., 3] = rng.choice([0, 255], (10, 10))
+    pieces = [FakePiece(make_img(sprite), (0, 0)), FakePiece(make_img(sprite[::-1].copy()), (2, 3))]
+    return background, board, pieces
+
+
+def expected_image(background, board, pieces):
+    out = background.copy()
+    for p in pieces:
+        state = p.state_machine.current
+        x, y = board.get_pixel_position(state._physics.current_cell)
+        state._graphics.get_img().draw_on(out, x, y)
+    return out.img
+
+
+def test_initial_render_composites_resting_pieces(setup):
+    background, board, pieces = setup
+    renderer = LayeredRenderer(board, background)
+
+    renderer.render(pieces)
+
+    assert board.img is renderer.frame.canvas
+    assert np.array_equal(board.img.img, expected_image(background, board, pieces))
+
+
+def test_moving_piece_does_not_touch_static_layer(setup):
+    background, board, pieces = setup
+    renderer = LayeredRenderer(board, background)
+    pieces[0].start_moving()
+    renderer.render(pieces)
+
+    pieces[0].move_to((1, 1))
+    static_damage = []
+    real_render = renderer.static.render
+    with patch.object(renderer.static, "render",
+                      side_effect=lambda: static_damage.extend(real_render()) or static_damage):
+        damage = renderer.render(pieces)
+
+    assert static_damage == []
+    assert damage == [(0, 0, 10, 10), (10, 10, 20, 20)]
+    assert np.array_equal(board.img.img, expected_image(background, board, pieces))
+
+
+def test_piece_leaving_idle_and_capture_update_the_image(setup):
+    background, board, pieces = setup
+    renderer = LayeredRenderer(board, background)
+    renderer.render(pieces)
+
+    pieces[1].start_moving()
+    pieces[1].move_to((3, 3))
+    renderer.render(pieces)
+    assert np.array_equal(board.img.img, expected_image(background, board, pieces))
+
+    captured = pieces.pop(0)
+    renderer.render(pieces)
+    assert np.array_equal(board.img.img, expected_image(background, board, pieces))
+    assert captured not in renderer.static._items
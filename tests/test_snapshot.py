@@ -0,0 +1,93 @@
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+from It1_interfaces.Board import Board
+from It1_interfaces.CommandCodec import from_notation
+from It1_interfaces.Game import Game
+from It1_interfaces.GameSetup import load_game
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.Snapshot import PIECE_DTYPE
+from It1_interfaces.mock_img import MockImg
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def make_board():
+    return Board(cell_H_pix=103, cell_W_pix=102, cell_H_m=1, cell_W_m=1,
+                 W_cells=8, H_cells=8, img=None)
+
+
+def logical_state(game):
+    return [(p.uid, p.cell, p.state_machine.current_name, p.is_captured(), p.has_moved,
+             p.state_machine.current._physics.finish_ms) for p in game.pieces]
+
+
+def test_restore_mid_flight_replays_identically():
+    board = make_board()
+    game = Game.headless(load_game(ROOT, board, workers=2, headless=True).pieces, board)
+    game.commands.push(from_notation("PWMa7a6", 100).to_command())
+    game.commands.push(from_notation("PBMb2b3", 3000).to_command())
+    game.advance(500)
+
+    snap = game.snapshot()
+    assert snap.pieces.dtype == PIECE_DTYPE and len(snap.pieces) == len(game.pieces)
+    assert snap.nbytes < 8 * 1024  # בלי תמונות
+    assert len(game.commands) == 1
+
+    game.simulate()
+    final, final_ms = logical_state(game), game.sim_ms
+
+    game.restore(snap)
+    assert (game.sim_ms, game.clock.now_ms(), len(game.commands)) == (500, 500, 1)
+    assert game.occupancy.at((6, 0)).piece_id == "PW"  # עוד באוויר, התא נשאר שלו
+    game.simulate()
+    assert logical_state(game) == final and game.sim_ms == final_ms
+
+
+def test_restore_undoes_a_capture():
+    board = make_board()
+    factory = PieceFactory(board, ROOT / "pieces", img_cls=MockImg)
+    white = factory.create_piece("QW", (6, 0))
+    black = factory.create_piece("PB", (5, 0))
+    white.owner, black.owner = "P1", "P2"
+    game = Game.headless([white, black], board)
+    snap = game.snapshot()
+
+    game.commands.push(from_notation("QWMa7a6", 10).to_command())
+    game.simulate()
+    assert black.is_captured() and game.occupancy.at((5, 0)) is white
+
+    game.restore(snap)
+    assert not black.is_captured()
+    assert game.occupancy.at((5, 0)) is black and game.occupancy.at((6, 0)) is white
+    assert white.state_machine.current_name == "Idle" and not white.has_moved
+    assert game.next_deadline() is None and len(game.commands) == 0
+    assert game.snapshot().pieces.tobytes() == snap.pieces.tobytes()
+
+
+def test_capture_immunity_timer_is_restored():
+    board = make_board()
+    game = Game.headless(load_game(ROOT, board, workers=2, headless=True).pieces, board)
+    pawn = game.occupancy.at((6, 0))
+    game.commands.push(from_notation("PWMa7a6", 100).to_command())
+    game.advance(300)
+    physics = pawn.state_machine.current._physics
+    assert hasattr(physics, "last_capture_time_ms")
+
+    physics.last_capture_time_ms = 250
+    snap = game.snapshot()
+    physics.last_capture_time_ms = 0
+    game.restore(snap)
+    assert pawn.state_machine.current._physics.last_capture_time_ms == 250
+
+
+def test_pieces_without_state_machine_are_rejected():
+    board = make_board()
+    factory = PieceFactory(board, ROOT / "pieces", img_cls=MockImg)
+    stateless = SimpleNamespace(uid=99, piece_id="XX", cell=(0, 0), owner="P2",
+                                is_captured=lambda: False, update=lambda now: None)
+    game = Game.headless([factory.create_piece("QW", (6, 0)), stateless], board)
+    with pytest.raises(ValueError, match="state machine"):
+        game.snapshot()
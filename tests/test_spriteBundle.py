@@ -0,0 +1,123 @@
+import json
+import pathlib
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch
+from It1_interfaces import SpriteBundle as sprite_bundle
+from It1_interfaces.SpriteBundle import SpriteBundle, compile_bundle
+from It1_interfaces.SpriteCache import SpriteCache
+from It1_interfaces.Graphics import Graphics
+from It1_interfaces.Board import Board
+from It1_interfaces.mock_img import MockImg
+from It1_interfaces.img import Img, blend_planes, to_bgra
+
+
+def make_piece(root: pathlib.Path, piece_id: str, states: dict):
+    """יוצר תיקיית כלי עם moves.txt ו-states/<name>/{config.json,sprites}."""
+    piece_dir = root / piece_id
+    (piece_dir / "states").mkdir(parents=True)
+    (piece_dir / "moves.txt").write_text("1,0:non_capture\n1,1:capture\n", encoding="utf-8")
+    for name, count in states.items():
+        state_dir = piece_dir / "states" / name
+        (state_dir / "sprites").mkdir(parents=True)
+        (state_dir / "config.json").write_text(json.dumps({"graphics": {"frames_per_sec": count}}))
+        for i in range(1, count + 1):
+            img = np.full((30, 24, 3), i * 40, dtype=np.uint8)
+            img[0, 0] = (1, 2, 3)
+            cv2.imwrite(str(state_dir / "sprites" / f"{i}.png"), img)
+
+
+@pytest.fixture
+def bundle_file(tmp_path):
+    root = tmp_path / "pieces"
+    make_piece(root, "PB", {"idle": 2, "move": 3})
+    out = tmp_path / "pieces.kfsb"
+    compile_bundle(root, out, (10, 12))
+    return root, out
+
+
+def test_bundle_index_contains_configs_and_moves(bundle_file):
+    _, out = bundle_file
+    bundle = SpriteBundle(out)
+
+    assert bundle.piece_ids == ["PB"]
+    assert sorted(bundle.states("PB")) == ["idle", "move"]
+    assert bundle.config("PB", "move") == {"graphics": {"frames_per_sec": 3}}
+    assert bundle.moves("PB") == [(1, 0, "non_capture"), (1, 1, "capture")]
+
+
+def test_bundle_frames_match_resized_images_and_are_read_only(bundle_file):
+    root, out = bundle_file
+    bundle = SpriteBundle(out)
+
+    frames = bundle.frames("PB", "move")
+    expected = to_bgra(cv2.resize(cv2.imread(str(root / "PB/states/move/sprites/2.png")),
+                                  (10, 12), interpolation=cv2.INTER_AREA), (255, 255, 255))
+
+    assert len(frames) == 3
+    assert frames[1].shape == (12, 10, 4)
+    assert np.array_equal(frames[1], expected)
+    assert not frames[1].flags.writeable
+    assert frames[0].ctypes.data % 64 == 0
+
+
+def test_missing_state_returns_none(bundle_file):
+    _, out = bundle_file
+    assert SpriteBundle(out).frames("PB", "jump") is None
+
+
+def test_rejects_non_bundle_file(tmp_path):
+    bad = tmp_path / "bad.kfsb"
+    bad.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        SpriteBundle(bad)
+
+
+def test_rejects_bundle_from_another_version(bundle_file, monkeypatch):
+    _, out = bundle_file
+    monkeypatch.setattr(sprite_bundle, "VERSION", sprite_bundle.VERSION + 1)
+    with pytest.raises(ValueError, match="version"):
+        SpriteBundle(out)
+
+
+def test_cache_rejects_bundle_compiled_with_another_chroma_key(bundle_file):
+    root, out = bundle_file
+    with pytest.raises(ValueError, match="chroma key"):
+        SpriteCache(chroma_key=(0, 0, 0)).attach_bundle(SpriteBundle(out), root)
+
+
+def test_cache_wraps_precomputed_blend_planes_without_copying(bundle_file):
+    root, out = bundle_file
+    bundle = SpriteBundle(out)
+    cache = SpriteCache()
+    cache.attach_bundle(bundle, root)
+
+    with patch.object(Img, "prepare_sprite") as mock_prepare:
+        frames = cache.load_folder(root / "PB/states/move/sprites", (10, 12))
+        mock_prepare.assert_not_called()
+
+    bgra, premul, inv_alpha, opaque = bundle.sprites("PB", "move")[1]
+    frame = frames[1]
+    assert frame.img is bgra and frame._premul is premul and frame._inv_alpha is inv_alpha
+    assert not premul.flags.writeable
+    expected_premul, expected_inv = blend_planes(np.array(bgra))
+    assert np.array_equal(premul, expected_premul)
+    assert np.array_equal(inv_alpha, expected_inv)
+    assert opaque == bool(bgra[..., 3].min() == 255)
+
+
+def test_graphics_loads_from_attached_bundle_without_imread(bundle_file):
+    root, out = bundle_file
+    cache = SpriteCache()
+    cache.attach_bundle(SpriteBundle(out), root)
+    board = Board(cell_H_pix=12, cell_W_pix=10, cell_H_m=1, cell_W_m=1,
+                  W_cells=8, H_cells=8, img=MockImg())
+
+    with patch("cv2.imread") as mock_imread:
+        gfx = Graphics(root / "PB", board, sprite_cache=cache)
+        mock_imread.assert_not_called()
+
+    assert len(gfx.frames) == 2
+    assert gfx.img.img.shape == (12, 10, 4)
+    assert gfx.img.img.base is not None  # view מעל ה-mmap, לא עותק
@@ -0,0 +1,171 @@
+import pathlib
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch
+from It1_interfaces.SpriteCache import SpriteCache
+from It1_interfaces.Graphics import Graphics
+from It1_interfaces.Board import Board
+from It1_interfaces.Command import Command
+from It1_interfaces.mock_img import MockImg
+
+
+def write_sprites(folder: pathlib.Path, count: int, size=(40, 40)):
+    """עוזר ליצור תיקיית sprites עם קבצי PNG ממוספרים."""
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        img = np.full((size[1], size[0], 3), i * 20, dtype=np.uint8)
+        cv2.imwrite(str(folder / f"{i}.png"), img)
+
+
+@pytest.fixture
+def piece_dir(tmp_path):
+    root = tmp_path / "PW"
+    write_sprites(root / "states" / "idle" / "sprites", 2)
+    write_sprites(root / "states" / "move" / "sprites", 3)
+    return root
+
+
+@pytest.fixture
+def board():
+    return Board(cell_H_pix=10, cell_W_pix=10, cell_H_m=1, cell_W_m=1,
+                 W_cells=8, H_cells=8, img=MockImg())
+
+
+def test_get_returns_same_frame_for_same_key(piece_dir):
+    cache = SpriteCache()
+    path = piece_dir / "states" / "idle" / "sprites" / "1.png"
+
+    first = cache.get(path, (10, 10))
+    second = cache.get(path, (10, 10))
+
+    assert first is second
+    assert first.img.shape[:2] == (10, 10)
+    assert cache.misses == 1 and cache.hits == 1
+
+
+def test_different_size_is_a_different_entry(piece_dir):
+    cache = SpriteCache()
+    path = piece_dir / "states" / "idle" / "sprites" / "1.png"
+
+    small = cache.get(path, (10, 10))
+    big = cache.get(path, (20, 20))
+
+    assert small is not big
+    assert len(cache) == 2
+
+
+def test_lru_eviction_respects_budget(piece_dir):
+    folder = piece_dir / "states" / "move" / "sprites"
+    frame_bytes = SpriteCache().get(folder / "1.png", (10, 10)).nbytes
+    cache = SpriteCache(max_bytes=2 * frame_bytes)
+
+    f1 = cache.get(folder / "1.png", (10, 10))
+    cache.get(folder / "2.png", (10, 10))
+    cache.get(folder / "1.png", (10, 10))  # 1 הופך לשימוש האחרון
+    cache.get(folder / "3.png", (10, 10))  # מפנה את 2
+
+    assert cache.nbytes <= cache.max_bytes
+    assert len(cache) == 2
+    assert cache.get(folder / "1.png", (10, 10)) is f1
+    misses = cache.misses
+    cache.get(folder / "2.png", (10, 10))
+    assert cache.misses == misses + 1
+
+
+def test_missing_folder_returns_none(tmp_path):
+    cache = SpriteCache()
+    assert cache.load_folder(tmp_path / "nope") is None
+
+
+def test_graphics_reset_does_not_touch_disk_after_warm_up(piece_dir, board):
+    cache = SpriteCache()
+    gfx = Graphics(piece_dir, board, sprite_cache=cache)
+    cache.load_folder(piece_dir / "states" / "move" / "sprites", (10, 10))
+
+    cmd = Command(timestamp=0, piece_id="PW", type="Move", params=[])
+    with patch("cv2.imread") as mock_imread, \
+         patch("pathlib.Path.iterdir") as mock_iterdir:
+        gfx.reset(cmd)
+        mock_imread.assert_not_called()
+        mock_iterdir.assert_not_called()
+
+    assert len(gfx.frames) == 3
+    assert gfx.img is gfx.frames[0]
+
+
+def test_graphics_instances_share_frames(piece_dir, board):
+    cache = SpriteCache()
+    g1 = Graphics(piece_dir, board, sprite_cache=cache)
+    g2 = Graphics(piece_dir, board, sprite_cache=cache)
+
+    assert g1.frames[0] is g2.frames[0]
+    assert cache.misses == 2  # שני פריימי idle נטענו פעם אחת בלבד
+
+
+def test_state_dir_name_maps_command_types_to_folders():
+    assert Graphics.state_dir_name("Move") == "move"
+    assert Graphics.state_dir_name("LongRest") == "long_rest"
+    assert Graphics.state_dir_name("ShortRest") == "short_rest"
+
+
+def test_reset_on_cold_state_keeps_current_frames_until_prefetch_done(piece_dir, board):
+    cache = SpriteCache()
+    gfx = Graphics(piece_dir, board, sprite_cache=cache)
+    idle_img = gfx.img
+    assert not gfx.is_ready("move")
+
+    cmd = Command(timestamp=0, piece_id="PW", type="Move", params=[])
+    with patch.object(cache, "load_folder", wraps=cache.load_folder) as spy:
+        gfx.reset(cmd)
+        # הפענוח מתוזמן ל-thread pool, ה-reset עצמו לא טוען
+        assert gfx.img is idle_img
+        assert gfx.wait_ready(["move"], timeout=5)
+
+    assert spy.call_count == 1
+    assert gfx.is_ready("move")
+    assert gfx.get_img() is gfx.frames[0]
+    assert len(gfx.frames) == 3
+
+
+def _failed_future(*_, **__):
+    fut = Future()
+    fut.set_exception(OSError("decode failed"))
+    return fut
+
+
+def test_failed_prefetch_falls_back_to_synchronous_load(piece_dir, board):
+    cache = SpriteCache()
+    gfx = Graphics(piece_dir, board, sprite_cache=cache)
+    with patch.object(cache, "prefetch_folder", side_effect=_failed_future):
+        gfx.reset(Command(timestamp=0, piece_id="PW", type="Move", params=[]))
+        img = gfx.get_img()
+
+    assert len(gfx.frames) == 3 and img is gfx.frames[0]
+    assert "move" not in gfx._pending
+
+
+def test_failed_prefetch_and_load_keep_current_frame(piece_dir, board):
+    cache = SpriteCache()
+    gfx = Graphics(piece_dir, board, sprite_cache=cache)
+    idle_img = gfx.img
+    with patch.object(cache, "prefetch_folder", side_effect=_failed_future), \
+            patch.object(cache, "load_folder", side_effect=OSError("still broken")):
+        gfx.reset(Command(timestamp=0, piece_id="PW", type="Move", params=[]))
+        gfx.update(100)
+        assert gfx.get_img() is idle_img
+
+
+def test_prefetch_is_shared_between_graphics_instances(piece_dir, board):
+    cache = SpriteCache()
+    g1 = Graphics(piece_dir, board, sprite_cache=cache)
+    g2 = Graphics(piece_dir, board, sprite_cache=cache)
+
+    futures1 = g1.prefetch()
+    futures2 = g2.prefetch()
+
+    assert list(futures1) == ["move"]
+    assert g1.wait_ready(timeout=5) and g2.wait_ready(timeout=5)
+    assert futures1["move"].result()[0] is futures2["move"].result()[0]
@@ -59,9 +59,9 @@ class TestState(unittest.TestCase):
         ומעבירה את הפקודה הנכונה לפיזיקה.
         """
         cmd = MagicMock(spec=Command)
-        self.state.reset(cmd)
+        self.state.reset(cmd, 1000)
         self.graphics.reset.assert_called_once()
-        self.physics.reset.assert_called_once_with(cmd)
+        self.physics.reset.assert_called_once_with(cmd, 1000)
 
     def test_update_no_command_returns_self(self):
         """
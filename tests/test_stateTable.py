@@ -0,0 +1,82 @@
+import json
+import pathlib
+from types import SimpleNamespace
+
+from It1_interfaces.Board import Board
+from It1_interfaces.Command import Command
+from It1_interfaces.Physics import IdlePhysics, MovePhysics, RestPhysics
+from It1_interfaces.PieceFactory import PieceFactory
+from It1_interfaces.StateMachine import StateMachine
+from It1_interfaces.StateTable import NO_STATE, StateTable
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def read_configs(piece_id):
+    states = ROOT / "pieces" / piece_id / "states"
+    return {d.name: json.loads((d / "config.json").read_text(encoding="utf-8")) for d in states.iterdir()}
+
+
+def test_compile_pawn_configs_into_dense_table():
+    table = StateTable.compile(read_configs("PW"))
+    assert table.names == ("Idle", "Jump", "LongRest", "Move", "ShortRest")
+    idx = table.index
+    assert table.params[idx["Move"]].speed_m_s == 1.5
+    assert table.params[idx["Jump"]].speed_m_s == 3.0
+    assert table.params[idx["Move"]].next_state == idx["LongRest"]
+    assert table.params[idx["Idle"]].next_state == NO_STATE
+    assert table.params[idx["LongRest"]].rest_ms == 2000
+    assert (table.params[idx["Move"]].fps, table.params[idx["Move"]].is_loop) == (12.0, True)
+
+    move = table.event_id("Move")
+    assert table.next_state(idx["Idle"], move) == idx["Move"]
+    assert table.next_state(idx["LongRest"], move) == NO_STATE
+    assert table.next_state(idx["Move"], table.event_id("LongRest")) == idx["LongRest"]
+    assert table.next_state(idx["Idle"], table.event_id("Fly")) == NO_STATE
+
+
+def test_pieces_follow_their_configs(tmp_path):
+    configs = {
+        "idle": {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"}},
+        "move": {"physics": {"speed_m_per_sec": 4.0, "next_state_when_finished": "cooldown"},
+                 "graphics": {"frames_per_sec": 20, "is_loop": False}},
+        "cooldown": {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle",
+                                 "duration_ms": 300}},
+    }
+    piece_dir = tmp_path / "pieces" / "XW"
+    for state, cfg in configs.items():
+        (piece_dir / "states" / state / "sprites").mkdir(parents=True)
+        (piece_dir / "states" / state / "config.json").write_text(json.dumps(cfg), encoding="utf-8")
+    (piece_dir / "moves.txt").write_text("-1,0\n", encoding="utf-8")
+    board = Board(cell_H_pix=10, cell_W_pix=10, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+
+    piece = PieceFactory(board, tmp_path / "pieces").create_piece("XW", (4, 0))
+    states = piece.state_machine.states
+    assert isinstance(states["Move"]._physics, MovePhysics) and states["Move"]._physics.speed_m_s == 4.0
+    assert isinstance(states["Cooldown"]._physics, RestPhysics)
+    assert isinstance(states["Idle"]._physics, IdlePhysics)
+    assert "Jump" not in states
+
+    piece.on_command(Command(timestamp=100, piece_id="XW", type="Move", params=[(4, 0), (3, 0)]))
+    assert piece.state_machine.current_name == "Move"
+    assert states["Move"]._graphics.fps == 20
+    piece.update(200)
+    piece.update(360)  # מטר אחד ב-4 מ'/ש' = 250ms
+    assert piece.state_machine.current_name == "Cooldown"
+    assert piece.cell == (3, 0)
+    piece.update(370)
+    piece.update(670)
+    assert piece.state_machine.current_name == "Idle"
+
+
+def test_hand_built_states_still_work():
+    def state():
+        return SimpleNamespace(transitions={}, _physics=SimpleNamespace(current_cell=(0, 0), place=lambda c: None),
+                               reset=lambda cmd, now_ms=None: None, update=lambda now: None)
+    idle, busy = state(), state()
+    idle.transitions["Go"] = busy
+    machine = StateMachine({"idle": idle, "busy": busy}, initial="idle")
+    machine.process_command(SimpleNamespace(type="Stop"), 0)
+    assert machine.current is idle
+    machine.process_command(SimpleNamespace(type="Go"), 0)
+    assert machine.current is busy and machine.current_name == "busy"
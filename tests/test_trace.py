@@ -0,0 +1,53 @@
+import io
+import pytest
+from It1_interfaces import Trace
+from It1_interfaces.Trace import DEBUG, INFO, OFF, WARNING
+
+
+@pytest.fixture
+def sink():
+    stream = io.StringIO()
+    Trace.flush()
+    Trace.configure(stream=stream)
+    yield stream
+    Trace.flush()
+    Trace.configure(stream=None, capacity=Trace.DEFAULT_CAPACITY)
+    Trace._state.stream = None
+    Trace._state.levels = {"*": Trace.DEFAULT_LEVEL}
+    Trace.set_level("*", Trace.DEFAULT_LEVEL)
+
+
+def test_disabled_tracer_is_a_flag_check(sink):
+    tracer = Trace.get("TestOff")
+    assert not tracer.debug and not tracer.info
+    assert tracer.warning  # ברירת המחדל: אזהרות בלבד
+    assert len(Trace._buffer) == 0
+
+
+def test_per_module_levels(sink):
+    physics = Trace.get("TestPhysics")
+    piece = Trace.get("TestPiece")
+    Trace.configure("TestPhysics=debug,*=off")
+    assert physics.debug
+    assert not piece.warning
+
+    physics.log(DEBUG, "update: cell=%s", (1, 2))
+    Trace.flush()
+    assert "DEBUG TestPhysics: update: cell=(1, 2)" in sink.getvalue()
+
+
+def test_ring_buffer_keeps_newest_records(sink):
+    Trace.configure("TestRing=info", capacity=3)
+    tracer = Trace.get("TestRing")
+    for i in range(5):
+        tracer.log(INFO, "msg %d", i)
+    Trace.flush()
+    lines = sink.getvalue().splitlines()
+    assert [line.rsplit(" ", 1)[1] for line in lines] == ["2", "3", "4"]
+
+
+def test_parse_spec():
+    assert Trace.parse_spec("Physics=debug, Piece ,*=off") == {"Physics": DEBUG, "Piece": DEBUG, "*": OFF}
+    assert Trace.parse_spec("Graphics=WARNING") == {"Graphics": WARNING}
+    with pytest.raises(ValueError):
+        Trace.parse_spec("Physics=loud")
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from It1_interfaces.Physics import Physics
+from It1_interfaces.Trajectory import (FixedTrajectory, SCALE, Trajectory, ceil_isqrt,
+                                       fixed_positions_at, positions_at, stack)
+
+
+def test_between_rounds_duration_up_to_whole_ms():
+    t = Trajectory.between((0.0, 0.0), (1.0, 1.0), 1000, 2.0)
+    assert t.duration_ms == 708  # sqrt(2) / 2 * 1000 = 707.1
+    assert t.end_ms == 1708
+
+
+def test_at_interpolates_and_clamps():
+    t = Trajectory((6.0, 0.0), (4.0, 0.0), 1000, 1000)
+    assert t.at(0) == (6.0, 0.0)
+    assert t.at(1500) == pytest.approx((5.0, 0.0))
+    assert t.at(1000 + 1000) == (4.0, 0.0)
+    assert t.at(10_000) == (4.0, 0.0)
+    assert t.velocity == pytest.approx((-0.002, 0.0))
+
+
+def test_batch_matches_scalar_evaluation():
+    trajectories = [Trajectory((0.0, 0.0), (0.0, 7.0), 0, 3500),
+                    Trajectory((7.0, 7.0), (3.0, 3.0), 500, 2000),
+                    Trajectory((2.0, 2.0), (2.0, 2.0), 100, 0)]
+    for now in (0, 400, 1000, 2499, 5000):
+        expected = [t.at(now) for t in trajectories]
+        assert positions_at(trajectories, now) == pytest.approx(np.array(expected))
+    # אותו סט במערכים מוכנים, עם זמן נפרד לכל מסלול
+    times = np.array([1750, 1500, 0])
+    assert positions_at(stack(trajectories), times) == pytest.approx(
+        np.array([t.at(now) for t, now in zip(trajectories, times)]))
+
+
+class _Cmd:
+    type = "Move"
+    piece_id = "QW"
+    target_cell = (4, 0)
+
+
+def test_physics_position_is_known_mid_flight():
+    physics = Physics((6, 0), board=None, speed_m_s=2.0)
+    physics.reset(_Cmd())
+    physics.update(1000)
+    assert physics.finish_ms == 2000
+    assert physics.position_at(1250) == pytest.approx((5.5, 0.0))
+    assert physics.current_pos_meters == (6.0, 0.0)
+    physics.update(1500)
+    assert physics.current_pos_meters == pytest.approx((5.0, 0.0))
+    assert physics.current_cell == (6, 0)
+    physics.update(2000)
+    assert physics.trajectory is None
+    assert physics.position_at(5000) == (4.0, 0.0)
+
+
+def test_ceil_isqrt():
+    assert [ceil_isqrt(n) for n in (0, 1, 2, 4, 5, 9, 10)] == [0, 1, 2, 2, 3, 3, 4]
+    big = 2 * 10 ** 30
+    assert ceil_isqrt(big) ** 2 >= big > (ceil_isqrt(big) - 1) ** 2
+
+
+def test_fixed_duration_is_the_exact_integer_ceiling():
+    # אלכסון של 3 תאים ב-1.5 מ'/ש': sqrt(18) / 1.5 = 2.8284... שניות
+    t = FixedTrajectory.between((0, 0), (3 * SCALE, 3 * SCALE), 1000, 1500)
+    assert t.duration_ms == 2829
+    assert t.end_ms == 3829
+    assert t.end_cell == (3, 3)
+    for d_r, d_c, speed in [(1, 0, 1000), (2, 1, 2000), (7, 7, 3000), (0, 5, 700)]:
+        t = FixedTrajectory.between((0, 0), (d_r * SCALE, d_c * SCALE), 0, speed)
+        reach_um = (d_r * d_r + d_c * d_c) * SCALE * SCALE * 10 ** 6
+        assert (t.duration_ms * speed) ** 2 >= reach_um > ((t.duration_ms - 1) * speed) ** 2
+
+
+def test_fixed_positions_are_integers_and_batch_matches():
+    trajectories = [FixedTrajectory((6000, 0), (4000, 0), 100, 1000),
+                    FixedTrajectory((0, 0), (3000, 3000), 0, 2829),
+                    FixedTrajectory((1000, 1000), (1000, 1000), 0, 0)]
+    assert trajectories[0].at_fixed(433) == (5334, 0)
+    assert trajectories[0].at(433) == (5.334, 0.0)
+    for now in (0, 333, 1100, 2828, 9999):
+        expected = np.array([t.at_fixed(now) for t in trajectories])
+        got = fixed_positions_at(trajectories, now)
+        assert got.dtype == np.int64
+        assert (got == expected).all()
+
+
+def test_fixed_point_physics_runs_are_bit_for_bit_identical():
+    def run():
+        physics = Physics((0, 0), board=None, speed_m_s=1.5, fixed_point=True)
+        cmd = _Cmd()
+        cmd.target_cell = (3, 3)
+        physics.reset(cmd)
+        trace = []
+        for now in range(1000, 5000, 7):
+            physics.update(now)
+            trace.append((now, physics.current_pos_fx, physics.current_cell, physics.finish_ms))
+        return trace
+    first = run()
+    assert first == run()
+    # המצב נשמר במספרים שלמים (מילימטרים); current_pos_meters רק נגזר מהם לציור
+    assert all(type(v) is int for _, pos, _, _ in first for v in pos)
+    assert first[100][1] == (3000 * 700 // 2829, 3000 * 700 // 2829)
+    arrived = next(now for now, _, cell, _ in first if cell == (3, 3))
+    assert arrived == 1000 + 2829 + (-2829 % 7)
+    assert all(finish in (None, 3829) for _, _, _, finish in first)